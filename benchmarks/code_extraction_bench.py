@@ -0,0 +1,132 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+String extraction from a large synthetic workshop code file: the merged
+single pass of code_file_service (heapq.merge over the pattern streams,
+line numbers by binary search) against the original per-pattern scan (line
+numbers by counting newlines from the start of the file, final sort).
+First checks that extract_translatable_strings returns the same strings at
+the same positions, lines and types as the original scan. The default patterns
+are extended with a duplicate pattern, so ties between patterns are checked
+too. Needs the project's requirements but no QApplication or display.
+
+    python benchmarks/code_extraction_bench.py [--rules 5000] [--repeat 1]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from bisect import bisect_left
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.code_file_service import (extract_translatable_strings, build_newline_offsets,
+                                        _compile_extraction_patterns, _scan_patterns)
+from utils.constants import DEFAULT_EXTRACTION_PATTERNS
+
+WORDS = ("Ultimate", "charge", "ready", "Heal", "teammates", "{0}", "{1}", "points", "Round", "won",
+         "终极技能", "充能", "完成", "治疗", "队友", "!", "?", "...", "\\\"quoted\\\"", "\\n", "100", "HP")
+
+
+def random_text(rng):
+    return ' '.join(rng.choice(WORDS) for __ in range(rng.randint(0, 6)))
+
+
+def build_code(rng, rules):
+    parts = ['settings\n{\n\tmain\n\t{\n\t\tDescription: "%s"\n\t\tMode Name: "%s"\n\t}\n}\n'
+             % (random_text(rng), random_text(rng))]
+    for i in range(rules):
+        actions = []
+        for __ in range(rng.randint(1, 6)):
+            keyword = rng.choice(("Custom String", "自定义字符串"))
+            actions.append(f'\t\tSmall Message(All Players(All Teams), {keyword}("{random_text(rng)}", Null, Null));')
+            actions.append(f'\t\tGlobal.Value{rng.randint(0, 99)} = {rng.randint(0, 10 ** 6)};')
+        parts.append(f'rule("Rule {i}")\n{{\n\tevent\n\t{{\n\t\tOngoing - Global;\n\t}}\n\n\tactions\n\t{{\n'
+                     + '\n'.join(actions) + '\n\t}\n}\n')
+    return '\n'.join(parts)
+
+
+def legacy_scan(code_content, extraction_patterns):
+    """Position data of extract_translatable_strings before the merged pass."""
+    found = []
+    for pattern_config in extraction_patterns:
+        if not pattern_config.get("enabled", True):
+            continue
+        left_delimiter_str = pattern_config.get("left_delimiter")
+        right_delimiter_str = pattern_config.get("right_delimiter")
+        string_type = pattern_config.get("string_type", "Custom")
+        if not left_delimiter_str or not right_delimiter_str:
+            continue
+        try:
+            compiled_pattern = re.compile(f"({left_delimiter_str})(.*?)({right_delimiter_str})", re.DOTALL)
+        except re.error:
+            continue
+        for match in compiled_pattern.finditer(code_content):
+            content_start_pos = match.start(2)
+            line_num = code_content.count('\n', 0, content_start_pos) + 1
+            found.append((content_start_pos, match.end(2), match.group(2), line_num, string_type))
+    found.sort(key=lambda item: item[0])
+    return found
+
+
+def merged_scan(code_content, extraction_patterns):
+    """The same position data from the merged pass used by extract_translatable_strings."""
+    newline_offsets = build_newline_offsets(code_content)
+    found = []
+    for match, string_type in _scan_patterns(_compile_extraction_patterns(extraction_patterns), code_content):
+        content_start_pos = match.start(2)
+        found.append((content_start_pos, match.end(2), match.group(2),
+                      bisect_left(newline_offsets, content_start_pos) + 1, string_type))
+    return found
+
+
+def check_equivalence(code_content, extraction_patterns):
+    expected = legacy_scan(code_content, extraction_patterns)
+    strings = extract_translatable_strings(code_content, extraction_patterns)
+    actual = [(ts.char_pos_start_in_file, ts.char_pos_end_in_file, ts.original_raw, ts.line_num_in_file,
+               ts.string_type) for ts in strings]
+    if actual != expected:
+        for index, (old, new) in enumerate(zip(expected, actual)):
+            if old != new:
+                raise AssertionError(f"String {index} differs:\n  per-pattern: {old}\n  merged:      {new}")
+        raise AssertionError(f"String count differs: per-pattern {len(expected)}, merged {len(actual)}")
+    print(f"equivalence: {len(actual)} strings match")
+
+
+def timed(label, func, repeat):
+    start = time.perf_counter()
+    for __ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:>30} | {elapsed * 1000:9.1f} ms | {len(result)} strings")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rules', type=int, default=5000, help="workshop rules in the synthetic file")
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    code_content = build_code(rng, args.rules)
+    # 与第一个模式完全相同的模式：起始位置相同时须保持配置顺序
+    patterns = DEFAULT_EXTRACTION_PATTERNS + [dict(DEFAULT_EXTRACTION_PATTERNS[0], string_type="Duplicate")]
+    check_equivalence(code_content, patterns)
+
+    print(f"{len(code_content) / 1e6:.1f} MB, {code_content.count(chr(10)) + 1} lines, default patterns")
+    legacy = timed("per-pattern scan + sort", lambda: legacy_scan(code_content, DEFAULT_EXTRACTION_PATTERNS),
+                   args.repeat)
+    merged = timed("merged scan", lambda: merged_scan(code_content, DEFAULT_EXTRACTION_PATTERNS), args.repeat)
+    timed("extract_translatable_strings",
+          lambda: extract_translatable_strings(code_content, DEFAULT_EXTRACTION_PATTERNS), args.repeat)
+    print(f"speedup of the scan: {legacy / merged:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
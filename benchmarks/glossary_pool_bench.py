@@ -0,0 +1,107 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Glossary lookups per second with pooled SQLite connections (GlossaryService as
+is) against a connection opened per call, as GlossaryService did before
+SQLiteConnectionPool. Builds a global and a project glossary database with
+synthetic terms in a temporary directory. Needs the project's requirements but
+no QApplication or display.
+
+    python benchmarks/glossary_pool_bench.py [--terms 20000] [--lookups 5000] [--batch-size 50]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.glossary_service import GlossaryService
+
+
+class PerCallGlossaryService(GlossaryService):
+    """GlossaryService with the original connection handling: a new connection for every lookup."""
+
+    def _get_db_connection(self, db_path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+def fill_database(service, db_path, words, tag):
+    with service._get_db_connection(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO terms (source_term, source_term_lower, source_manifest_key) VALUES (?, ?, ?)",
+            ((word.capitalize(), word, tag) for word in words))
+        conn.execute("""
+            INSERT INTO translations (term_id, target_term)
+            SELECT id, source_term_lower || ' (' || ? || ')' FROM terms
+        """, (tag,))
+
+
+def time_get_term(service, words):
+    start = time.perf_counter()
+    for word in words:
+        service.get_term(word)
+    return time.perf_counter() - start
+
+
+def time_get_terms_batch(service, words, batch_size):
+    start = time.perf_counter()
+    for i in range(0, len(words), batch_size):
+        # 使共享词表失效，每批都实际查询数据库
+        service.data_version += 1
+        service.get_terms_batch(words[i:i + batch_size])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--terms', type=int, default=20000, help="terms in the global glossary")
+    parser.add_argument('--lookups', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=17)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = [f"term{i}" for i in range(args.terms)]
+    # 约一半的查询词不在术语库中
+    queries = [rng.choice(vocabulary) if rng.random() < 0.5 else f"miss{rng.randint(0, 10 ** 6)}"
+               for __ in range(args.lookups)]
+
+    with tempfile.TemporaryDirectory() as root:
+        global_dir = os.path.join(root, "global")
+        project_dir = os.path.join(root, "project")
+        pooled = GlossaryService()
+        pooled.connect_databases(global_dir, project_dir)
+        fill_database(pooled, pooled.global_db_path, vocabulary, "global")
+        fill_database(pooled, pooled.project_db_path, rng.sample(vocabulary, args.terms // 10), "project")
+
+        per_call = PerCallGlossaryService()
+        per_call.global_db_path = pooled.global_db_path
+        per_call.project_db_path = pooled.project_db_path
+
+        for word in queries[:200]:
+            if pooled.get_term(word) != per_call.get_term(word):
+                raise AssertionError(f"get_term differs for {word!r}")
+        if pooled._resolve_terms(queries) != per_call._resolve_terms(queries):
+            raise AssertionError("get_terms_batch results differ")
+
+        print(f"{args.terms} terms, {args.lookups} lookups, batches of {args.batch_size}")
+        for name, method in (("get_term", lambda service: time_get_term(service, queries)),
+                             ("get_terms_batch", lambda service: time_get_terms_batch(service, queries,
+                                                                                       args.batch_size))):
+            per_call_time = method(per_call)
+            pooled_time = method(pooled)
+            print(f"{name:>16} | per-call {args.lookups / per_call_time:9.0f} words/s "
+                  f"| pooled {args.lookups / pooled_time:9.0f} words/s | {per_call_time / pooled_time:5.1f}x")
+        pooled.disconnect_databases()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+TextFeatures.linguistic_length against utils.text_utils.get_linguistic_length.
+First checks that both give the same length for hand-picked edge cases and for
+random texts mixing placeholders (including nested and unbalanced braces),
+punctuation, digits, symbols, whitespace and CJK text. Then times:
+- the original two-substitution function
+- TextFeatures.linguistic_length on fresh records (one substitution)
+- the same including the construction of the whole record
+- get_text_features on repeated texts, served from the LRU cache
+
+    python benchmarks/linguistic_length_bench.py [--texts 100000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.text_features import TextFeatures, get_text_features
+from utils.text_utils import get_linguistic_length
+
+FRAGMENTS = ("Save", "file", "player", "{0}", "{name}", "{count}", "{{x}}", "{a{b}c}", "{", "}", "{}",
+             "%s", "100%", "3.14", "—", "…", "!", "?", ",", ".", "«", "»", "$", "€", "+", "=",
+             " ", "  ", " ", "　", "\t", "\n", "保存", "文件", "。", "，", "「", "」",
+             "Ünïcödé", "straße", "ΣΟΦΟΣ", "🙂", "①", "٣")
+EDGE_CASES = ("", " ", "{}", "{", "}", "{{a}}", "{a{b}c}", "{a}{b}", "{ a }", "{{}}", "}{a}{",
+              "Hello, {name}!", "100% done", "{0} of {1}", "保存{0}个文件。", "　{x}　")
+
+
+def random_text(rng):
+    return ''.join(rng.choice(FRAGMENTS) for __ in range(rng.randint(0, 20)))
+
+
+def check_equivalence(texts):
+    for text in EDGE_CASES + tuple(texts):
+        expected = get_linguistic_length(text)
+        actual = TextFeatures(text).linguistic_length
+        if expected != actual:
+            raise AssertionError(f"Length differs for {text!r}: get_linguistic_length {expected}, "
+                                 f"TextFeatures {actual}")
+    print(f"equivalence: {len(EDGE_CASES) + len(texts)} texts match")
+
+
+def timed(label, func, texts, repeat, prepare=None):
+    """func is called once per text; prepare, if set, maps the texts to func's arguments outside the timing."""
+    elapsed = 0.0
+    for __ in range(repeat):
+        items = prepare(texts) if prepare is not None else texts
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        elapsed += time.perf_counter() - start
+    calls = len(texts) * repeat
+    print(f"{label:>38} | {calls / elapsed / 1000:8.1f}k texts/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--texts', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5, help="passes over the texts per timing")
+    parser.add_argument('--seed', type=int, default=13)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [random_text(rng) for __ in range(args.texts)]
+    check_equivalence(texts)
+
+    # 缓存容量以内的重复文本，对应全量校验时同一原文/译文被反复分析
+    distinct = texts[:20000]
+    baseline = timed("get_linguistic_length", get_linguistic_length, distinct, args.repeat)
+    # 只计时长度计算本身：记录在计时之外新建，属性尚未缓存
+    single = timed("TextFeatures.linguistic_length (fresh)", lambda features: features.linguistic_length,
+                   distinct, args.repeat, prepare=lambda items: [TextFeatures(text) for text in items])
+    timed("TextFeatures(text) incl. construction", lambda text: TextFeatures(text).linguistic_length,
+          distinct, args.repeat)
+    get_text_features.cache_clear()
+    cached = timed("get_text_features(text) (LRU cache)", lambda text: get_text_features(text).linguistic_length,
+                   distinct, args.repeat)
+    print(f"speedup over get_linguistic_length: one substitution {baseline / single:.2f}x, "
+          f"cached record {baseline / cached:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
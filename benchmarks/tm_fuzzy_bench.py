@@ -0,0 +1,116 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Queries per second of TMFuzzyIndex against the original full-scan loop of the
+TM suggestions panel, over synthetic TMs of increasing size. Before timing,
+both are checked to return the same case-insensitive hit and top fuzzy matches.
+
+    python benchmarks/tm_fuzzy_bench.py [--sizes 10000 100000 300000] [--queries 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rapidfuzz import fuzz
+from services.tm_fuzzy_index import TMFuzzyIndex, FUZZY_MATCH_LIMIT, FUZZY_MATCH_THRESHOLD
+
+WORDS = ("the a save file open close settings player health charge ultimate load game menu option "
+         "Save File Load Game New Continue quit back apply cancel volume").split()
+
+
+def random_sentence(rng):
+    return ' '.join(rng.choice(WORDS) for __ in range(rng.randint(1, 8)))
+
+
+def build_tm(rng, size, unique_suffix=True):
+    tm = {}
+    while len(tm) < size:
+        source = random_sentence(rng)
+        if unique_suffix:
+            source += f" {rng.randint(0, 10 ** 6)}"
+        tm[source] = f"translation of {source}"
+    return tm
+
+
+def scan_lookup(text, tm):
+    """TMPanel.update_tm_suggestions_for_text before TMFuzzyIndex: scores every unit in TM order."""
+    text_lower = text.lower()
+    case_insensitive_match = None
+    for tm_orig, tm_trans in tm.items():
+        if tm_orig.lower() == text_lower and tm_orig != text:
+            case_insensitive_match = tm_trans
+            break
+    fuzzy_matches = []
+    for tm_orig, tm_trans in tm.items():
+        if tm_orig == text:
+            continue
+        ratio = fuzz.ratio(text, tm_orig) / 100.0
+        if ratio > FUZZY_MATCH_THRESHOLD:
+            fuzzy_matches.append((ratio, tm_orig, tm_trans))
+    fuzzy_matches.sort(key=lambda item: item[0], reverse=True)
+    return case_insensitive_match, fuzzy_matches[:FUZZY_MATCH_LIMIT]
+
+
+def index_lookup(text, tm, index):
+    source = index.find_case_insensitive(text)
+    case_insensitive_match = tm.get(source) if source is not None else None
+    return case_insensitive_match, [(ratio, source, tm[source]) for ratio, source in index.find_fuzzy(text)]
+
+
+def check_equivalence(rng, tm_size, queries):
+    # 小词表、无后缀，保证有大量同分与大小写不同的命中
+    tm = build_tm(rng, tm_size, unique_suffix=False)
+    index = TMFuzzyIndex(tm)
+    sources = list(tm)
+    for __ in range(queries):
+        text = random_sentence(rng) if rng.random() < 0.7 else rng.choice(sources)
+        expected = scan_lookup(text, tm)
+        actual = index_lookup(text, tm, index)
+        if expected != actual:
+            raise AssertionError(f"Results differ for {text!r}:\n  scan:  {expected}\n  index: {actual}")
+    print(f"equivalence: {queries} queries against {tm_size} units match")
+
+
+def benchmark(rng, size, queries):
+    tm = build_tm(rng, size)
+    start = time.perf_counter()
+    index = TMFuzzyIndex(tm)
+    build_time = time.perf_counter() - start
+    texts = [random_sentence(rng) for __ in range(queries)]
+
+    start = time.perf_counter()
+    for text in texts:
+        scan_lookup(text, tm)
+    scan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in texts:
+        index_lookup(text, tm, index)
+    index_time = time.perf_counter() - start
+
+    print(f"{size:>8} units | build {build_time:6.2f}s | scan {queries / scan_time:8.1f} q/s "
+          f"| index {queries / index_time:8.1f} q/s | {scan_time / index_time:5.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 300000])
+    parser.add_argument('--queries', type=int, default=20, help="timed queries per TM size")
+    parser.add_argument('--check-queries', type=int, default=400)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    check_equivalence(rng, 5000, args.check_queries)
+    for size in args.sizes:
+        benchmark(rng, size, args.queries)
+
+
+if __name__ == '__main__':
+    main()
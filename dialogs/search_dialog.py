@@ -165,7 +165,15 @@ class AdvancedSearchDialog(QDialog):
         pattern = re.compile(re.escape(term), flags)
 
         proxy = self.app.proxy_model
-        for row in range(proxy.rowCount()):
+        source_model = self.app.sheet_model
+        candidate_rows = []
+        for source_row in source_model.search_index.find_rows(term):
+            proxy_index = proxy.mapFromSource(source_model.index(source_row, 0))
+            if proxy_index.isValid():
+                candidate_rows.append(proxy_index.row())
+        candidate_rows.sort()
+
+        for row in candidate_rows:
             ts_obj = proxy.data(proxy.index(row, 0), Qt.ItemDataRole.UserRole)
             if not ts_obj: continue
 
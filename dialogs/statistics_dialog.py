@@ -19,9 +19,10 @@ class StatisticsCalculationThread(QThread):
     progress_updated = Signal(int, str)
     calculation_finished = Signal(dict)
 
-    def __init__(self, translatable_objects, parent=None):
+    def __init__(self, translatable_objects, parent=None, status_totals=None):
         super().__init__(parent)
         self.translatable_objects = translatable_objects
+        self.status_totals = dict(status_totals) if status_totals is not None else None
         self.statistics = {}
 
     def run(self):
@@ -59,6 +60,9 @@ class StatisticsCalculationThread(QThread):
             'source_char_count_for_expansion': 0,
             'translation_char_count_for_expansion': 0
         }
+        # 计数已由主窗口增量维护，这里只需收集各类警告
+        if self.status_totals is not None:
+            self.statistics.update(self.status_totals)
 
     def _process_translatable_objects(self, total_items):
         base_progress = 5
@@ -75,6 +79,11 @@ class StatisticsCalculationThread(QThread):
             self._process_single_object(ts_obj)
 
     def _process_single_object(self, ts_obj):
+        if self.status_totals is None:
+            self._count_status(ts_obj)
+        self._process_warnings(ts_obj)
+
+    def _count_status(self, ts_obj):
         is_translated = False
         if ts_obj.is_ignored:
             self.statistics['ignored_count'] += 1
@@ -88,18 +97,20 @@ class StatisticsCalculationThread(QThread):
         if is_translated:
             self.statistics['source_char_count_for_expansion'] += len(ts_obj.original_semantic)
             self.statistics['translation_char_count_for_expansion'] += len(ts_obj.translation)
-        self._process_warnings(ts_obj)
 
     def _process_warnings(self, ts_obj):
         has_major_warning = ts_obj.warnings and not ts_obj.is_warning_ignored
         has_minor_warning = ts_obj.minor_warnings and not ts_obj.is_warning_ignored
 
+        count_warnings = self.status_totals is None
+
         if has_major_warning:
-            self.statistics['warning_count'] += 1
+            if count_warnings:
+                self.statistics['warning_count'] += 1
             self._add_warnings_to_stats(ts_obj, ts_obj.warnings)
 
         if has_minor_warning:
-            if not has_major_warning:
+            if count_warnings and not has_major_warning:
                 self.statistics['minor_warning_count'] += 1
             self._add_warnings_to_stats(ts_obj, ts_obj.minor_warnings)
 
@@ -126,9 +137,10 @@ class AnimatedProgressBar(QProgressBar):
 class StatisticsDialog(QDialog):
     locate_item_signal = Signal(str)
 
-    def __init__(self, parent, translatable_objects):
+    def __init__(self, parent, translatable_objects, status_counters=None):
         super().__init__(parent)
         self.translatable_objects = translatable_objects
+        self.status_counters = status_counters
         self.statistics_data = {}
         self.metrics_row_index = 0
         self.calc_thread = None
@@ -410,7 +422,11 @@ class StatisticsDialog(QDialog):
         if self.chart_view.chart():
             self.chart_view.chart().removeAllSeries()
 
-        self.calc_thread = StatisticsCalculationThread(self.translatable_objects, self)
+        # 每次计算时读取当前合计：StatusCounters.rebuild 会替换 totals 字典
+        status_totals = None
+        if self.status_counters is not None and self.status_counters.total_count == len(self.translatable_objects):
+            status_totals = self.status_counters.totals
+        self.calc_thread = StatisticsCalculationThread(self.translatable_objects, self, status_totals)
         self.calc_thread.progress_updated.connect(self.update_progress)
         self.calc_thread.calculation_finished.connect(self.display_statistics)
         self.calc_thread.start()
@@ -1,6 +1,7 @@
 # Copyright (c) 2025, TheSkyC
 # SPDX-License-Identifier: Apache-2.0
 
+import bisect
 import os
 import threading
 from copy import deepcopy
@@ -27,6 +28,8 @@ from PySide6.QtCore import (
 from PySide6.QtGui import QAction, QKeySequence, QFont, QPalette, QColor, QSyntaxHighlighter, QTextCharFormat
 
 from models.translatable_string import TranslatableString
+from models.translatable_string_index import TranslatableStringIndex
+from models.status_counters import StatusCounters
 from models.translatable_strings_model import TranslatableStringsModel, TranslatableStringsProxyModel
 from plugins.plugin_manager import PluginManager
 from ui_components.comment_status_panel import CommentStatusPanel
@@ -58,18 +61,23 @@ from services.ai_translator import AITranslator
 from services.code_file_service import extract_translatable_strings, save_translated_code
 from services.project_service import create_project, load_project, save_project
 from services.prompt_service import generate_prompt_from_structure
-from services.validation_service import run_validation_on_all, placeholder_regex
+from services.validation_service import placeholder_regex
+from services.validation_engine import ValidationEngine
+from services.validation_worker import ValidationWorker, ValidationCancelToken, VALIDATION_CHUNK_SIZE
 from services.expansion_ratio_service import ExpansionRatioService
 from services.tm_service import TMService
 from services.glossary_service import GlossaryService
 from services.glossary_worker import GlossaryAnalysisWorker
+from services.tm_fuzzy_index import TMFuzzyIndex
+from services.sqlite_tm_store import SQLiteTMStore
+from services.tm_service import LayeredTM, JournaledTM, StoreLayeredTM, fetch_units
 from services.project_service import TM_DIR
 
 from utils import config_manager
 from utils.constants import *
 from utils.enums import WarningType
 from utils.localization import _, lang_manager
-from utils.text_utils import get_linguistic_length
+from utils.text_features import get_text_features
 from utils.path_utils import get_app_data_path
 
 try:
@@ -79,23 +87,26 @@ except ImportError:
     logger.warning("提示: requests 未找到, AI翻译功能不可用。pip install requests")
 
 class GlossaryHighlighter(QSyntaxHighlighter):
-    def __init__(self, parent, matches_list):
+    def __init__(self, parent, matches_list, text):
         super().__init__(parent)
         self.highlight_format = QTextCharFormat()
         self.highlight_format.setUnderlineColor(QColor("teal"))
         self.highlight_format.setUnderlineStyle(QTextCharFormat.WaveUnderline)
-        self.rules = []
-        if matches_list:
-            keywords = [re.escape(match['source']) for match in matches_list]
-            if keywords:
-                pattern = r'\b(' + '|'.join(keywords) + r')\b'
-                self.rules.append((re.compile(pattern, re.IGNORECASE), self.highlight_format))
+        # 直接使用术语匹配得到的位置，按行（文本块）拆分
+        line_starts = [0]
+        for index, char in enumerate(text):
+            if char == '\n':
+                line_starts.append(index + 1)
+        self.spans_by_block = {}
+        for match in matches_list or []:
+            for start, end in match.get('spans', ()):
+                block_number = bisect.bisect_right(line_starts, start) - 1
+                block_start = line_starts[block_number]
+                self.spans_by_block.setdefault(block_number, []).append((start - block_start, end - start))
 
     def highlightBlock(self, text):
-        for pattern, format in self.rules:
-            for match in pattern.finditer(text):
-                start, end = match.span()
-                self.setFormat(start, end - start, format)
+        for start, length in self.spans_by_block.get(self.currentBlock().blockNumber(), ()):
+            self.setFormat(start, length, self.highlight_format)
 
 class AITranslationWorker(QRunnable):
     def __init__(self, app_instance, ts_id, original_text, target_language, context_dict, plugin_placeholders, is_batch_item):
@@ -121,24 +132,10 @@ class AITranslationWorker(QRunnable):
                     if start <= pos < end:
                         return True
                 return False
-            original_words = set(re.findall(r'\b\w+\b', self.original_text.lower()))
-            potential_glossary_terms = {}
-            if original_words:
-                potential_glossary_terms = app.glossary_service.get_terms_batch(list(original_words))
             valid_glossary_terms = {}
-            if potential_glossary_terms:
-                for word, term_info in potential_glossary_terms.items():
-                    is_valid_term = False
-                    try:
-                        for match in re.finditer(r'\b' + re.escape(word) + r'\b', self.original_text, re.IGNORECASE):
-                            if not is_inside_placeholder(match.start()):
-                                is_valid_term = True
-                                break
-                    except re.error:
-                        continue
-
-                    if is_valid_term:
-                        valid_glossary_terms[word] = term_info
+            for match in app.glossary_service.find_term_matches(self.original_text):
+                if any(not is_inside_placeholder(start) for start, __ in match['spans']):
+                    valid_glossary_terms[match['source']] = match
             glossary_prompt_part = ""
             if valid_glossary_terms:
                 header = f"| {_('Source Term')} | {_('Should be Translated As')} |\n|---|---|\n"
@@ -235,10 +232,20 @@ class LexiSyncApp(QMainWindow):
         self.quick_search_timer.timeout.connect(self._perform_delayed_search_filter)
         self._last_quick_search_text = ""
 
+        self.ts_index = TranslatableStringIndex()
+        self.status_counters = StatusCounters()
+        self.validation_engine = ValidationEngine()
+        self.validation_run_id = 0
+        # run_id -> (cancel_token, is_full_pass)，编辑后的补充校验与全量校验可以同时进行
+        self.validation_runs = {}
         self.translatable_objects = []
         self.tm_service = TMService()
-        self.project_tm = {}
-        self.global_tm = {}
+        self.project_tm = JournaledTM()
+        self.global_tm = JournaledTM()
+        # TM 建议面板使用的模糊匹配索引，TM 的键集合变化后重建
+        self.tm_fuzzy_index = None
+        self.tm_fuzzy_index_key = None
+        self.tm_revision = 0
         self.current_project_tm_path = None
         self.global_tm_path = ""
 
@@ -573,7 +580,7 @@ class LexiSyncApp(QMainWindow):
 
         self.tools_menu.addSeparator()
         self.action_run_validation_on_all = QAction(_("Re-validate All Entries"), self)
-        self.action_run_validation_on_all.triggered.connect(self._run_and_refresh_with_validation)
+        self.action_run_validation_on_all.triggered.connect(self._run_full_revalidation)
         self.action_run_validation_on_all.setEnabled(False)
         self.tools_menu.addAction(self.action_run_validation_on_all)
 
@@ -1072,6 +1079,9 @@ class LexiSyncApp(QMainWindow):
         self.proxy_model = TranslatableStringsProxyModel(self)
         self.proxy_model.setSourceModel(self.sheet_model)
         self.table_view.setModel(self.proxy_model)
+        self.proxy_model.modelReset.connect(self._recount_status_counters)
+        self.proxy_model.filter_invalidated.connect(self._recount_status_counters)
+        self.sheet_model.dataChanged.connect(self._on_sheet_data_changed)
 
         self.table_view.setSelectionBehavior(QTableView.SelectRows)
         self.table_view.setSelectionMode(QTableView.ExtendedSelection)
@@ -1302,20 +1312,10 @@ class LexiSyncApp(QMainWindow):
         displayed_count = self.proxy_model.rowCount()
         total_count = len(self.translatable_objects)
 
-        translated_visible = 0
-        untranslated_visible = 0
-        ignored_visible = 0
-
-        for i in range(self.proxy_model.rowCount()):
-            index = self.proxy_model.index(i, 0)
-            ts_obj = self.proxy_model.data(index, Qt.UserRole)
-            if ts_obj:
-                if ts_obj.is_ignored:
-                    ignored_visible += 1
-                elif ts_obj.translation.strip():
-                    translated_visible += 1
-                else:
-                    untranslated_visible += 1
+        visible_totals = self.status_counters.visible_totals
+        translated_visible = visible_totals['translated_count']
+        untranslated_visible = visible_totals['untranslated_count']
+        ignored_visible = visible_totals['ignored_count']
 
         self.counts_label.setText(
             _("Displayed: {displayed_count}/{total_count} | Translated: {translated_visible} | Untranslated: {untranslated_visible} | Ignored: {ignored_visible}").format(
@@ -1327,6 +1327,21 @@ class LexiSyncApp(QMainWindow):
             )
         )
 
+    def _recount_status_counters(self):
+        source_data = self.sheet_model._data
+        visible_ids = set()
+        for row in range(self.proxy_model.rowCount()):
+            source_row = self.proxy_model.mapToSource(self.proxy_model.index(row, 0)).row()
+            if 0 <= source_row < len(source_data):
+                visible_ids.add(source_data[source_row].id)
+        self.status_counters.rebuild(source_data, visible_ids)
+
+    def _on_sheet_data_changed(self, top_left, bottom_right, roles=None):
+        source_data = self.sheet_model._data
+        for row in range(top_left.row(), min(bottom_right.row() + 1, len(source_data))):
+            is_visible = self.proxy_model.mapFromSource(self.sheet_model.index(row, 0)).isValid()
+            self.status_counters.update(source_data[row], is_visible)
+
     def update_title(self):
         base_title = f"LexiSync - v{APP_VERSION}"
         name_part = ""
@@ -1415,11 +1430,17 @@ class LexiSyncApp(QMainWindow):
         self.action_redo.setEnabled(False)
         self.mark_project_modified()
 
+    @property
+    def translatable_objects(self):
+        return self._translatable_objects
+
+    @translatable_objects.setter
+    def translatable_objects(self, objects):
+        self._translatable_objects = objects
+        self.ts_index.rebuild(objects)
+
     def _find_ts_obj_by_id(self, obj_id):
-        for ts_obj in self.translatable_objects:
-            if ts_obj.id == obj_id:
-                return ts_obj
-        return None
+        return self.ts_index.get(obj_id)
 
     def undo_action(self):
         focused_widget = QApplication.focusWidget()
@@ -1486,7 +1507,7 @@ class LexiSyncApp(QMainWindow):
         if self.use_static_sorting_var:
             self._update_view_for_ids(changed_ids)
         else:
-            self._run_and_refresh_with_validation()
+            self._run_and_refresh_with_validation(changed_ids)
 
         if self.current_selected_ts_id in changed_ids:
             self.force_refresh_ui_for_current_selection()
@@ -1562,7 +1583,7 @@ class LexiSyncApp(QMainWindow):
         if self.use_static_sorting_var:
             self._update_view_for_ids(changed_ids)
         else:
-            self._run_and_refresh_with_validation()
+            self._run_and_refresh_with_validation(changed_ids)
 
         if self.current_selected_ts_id in changed_ids:
             self.force_refresh_ui_for_current_selection()
@@ -1586,12 +1607,14 @@ class LexiSyncApp(QMainWindow):
             else:
                 self.stop_batch_ai_translation(silent=True)
 
+        self._cancel_background_validation()
         if self.is_project_mode:
             if self.project_tm and self.current_project_tm_path:
                 self.tm_service.save_tm(self.current_project_tm_path, self.project_tm)
         else: # Quick Edit Mode
             if self.global_tm and self.global_tm_path:
                 self.tm_service.save_tm(self.global_tm_path, self.global_tm)
+        self.tm_service.shutdown()
         self.glossary_service.disconnect_databases()
         self.save_config()
         self.save_window_state()
@@ -1821,7 +1844,7 @@ class LexiSyncApp(QMainWindow):
                 f"{self.source_language}_{self.current_target_language}.jsonl"
             )
 
-            self.global_tm = {}
+            self.global_tm = JournaledTM()
             project_settings = self.project_config.get("settings", {})
             if project_settings.get("use_global_tm", True):
                 global_tm_path = self._get_global_tm_path()
@@ -1830,6 +1853,7 @@ class LexiSyncApp(QMainWindow):
                 self.global_tm_path = os.path.join(global_tm_path, "global_tm.jsonl")
             else:
                 self.global_tm_path = ""
+            self.tm_service.retain_load_cache([project_tm_dir, os.path.dirname(self.global_tm_path)])
             self.setup_glossary_service()
             self.plugin_manager.run_hook('on_project_loaded', self.translatable_objects)
 
@@ -1933,10 +1957,11 @@ class LexiSyncApp(QMainWindow):
                                 _("AI batch translation is in progress. Please wait for it to complete or stop it before opening a new file."))
             return
         self._reset_app_state()
-        self.project_tm = {}
+        self.project_tm = JournaledTM()
         self.current_project_tm_path = None
         global_tm_dir = self._get_global_tm_path()
         self.global_tm = self.tm_service.load_tm_from_directory(global_tm_dir)
+        self.tm_service.retain_load_cache([global_tm_dir])
 
         self.global_tm_path = os.path.join(global_tm_dir, "global_tm.jsonl")
         try:
@@ -2344,8 +2369,8 @@ class LexiSyncApp(QMainWindow):
         current_translation_text = self.details_panel.translation_edit_text.toPlainText()
 
         # 计算净化后的字符数
-        orig_len = get_linguistic_length(ts_obj.original_semantic)
-        trans_len = get_linguistic_length(current_translation_text)
+        orig_len = get_text_features(ts_obj.original_semantic).linguistic_length
+        trans_len = get_text_features(current_translation_text).linguistic_length
         char_counts = (orig_len, trans_len)
 
         # 计算膨胀率
@@ -2378,8 +2403,8 @@ class LexiSyncApp(QMainWindow):
         original_text_widget = self.details_panel.original_text_display
         translation_text_widget = self.details_panel.translation_edit_text
 
-        original_placeholders = set(self.placeholder_regex.findall(ts_obj.original_semantic))
-        translated_placeholders = set(self.placeholder_regex.findall(translation_text_widget.toPlainText()))
+        original_placeholders = get_text_features(ts_obj.original_semantic).placeholder_set
+        translated_placeholders = get_text_features(translation_text_widget.toPlainText()).placeholder_set
 
         self.details_panel.apply_placeholder_highlights(original_text_widget, translation_text_widget,
                                                         original_placeholders, translated_placeholders)
@@ -2421,7 +2446,7 @@ class LexiSyncApp(QMainWindow):
                 self.original_highlighter.setParent(None)
 
             self.original_highlighter = GlossaryHighlighter(self.details_panel.original_text_display.document(),
-                                                            matches)
+                                                            matches, self.details_panel.original_text_display.toPlainText())
 
     def clear_details_pane(self):
         # 清空 DetailsPanel
@@ -2446,24 +2471,131 @@ class LexiSyncApp(QMainWindow):
         self.tm_panel.update_selected_tm_btn.setEnabled(False)
         self.tm_panel.clear_selected_tm_btn.setEnabled(False)
 
-    def _run_and_refresh_with_validation(self):
+    def _run_and_refresh_with_validation(self, changed_ids=None):
+        """
+        Re-validates outdated strings and refreshes the sheet. changed_ids names
+        strings whose other fields (comment, review or warning-ignored state)
+        changed and need restyling. Without structural changes only the affected
+        rows are restyled; otherwise the model is reset.
+        """
         if not self.translatable_objects:
             self.sheet_model.set_translatable_objects([])
             self.proxy_model.invalidate()
             return
+        self._cancel_background_validation()
         self.update_statusbar(_("Validating all entries..."), persistent=True)
-        QApplication.processEvents()
-        run_validation_on_all(self.translatable_objects, self.config, self)
-
-        for ts_obj in self.translatable_objects:
-            ts_obj.update_style_cache()
-        self.sheet_model.set_translatable_objects(self.translatable_objects)
-        if self.use_static_sorting_var:
-            self.proxy_model.invalidate()
+        # 只重新校验内容、标记或校验配置发生变化的字符串；数量较多时转到后台分块执行
+        changed, pending, with_glossary = self.validation_engine.prepare_pass(
+            self.translatable_objects, self.config, self)
+        run_in_background = len(pending) > VALIDATION_CHUNK_SIZE
+        if pending and not run_in_background:
+            self.validation_engine.compute_pending(pending, self.config, self, with_glossary)
+
+        if self.sheet_model.is_showing(self.translatable_objects):
+            # 行未增删：只重算受影响字符串的样式，并按行发出 dataChanged
+            refresh_objs = {ts_obj.id: ts_obj for ts_obj in changed}
+            for ts_id in changed_ids or ():
+                ts_obj = self._find_ts_obj_by_id(ts_id)
+                if ts_obj is not None:
+                    refresh_objs[ts_id] = ts_obj
+            for ts_obj in refresh_objs.values():
+                ts_obj.update_style_cache()
+            self._emit_rows_changed(refresh_objs)
+            self.update_counts_display()
         else:
-            self.refresh_sheet_preserve_selection()
+            for ts_obj in self.translatable_objects:
+                ts_obj.update_style_cache()
+            self.sheet_model.set_translatable_objects(self.translatable_objects)
+            if self.use_static_sorting_var:
+                self.proxy_model.invalidate()
+            else:
+                self.refresh_sheet_preserve_selection()
         self.force_refresh_ui_for_current_selection()
-        self.update_statusbar(_("Validation complete."), persistent=False)
+        if run_in_background:
+            self._start_background_validation(pending, with_glossary)
+        else:
+            self.update_statusbar(_("Validation complete."), persistent=False)
+
+    def _start_background_validation(self, pending, with_glossary, is_full_pass=True):
+        self.validation_run_id += 1
+        cancel_token = ValidationCancelToken()
+        self.validation_runs[self.validation_run_id] = (cancel_token, is_full_pass)
+        worker = ValidationWorker(self.validation_run_id, pending, self.config, self, with_glossary, cancel_token)
+        worker.signals.batch_ready.connect(self._on_validation_batch_ready)
+        worker.signals.progress.connect(self._on_validation_progress)
+        worker.signals.stats_ready.connect(self._on_validation_stats_ready)
+        worker.signals.finished.connect(self._on_validation_finished)
+        if is_full_pass:
+            self.statusbar_label.setText(
+                _("Validating {count} entries in background...").format(count=len(pending)))
+        self.ai_thread_pool.start(worker)
+
+    def _cancel_background_validation(self):
+        for cancel_token, _is_full_pass in self.validation_runs.values():
+            cancel_token.cancel()
+        self.validation_runs.clear()
+
+    def _on_validation_batch_ready(self, run_id, results):
+        if run_id not in self.validation_runs:
+            return
+        applied_ids = []
+        for ts_id, key, warnings, minor_warnings in results:
+            ts_obj = self.ts_index.get(ts_id)
+            if ts_obj is None or not self.validation_engine.apply_result(ts_obj, key, warnings, minor_warnings,
+                                                                         self.config, self):
+                continue
+            ts_obj.update_style_cache()
+            applied_ids.append(ts_id)
+        if not self._emit_rows_changed(applied_ids):
+            return
+        self.update_counts_display()
+        if any(item[0] == self.current_selected_ts_id for item in results):
+            self.force_refresh_ui_for_current_selection()
+
+    def _emit_rows_changed(self, ts_ids):
+        """Emits dataChanged for the rows of ts_ids, one signal per run of consecutive rows. Returns True if any."""
+        rows = []
+        for ts_id in ts_ids:
+            source_index = self.sheet_model.index_from_id(ts_id)
+            if source_index.isValid():
+                rows.append(source_index.row())
+        if not rows:
+            return False
+        # 按连续行区间发出 dataChanged，避免覆盖整张表
+        rows.sort()
+        last_col = self.sheet_model.columnCount() - 1
+        range_start = previous = rows[0]
+        for row in rows[1:] + [None]:
+            if row is not None and row == previous + 1:
+                previous = row
+                continue
+            self.sheet_model.dataChanged.emit(self.sheet_model.index(range_start, 0),
+                                              self.sheet_model.index(previous, last_col))
+            if row is not None:
+                range_start = previous = row
+        return True
+
+    def _on_validation_progress(self, run_id, done, total):
+        if not self.validation_runs.get(run_id, (None, False))[1]:
+            return
+        self.statusbar_label.setText(_("Validating entries... {done}/{total}").format(done=done, total=total))
+
+    def _on_validation_stats_ready(self, run_id, stats):
+        # 统计由各次运行单独收集，只在 UI 线程中合并
+        self.validation_engine.pipeline.merge_stats(stats)
+
+    def _on_validation_finished(self, run_id, cancelled):
+        run = self.validation_runs.pop(run_id, None)
+        if run is None:
+            return
+        self.update_counts_display()
+        if run[1] and not cancelled:
+            self.update_statusbar(_("Validation complete."), persistent=False)
+            logger.debug(f"Validation rule report:\n{self.validation_engine.pipeline.format_report()}")
+
+    def _run_full_revalidation(self):
+        self.validation_engine.clear()
+        self._run_and_refresh_with_validation()
 
     def cm_set_warning_ignored_status(self, ignore_flag):
         selected_objs = self._get_selected_ts_objects_from_sheet()
@@ -2497,7 +2629,7 @@ class LexiSyncApp(QMainWindow):
         else:
             self.update_statusbar(_("Selected item(s) already have the desired warning status."))
 
-        self._run_and_refresh_with_validation()
+        self._run_and_refresh_with_validation({change['string_id'] for change in changes_for_undo})
 
     def _apply_translation_to_model(self, ts_obj, new_translation_from_ui, source="manual", run_validation=True):
         processed_translation = self.plugin_manager.run_hook(
@@ -2539,9 +2671,8 @@ class LexiSyncApp(QMainWindow):
                     ts_obj.get_translation_for_storage_and_tm(),
                     self.source_language, self.target_language
                 )
-        for other_ts_obj in self.translatable_objects:
+        for other_ts_obj in self.ts_index.get_by_original(ts_obj.original_semantic):
             if other_ts_obj.id != ts_obj.id and \
-                    other_ts_obj.original_semantic == ts_obj.original_semantic and \
                     other_ts_obj.translation != new_translation_from_ui:
                 old_other_translation_for_undo = other_ts_obj.get_translation_for_storage_and_tm()
                 other_ts_obj.set_translation_internal(new_translation_from_ui)
@@ -2578,7 +2709,7 @@ class LexiSyncApp(QMainWindow):
                 QMessageBox.critical(self, _("Error"), _("Original text cannot be empty for a new entry."))
                 return
 
-            if any(ts.original_semantic == new_original for ts in self.translatable_objects):
+            if self.ts_index.has_original(new_original):
                 QMessageBox.critical(self, _("Error"), _("This original text already exists."))
                 return
 
@@ -2590,6 +2721,7 @@ class LexiSyncApp(QMainWindow):
             new_ts.comment = self.comment_status_panel.comment_edit_text.toPlainText().strip()
 
             self.translatable_objects.append(new_ts)
+            self.ts_index.add(new_ts)
             self.mark_project_modified()
             self._run_and_refresh_with_validation()
             self.select_sheet_row_by_id(new_ts.id, see=True)
@@ -2706,7 +2838,7 @@ class LexiSyncApp(QMainWindow):
             'string_id': ts_obj.id, 'field': 'comment',
             'old_value': old_comment, 'new_value': new_comment
         })
-        self._run_and_refresh_with_validation()
+        self._run_and_refresh_with_validation({ts_obj.id})
         self.update_statusbar(_("Comment updated for ID {id}...").format(id=str(ts_obj.id)[:8]))
         self.mark_project_modified()
         return True
@@ -2715,11 +2847,14 @@ class LexiSyncApp(QMainWindow):
         if not changed_ids:
             return
 
-        from services.validation_service import validate_string
+        # 编辑时只内联运行轻量规则，开销较大的规则（如术语检查）转到后台补齐
+        deferred = []
         for ts_id in changed_ids:
             ts_obj = self._find_ts_obj_by_id(ts_id)
             if ts_obj:
-                validate_string(ts_obj, self.config, self)
+                pending_item = self.validation_engine.validate_inline(ts_obj, self.config, self)
+                if pending_item is not None:
+                    deferred.append(pending_item)
                 ts_obj.update_style_cache()
                 source_index = self.sheet_model.index_from_id(ts_obj.id)
                 if source_index.isValid():
@@ -2731,6 +2866,9 @@ class LexiSyncApp(QMainWindow):
             self.force_refresh_ui_for_current_selection()
 
         self.update_counts_display()
+        if deferred:
+            self._start_background_validation(
+                deferred, self.validation_engine.uses_glossary(self.config, self), is_full_pass=False)
 
     def force_full_refresh(self, id_to_reselect=None):
         self.sheet_model.set_translatable_objects(self.translatable_objects)
@@ -3174,7 +3312,7 @@ class LexiSyncApp(QMainWindow):
                 self.add_to_undo_history('bulk_excel_import', {'changes': changes_for_undo})
                 self.mark_project_modified()
 
-            self._run_and_refresh_with_validation()
+            self._run_and_refresh_with_validation({change['string_id'] for change in changes_for_undo})
             if self.current_selected_ts_id: self.force_refresh_ui_for_current_selection()
 
             self.update_statusbar(_("Imported/updated {field_count} fields for {item_count} items from Excel.").format(
@@ -3313,12 +3451,13 @@ class LexiSyncApp(QMainWindow):
 
     def import_po_file_dialog_with_path(self, po_filepath):
         self._reset_app_state()
-        self.project_tm = {}
+        self.project_tm = JournaledTM()
         self.current_project_tm_path = None
-        self.global_tm = {}
+        self.global_tm = JournaledTM()
         global_tm_path = self._get_global_tm_path()
         if os.path.exists(global_tm_path):
             self.global_tm = self.tm_service.load_tm_from_directory(global_tm_path)
+        self.tm_service.retain_load_cache([global_tm_path])
         self.global_tm_path = global_tm_path
         try:
             self.translatable_objects, self.current_po_metadata, po_lang_full = po_file_service.load_from_po(po_filepath)
@@ -3528,7 +3667,7 @@ class LexiSyncApp(QMainWindow):
         if not self.translatable_objects:
             QMessageBox.information(self, _("Statistics"), _("No project data loaded to generate statistics."))
             return
-        dialog = StatisticsDialog(self, self.translatable_objects)
+        dialog = StatisticsDialog(self, self.translatable_objects, self.status_counters)
         dialog.locate_item_signal.connect(self.select_sheet_row_by_id_and_scroll)
         dialog.show()
 
@@ -3549,9 +3688,7 @@ class LexiSyncApp(QMainWindow):
                 self.project_tm.update(loaded_tm)
 
             if hasattr(self, 'plugin_manager'):
-                combined_tm = self.global_tm.copy()
-                combined_tm.update(self.project_tm)
-                self.plugin_manager.run_hook('on_tm_loaded', combined_tm)
+                self.plugin_manager.run_hook('on_tm_loaded', self._get_layered_tm())
 
             if not silent:
                 QMessageBox.information(self, _("TM"),
@@ -3634,18 +3771,27 @@ class LexiSyncApp(QMainWindow):
             QMessageBox.information(self, _("Clear TM"), _("{tm_name} is already empty.").format(tm_name=tm_name))
             return
 
-        reply = QMessageBox.question(self, _("Confirm Clear"),
-                                     _("Are you sure you want to clear all entries from the in-memory {tm_name}?\n"
-                                       "This cannot be undone.").format(tm_name=tm_name),
+        store = tm_to_clear.store if isinstance(tm_to_clear, StoreLayeredTM) else tm_to_clear
+        if isinstance(store, SQLiteTMStore):
+            # 数据库 TM 的修改即时提交，清空后无法通过不保存来撤销
+            message = _("{tm_name} is stored in the database '{filename}'. Clearing it deletes all entries "
+                        "from the database immediately and permanently.\n"
+                        "Are you sure you want to continue?").format(tm_name=tm_name,
+                                                                    filename=os.path.basename(store.db_path))
+        else:
+            message = _("Are you sure you want to clear all entries from the in-memory {tm_name}?\n"
+                        "This cannot be undone.").format(tm_name=tm_name)
+        reply = QMessageBox.question(self, _("Confirm Clear"), message,
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
             tm_to_clear.clear()
-            self.update_statusbar(_("In-memory {tm_name} has been cleared.").format(tm_name=tm_name))
+            if isinstance(store, SQLiteTMStore):
+                self.update_statusbar(_("{tm_name} has been cleared.").format(tm_name=tm_name))
+            else:
+                self.update_statusbar(_("In-memory {tm_name} has been cleared.").format(tm_name=tm_name))
 
             if hasattr(self, 'plugin_manager'):
-                combined_tm = self.global_tm.copy()
-                combined_tm.update(self.project_tm)
-                self.plugin_manager.run_hook('on_tm_loaded', combined_tm)
+                self.plugin_manager.run_hook('on_tm_loaded', self._get_layered_tm())
 
             if self.current_selected_ts_id:
                 self.perform_tm_update()
@@ -3693,6 +3839,7 @@ class LexiSyncApp(QMainWindow):
                                          QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
             if reply == QMessageBox.Yes:
                 del tm_to_update[ts_obj.original_semantic]
+                self.tm_revision += 1
                 self.update_statusbar(_("TM entry cleared for selected item."))
                 self.perform_tm_update()
                 self.mark_project_modified()
@@ -3711,8 +3858,7 @@ class LexiSyncApp(QMainWindow):
 
     def apply_tm_to_all_current_strings(self, silent=False, only_if_empty=False, confirm=False):
         if self.is_project_mode:
-            tm_to_use = self.global_tm.copy()
-            tm_to_use.update(self.project_tm)
+            tm_to_use = self._get_layered_tm()
         else:
             tm_to_use = self.global_tm
 
@@ -3733,6 +3879,8 @@ class LexiSyncApp(QMainWindow):
         applied_count = 0
         bulk_changes_for_undo = []
         ids_to_update = set()
+        tm_units = fetch_units(tm_to_use, [ts_obj.original_semantic for ts_obj in self.translatable_objects
+                                           if not ts_obj.is_ignored])
 
         for ts_obj in self.translatable_objects:
             if ts_obj.is_ignored:
@@ -3740,8 +3888,8 @@ class LexiSyncApp(QMainWindow):
             if only_if_empty and ts_obj.translation.strip() != "":
                 continue
 
-            if ts_obj.original_semantic in tm_to_use:
-                translation_unit = tm_to_use[ts_obj.original_semantic]
+            translation_unit = tm_units.get(ts_obj.original_semantic)
+            if translation_unit is not None:
                 translation_from_tm_storage = translation_unit.get('target_text', '')
 
                 translation_for_model_ui = translation_from_tm_storage.replace("\\n", "\n")
@@ -3887,10 +4035,8 @@ class LexiSyncApp(QMainWindow):
             "original_context": ""
         }
 
-        try:
-            current_item_index = \
-                [i for i, ts in enumerate(self.translatable_objects) if ts.id == current_ts_id_to_exclude][0]
-        except IndexError:
+        current_item_index = self.ts_index.position_of(current_ts_id_to_exclude)
+        if current_item_index is None:
             return contexts
 
         # --- 处理 [Translated Context] ---
@@ -4344,9 +4490,8 @@ class LexiSyncApp(QMainWindow):
 
             single_translation_undo_changes = []
 
-            for ts_obj in self.translatable_objects:
-                if ts_obj.original_semantic == original_text_to_match and \
-                        (not ts_obj.translation.strip() or ts_obj.id == trigger_ts_obj.id):
+            for ts_obj in self.ts_index.get_by_original(original_text_to_match):
+                if not ts_obj.translation.strip() or ts_obj.id == trigger_ts_obj.id:
 
                     old_undo_val = ts_obj.get_translation_for_storage_and_tm()
                     new_undo_val = cleaned_translation.replace('\n', '\\n')
@@ -4414,8 +4559,8 @@ class LexiSyncApp(QMainWindow):
             ts_obj = self._find_ts_obj_by_id(change['string_id'])
             if not ts_obj: continue
 
-            original_placeholders = set(self.placeholder_regex.findall(ts_obj.original_semantic))
-            translated_placeholders = set(self.placeholder_regex.findall(ts_obj.translation))
+            original_placeholders = get_text_features(ts_obj.original_semantic).placeholder_set
+            translated_placeholders = get_text_features(ts_obj.translation).placeholder_set
 
             if original_placeholders != translated_placeholders:
                 mismatched_items.append(ts_obj)
@@ -4439,7 +4584,7 @@ class LexiSyncApp(QMainWindow):
                         })
                 if bulk_comment_changes:
                     self.add_to_undo_history('bulk_context_menu', {'changes': bulk_comment_changes})
-                    self._run_and_refresh_with_validation()
+                    self._run_and_refresh_with_validation({change['string_id'] for change in bulk_comment_changes})
                     self.update_statusbar(_("Added comments to {count} placeholder mismatched items.").format(
                         count=len(bulk_comment_changes)))
 
@@ -4543,23 +4688,25 @@ class LexiSyncApp(QMainWindow):
 
     def perform_tm_update(self):
         if self.last_tm_query:
-            project_tm_data = self.project_tm or {}
-            global_tm_data = self.global_tm or {}
-
-            combined_tm_data = {}
-            for k, tu in global_tm_data.items():
-                combined_tm_data[k] = tu['target_text']
-            for k, tu in project_tm_data.items():
-                combined_tm_data[k] = tu['target_text']
+            # 项目 TM 覆盖全局 TM，按需查找，不再合并出新的字典
+            tm_view = self._get_layered_tm(value_key='target_text')
+            active_layers = [tm_data for __, tm_data in tm_view.layers if tm_data]
+            if len(active_layers) == 1 and isinstance(active_layers[0], SQLiteTMStore):
+                # 只有数据库 TM 时直接在数据库中检索，不把原文读入内存
+                fuzzy_index = active_layers[0]
+            else:
+                index_key = tm_view.signature + (self.tm_revision,)
+                if self.tm_fuzzy_index is None or self.tm_fuzzy_index_key != index_key:
+                    self.tm_fuzzy_index = TMFuzzyIndex(tm_view)
+                    self.tm_fuzzy_index_key = index_key
+                fuzzy_index = self.tm_fuzzy_index
 
-            source_map = {
-                k: _("[Project]") for k in project_tm_data
-            }
-            source_map.update({
-                k: _("[Global]") for k in global_tm_data if k not in project_tm_data
-            })
+            self.tm_panel.update_tm_suggestions_for_text(self.last_tm_query, tm_view, tm_view.source_tags,
+                                                         fuzzy_index)
 
-            self.tm_panel.update_tm_suggestions_for_text(self.last_tm_query, combined_tm_data, source_map)
+    def _get_layered_tm(self, value_key=None):
+        return LayeredTM([(_("[Project]"), self.project_tm or {}), (_("[Global]"), self.global_tm or {})],
+                         value_key=value_key)
 
     def cm_edit_comment(self):
         selected_objs = self._get_selected_ts_objects_from_sheet()
@@ -4585,7 +4732,7 @@ class LexiSyncApp(QMainWindow):
 
             if bulk_changes:
                 self.add_to_undo_history('bulk_context_menu', {'changes': bulk_changes})
-                self._run_and_refresh_with_validation()
+                self._run_and_refresh_with_validation({change['string_id'] for change in bulk_changes})
                 if self.current_selected_ts_id in [c['string_id'] for c in bulk_changes]:
                     self.comment_status_panel.comment_edit_text.setPlainText(new_comment)
                 self.update_statusbar(_("Updated comments for {count} items.").format(count=len(bulk_changes)))
@@ -4596,8 +4743,7 @@ class LexiSyncApp(QMainWindow):
         if not selected_objs: return
 
         if self.is_project_mode:
-            tm_to_use = self.global_tm.copy()
-            tm_to_use.update(self.project_tm)
+            tm_to_use = self._get_layered_tm()
         else:
             tm_to_use = self.global_tm
 
@@ -4607,10 +4753,11 @@ class LexiSyncApp(QMainWindow):
 
         applied_count = 0
         bulk_changes = []
+        tm_units = fetch_units(tm_to_use, [ts_obj.original_semantic for ts_obj in selected_objs])
         for ts_obj in selected_objs:
             if ts_obj.is_ignored: continue
-            if ts_obj.original_semantic in tm_to_use:
-                translation_unit = tm_to_use[ts_obj.original_semantic]
+            translation_unit = tm_units.get(ts_obj.original_semantic)
+            if translation_unit is not None:
                 tm_translation_storage = translation_unit.get('target_text', '')
 
                 tm_translation_ui = tm_translation_storage.replace("\\n", "\n")
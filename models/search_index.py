@@ -0,0 +1,122 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+from bisect import bisect_right
+
+FIELD_SEPARATOR = '\x00'
+
+
+def _fold(text):
+    # re.IGNORECASE 中 İ、ı 与 i/I 等价，casefold 却保留 ı 并把 İ 变为 i + U+0307；
+    # 统一折叠为 i 并去掉 U+0307，逐字符映射仍保持 lower() 的子串关系
+    return text.replace('\u0130', 'i').casefold().replace('\u0131', 'i').replace('\u0307', '')
+
+
+def _search_fields(ts_obj):
+    return FIELD_SEPARATOR.join((ts_obj.original_semantic, ts_obj.get_translation_for_ui(), ts_obj.comment))
+
+
+class SearchIndex:
+    """
+    Case-folded search fields (original, translation, comment) per source row.
+    Substring queries run over one joined corpus with str.find, so a search costs
+    a single C-level scan instead of lower-casing every row on each filter pass.
+
+    find_rows matches case-folded text on both sides, which finds every row that
+    a re.IGNORECASE or a lower() substring search would find (ς/σ, ſ/s, ı/i and
+    the like fold together). The quick-search filter keeps its lower() semantics:
+    rows whose lower() and folded text differ are confirmed separately.
+    """
+
+    def __init__(self, translatable_objects=None):
+        self._objects = []
+        self._folded = []
+        # lower() 与折叠结果不同的行，快速搜索时需用 lower() 复核
+        self._special_rows = set()
+        self._corpus = None
+        self._row_starts = []
+        self.query_term = ""
+        self.matching_rows = None
+        self.rebuild(translatable_objects or [])
+
+    def _fold_row(self, row):
+        fields = _search_fields(self._objects[row])
+        folded = _fold(fields)
+        if folded != fields.lower():
+            self._special_rows.add(row)
+        else:
+            self._special_rows.discard(row)
+        return folded
+
+    def rebuild(self, translatable_objects):
+        self._objects = translatable_objects
+        self._special_rows = set()
+        self._folded = [self._fold_row(row) for row in range(len(translatable_objects))]
+        self._corpus = None
+        self.set_query(self.query_term)
+
+    def update_row(self, row):
+        if not 0 <= row < len(self._folded):
+            return
+        folded = self._fold_row(row)
+        if folded != self._folded[row]:
+            self._folded[row] = folded
+            self._corpus = None
+        # 折叠结果不变时 lower() 结果仍可能变化（如 ß 改为 ss），因此总是重新判断
+        if self.matching_rows is not None:
+            if self._matches_lower(row, self.query_term):
+                self.matching_rows.add(row)
+            else:
+                self.matching_rows.discard(row)
+
+    def _matches_lower(self, row, term):
+        return term in _search_fields(self._objects[row]).lower()
+
+    def set_query(self, term):
+        self.query_term = term.lower() if term else ""
+        if not self.query_term:
+            self.matching_rows = None
+            return
+        candidates = self.find_rows(term)
+        # 折叠后命中的行是 lower() 命中的超集；只有可能不一致的行需要复核
+        if _fold(term) == self.query_term:
+            rows_to_check = candidates & self._special_rows
+        else:
+            rows_to_check = candidates
+        self.matching_rows = candidates - {row for row in rows_to_check
+                                           if not self._matches_lower(row, self.query_term)}
+
+    def accepts_row(self, row):
+        return self.matching_rows is None or row in self.matching_rows
+
+    def find_rows(self, term):
+        """Source rows whose fields may contain term, ignoring case; callers confirm with their own matching."""
+        term = _fold(term)
+        if not term:
+            return set(range(len(self._folded)))
+        if FIELD_SEPARATOR in term:
+            return {row for row, folded in enumerate(self._folded) if term in folded}
+
+        self._ensure_corpus()
+        corpus = self._corpus
+        row_starts = self._row_starts
+        rows = set()
+        pos = corpus.find(term)
+        while pos != -1:
+            row = bisect_right(row_starts, pos) - 1
+            rows.add(row)
+            if row + 1 >= len(row_starts):
+                break
+            pos = corpus.find(term, row_starts[row + 1])
+        return rows
+
+    def _ensure_corpus(self):
+        if self._corpus is not None:
+            return
+        row_starts = []
+        offset = 0
+        for folded in self._folded:
+            row_starts.append(offset)
+            offset += len(folded) + 1
+        self._row_starts = row_starts
+        self._corpus = FIELD_SEPARATOR.join(self._folded)
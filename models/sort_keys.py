@@ -0,0 +1,102 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+NEW_ENTRY_ID = "##NEW_ENTRY##"
+
+
+def _status_weight(ts_obj):
+    if ts_obj.is_ignored: return 5
+    if ts_obj.is_reviewed: return 4
+    if ts_obj.warnings and not ts_obj.is_warning_ignored: return 0
+    if not ts_obj.translation.strip(): return 1
+    if ts_obj.minor_warnings and not ts_obj.is_warning_ignored: return 2
+    return 3
+
+
+def _column_key(ts_obj, column):
+    if column == 1 or column == 5:
+        return _status_weight(ts_obj), ts_obj.line_num_in_file
+    elif column == 2:
+        return ts_obj.original_semantic.lower()
+    elif column == 3:
+        return ts_obj.get_translation_for_ui().lower()
+    elif column == 4:
+        return ts_obj.comment.lower()
+    elif column == 6:
+        return ts_obj.line_num_in_file
+    return 0
+
+
+class SortKeyCache:
+    """
+    Per-column sort keys for the rows of the source model, plus dense ranks
+    computed once per sort request so lessThan is a plain integer comparison.
+    Rows that change only refresh their own keys; until the next sort request
+    comparisons fall back to the cached keys.
+    """
+
+    def __init__(self, translatable_objects=None):
+        self._objects = []
+        self._keys = {}
+        self._ranks = {}
+        self._is_po_mode = False
+        self.rebuild(translatable_objects or [])
+
+    def rebuild(self, translatable_objects):
+        self._objects = translatable_objects
+        self._keys.clear()
+        self._ranks.clear()
+
+    def _row_key(self, row, column):
+        ts_obj = self._objects[row]
+        key = row if column == 0 else _column_key(ts_obj, column)
+        if self._is_po_mode:
+            # 新条目总是排在最后
+            return ts_obj.id == NEW_ENTRY_ID, key
+        return key
+
+    def invalidate_row(self, row):
+        if not 0 <= row < len(self._objects):
+            return
+        for column, keys in self._keys.items():
+            keys[row] = self._row_key(row, column)
+        self._ranks.clear()
+
+    def prepare(self, column, is_po_mode):
+        if is_po_mode != self._is_po_mode:
+            self._is_po_mode = is_po_mode
+            self._keys.clear()
+            self._ranks.clear()
+        if column < 0 or column in self._ranks or (column == 0 and not is_po_mode):
+            return
+        keys = self._get_keys(column)
+        ranks = [0] * len(keys)
+        rank = -1
+        previous_key = None
+        for row in sorted(range(len(keys)), key=keys.__getitem__):
+            key = keys[row]
+            if rank < 0 or key != previous_key:
+                rank += 1
+                previous_key = key
+            ranks[row] = rank
+        self._ranks[column] = ranks
+
+    def _get_keys(self, column):
+        keys = self._keys.get(column)
+        if keys is None:
+            keys = [self._row_key(row, column) for row in range(len(self._objects))]
+            self._keys[column] = keys
+        return keys
+
+    def less_than(self, column, left_row, right_row, is_po_mode):
+        if column < 0:
+            return False
+        if column == 0 and not is_po_mode:
+            return left_row < right_row
+        if is_po_mode != self._is_po_mode:
+            self.prepare(column, is_po_mode)
+        ranks = self._ranks.get(column)
+        if ranks is not None:
+            return ranks[left_row] < ranks[right_row]
+        keys = self._get_keys(column)
+        return keys[left_row] < keys[right_row]
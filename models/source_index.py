@@ -0,0 +1,47 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+import re
+from array import array
+
+# 与 str.splitlines() 使用相同的行边界
+_line_boundary_regex = re.compile(r'\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+class SourceIndex:
+    """
+    Read-only, line-addressable view over a single source buffer.
+    Behaves like the list returned by ``text.splitlines()``, but only stores
+    line offsets and slices the shared buffer on demand.
+    """
+    __slots__ = ('text', '_starts', '_ends')
+
+    def __init__(self, text):
+        self.text = text or ""
+        starts = array('q', [0])
+        ends = array('q')
+        for match in _line_boundary_regex.finditer(self.text):
+            ends.append(match.start())
+            starts.append(match.end())
+        if starts[-1] < len(self.text):
+            ends.append(len(self.text))
+        else:
+            starts.pop()
+        self._starts = starts
+        self._ends = ends
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __bool__(self):
+        return len(self._starts) > 0
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self.text[self._starts[i]:self._ends[i]] for i in range(*item.indices(len(self._starts)))]
+        return self.text[self._starts[item]:self._ends[item]]
+
+    def __iter__(self):
+        text = self.text
+        for start, end in zip(self._starts, self._ends):
+            yield text[start:end]
@@ -0,0 +1,92 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+COUNTER_KEYS = (
+    'translated_count', 'untranslated_count', 'ignored_count', 'reviewed_count',
+    'warning_count', 'minor_warning_count',
+    'source_char_count_for_expansion', 'translation_char_count_for_expansion'
+)
+
+
+def _empty_totals():
+    return dict.fromkeys(COUNTER_KEYS, 0)
+
+
+def _status_record(ts_obj):
+    # 与 COUNTER_KEYS 顺序一致的元组
+    translated = reviewed = untranslated = ignored = 0
+    source_chars = translation_chars = 0
+    if ts_obj.is_ignored:
+        ignored = 1
+    elif ts_obj.translation.strip():
+        translated = 1
+        reviewed = 1 if ts_obj.is_reviewed else 0
+        source_chars = len(ts_obj.original_semantic)
+        translation_chars = len(ts_obj.translation)
+    else:
+        untranslated = 1
+    warning = minor_warning = 0
+    if not ts_obj.is_warning_ignored:
+        if ts_obj.warnings:
+            warning = 1
+        elif ts_obj.minor_warnings:
+            minor_warning = 1
+    return (translated, untranslated, ignored, reviewed, warning, minor_warning, source_chars, translation_chars)
+
+
+class StatusCounters:
+    """
+    Incrementally maintained status totals for all strings and for the
+    currently displayed (filtered) subset.
+    """
+
+    def __init__(self):
+        self._records = {}
+        self._visible_ids = set()
+        self.totals = _empty_totals()
+        self.visible_totals = _empty_totals()
+
+    @property
+    def total_count(self):
+        return len(self._records)
+
+    @property
+    def visible_count(self):
+        return len(self._visible_ids)
+
+    def rebuild(self, translatable_objects, visible_ids=None):
+        self._records = {}
+        self.totals = _empty_totals()
+        for ts_obj in translatable_objects:
+            record = _status_record(ts_obj)
+            self._records[ts_obj.id] = record
+            self._apply(self.totals, record, 1)
+        self.set_visible_ids(visible_ids if visible_ids is not None else self._records.keys())
+
+    def set_visible_ids(self, visible_ids):
+        self._visible_ids = {ts_id for ts_id in visible_ids if ts_id in self._records}
+        self.visible_totals = _empty_totals()
+        for ts_id in self._visible_ids:
+            self._apply(self.visible_totals, self._records[ts_id], 1)
+
+    def update(self, ts_obj, is_visible):
+        old_record = self._records.get(ts_obj.id)
+        if old_record is None:
+            return
+        new_record = _status_record(ts_obj)
+        self._records[ts_obj.id] = new_record
+        self._apply(self.totals, old_record, -1)
+        self._apply(self.totals, new_record, 1)
+
+        if ts_obj.id in self._visible_ids:
+            self._apply(self.visible_totals, old_record, -1)
+            self._visible_ids.discard(ts_obj.id)
+        if is_visible:
+            self._apply(self.visible_totals, new_record, 1)
+            self._visible_ids.add(ts_obj.id)
+
+    @staticmethod
+    def _apply(totals, record, sign):
+        for key, value in zip(COUNTER_KEYS, record):
+            if value:
+                totals[key] += sign * value
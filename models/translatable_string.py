@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import uuid
+from collections import namedtuple
 from PySide6.QtGui import QColor, QFont
 from utils.constants import APP_NAMESPACE_UUID, MAX_UNDO_HISTORY
 from utils.localization import _
@@ -9,8 +10,109 @@ from utils.enums import WarningType
 import logging
 logger = logging.getLogger(__name__)
 
+CONTEXT_RADIUS = 5
+
+FLAG_IGNORED = 1 << 0
+FLAG_AUTO_IGNORED = 1 << 1
+FLAG_WARNING_IGNORED = 1 << 2
+FLAG_REVIEWED = 1 << 3
+FLAG_FUZZY = 1 << 4
+
+# 共享的只读样式对象（享元），按状态选择，不要修改其中的 QColor/QFont
+StringStyle = namedtuple('StringStyle', [
+    'background', 'foreground', 'font', 'original_newline_color', 'translation_newline_color'
+])
+EMPTY_STYLE = StringStyle(None, None, None, None, None)
+
+STYLE_IGNORED_WITH_WARNING = 'ignored_with_warning'
+STYLE_IGNORED = 'ignored'
+STYLE_REVIEWED = 'reviewed'
+STYLE_WARNING = 'warning'
+STYLE_MINOR_WARNING = 'minor_warning'
+STYLE_TRANSLATED = 'translated'
+STYLE_UNTRANSLATED = 'untranslated'
+
+NEWLINE_NONE = 0
+NEWLINE_BOTH = 1
+NEWLINE_ORIGINAL_ONLY = 2
+NEWLINE_TRANSLATION_ONLY = 3
+
+_style_palette = {}
+
+
+def _build_status_style(status):
+    if status in (STYLE_IGNORED_WITH_WARNING, STYLE_IGNORED):
+        font = QFont()
+        font.setItalic(True)
+        foreground = QColor(255, 0, 0, 150) if status == STYLE_IGNORED_WITH_WARNING else QColor("#707070")
+        return QColor(220, 220, 220, 200), foreground, font
+    if status == STYLE_REVIEWED:
+        return None, QColor("darkgreen"), None
+    if status == STYLE_WARNING:
+        return QColor("#FFDDDD"), QColor("red"), None  # 浅红色背景, 红色文字
+    if status == STYLE_MINOR_WARNING:
+        return QColor("#FFFACD"), None, None  # 浅黄色背景
+    if status == STYLE_TRANSLATED:
+        return None, QColor("darkblue"), None  # 已翻译 - 深蓝色
+    return None, QColor("darkred"), None  # 未翻译 - 暗红色
+
+
+def _build_newline_colors(newline_state):
+    if newline_state == NEWLINE_BOTH:
+        # 两者都有，都是绿色
+        green_color = QColor(34, 177, 76, 180)
+        return green_color, green_color
+    # 只有一个有，哪个有，哪个就是红色
+    red_color = QColor(237, 28, 36, 180)
+    if newline_state == NEWLINE_ORIGINAL_ONLY:
+        return red_color, None
+    if newline_state == NEWLINE_TRANSLATION_ONLY:
+        return None, red_color
+    return None, None
+
+
+def get_string_style(status, newline_state):
+    key = (status, newline_state)
+    style = _style_palette.get(key)
+    if style is None:
+        style = StringStyle(*_build_status_style(status), *_build_newline_colors(newline_state))
+        _style_palette[key] = style
+    return style
+
+
+class _Flag:
+    __slots__ = ('mask',)
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return bool(instance._flags & self.mask)
+
+    def __set__(self, instance, value):
+        if value:
+            instance._flags |= self.mask
+        else:
+            instance._flags &= ~self.mask
+
 
 class TranslatableString:
+    __slots__ = (
+        'id', 'original_raw', 'original_semantic', 'translation', '_flags', 'occurrences',
+        'char_pos_start_in_file', 'char_pos_end_in_file', 'warnings', 'minor_warnings',
+        'string_type', 'comment', 'po_comment', 'ui_style', 'validation_key',
+        '_context_source', '_context_line_idx', '_context_lines', '_current_line_in_context_idx',
+        '_translation_edit_history', '_translation_history_pointer', '__weakref__'
+    )
+
+    is_ignored = _Flag(FLAG_IGNORED)
+    was_auto_ignored = _Flag(FLAG_AUTO_IGNORED)
+    is_warning_ignored = _Flag(FLAG_WARNING_IGNORED)
+    is_reviewed = _Flag(FLAG_REVIEWED)
+    is_fuzzy = _Flag(FLAG_FUZZY)
+
     def __init__(self, original_raw, original_semantic, line_num, char_pos_start_in_file, char_pos_end_in_file,
                  full_code_lines, string_type="Custom String", source_file_path="", occurrences=None):
         name_string_for_uuid = f"{original_semantic}::{string_type}::L{line_num}::C{char_pos_start_in_file}"
@@ -18,8 +120,7 @@ class TranslatableString:
         self.original_raw = original_raw
         self.original_semantic = original_semantic
         self.translation = ""
-        self.is_ignored = False
-        self.was_auto_ignored = False
+        self._flags = 0
         if occurrences is not None:
             self.occurrences = occurrences
         elif line_num > 0:
@@ -30,29 +131,47 @@ class TranslatableString:
         self.char_pos_end_in_file = char_pos_end_in_file
         self.warnings = []
         self.minor_warnings = []
-
-        self.is_warning_ignored = False
+        # ValidationEngine 记录的最近一次校验结果键
+        self.validation_key = None
         self.string_type = string_type
         self.comment = ""
-        self.is_reviewed = False
-        self.is_fuzzy = False
         self.po_comment = ""
 
-        self.ui_style_cache = {}
-        context_radius = 5
-        start_line_idx = max(0, line_num - 1 - context_radius)
-        current_line_content_idx = line_num - 1
-        if full_code_lines:
-            self.context_lines = full_code_lines[
-                                 start_line_idx: min(len(full_code_lines),
-                                                     current_line_content_idx + context_radius + 1)]
-            self.current_line_in_context_idx = current_line_content_idx - start_line_idx
-        else:
-            self.context_lines = []
-            self.current_line_in_context_idx = -1
-        self._translation_edit_history = [self.translation]
+        self.ui_style = EMPTY_STYLE
+        # 上下文按需从共享的源码行序列中切片，不再为每个字符串复制
+        self._context_source = full_code_lines if full_code_lines else None
+        self._context_line_idx = line_num - 1
+        self._context_lines = None
+        self._current_line_in_context_idx = None
+        self._translation_edit_history = None
         self._translation_history_pointer = 0
 
+    @property
+    def context_lines(self):
+        if self._context_lines is not None:
+            return self._context_lines
+        if self._context_source is None:
+            return []
+        start_line_idx = max(0, self._context_line_idx - CONTEXT_RADIUS)
+        end_line_idx = min(len(self._context_source), self._context_line_idx + CONTEXT_RADIUS + 1)
+        return self._context_source[start_line_idx:end_line_idx]
+
+    @context_lines.setter
+    def context_lines(self, value):
+        self._context_lines = value
+
+    @property
+    def current_line_in_context_idx(self):
+        if self._current_line_in_context_idx is not None:
+            return self._current_line_in_context_idx
+        if self._context_source is None:
+            return -1
+        return self._context_line_idx - max(0, self._context_line_idx - CONTEXT_RADIUS)
+
+    @current_line_in_context_idx.setter
+    def current_line_in_context_idx(self, value):
+        self._current_line_in_context_idx = value
+
     @property
     def line_num_in_file(self):
         try:
@@ -71,6 +190,8 @@ class TranslatableString:
         if text_with_newlines == self.translation:
             return
         self.translation = text_with_newlines
+        if self._translation_edit_history is None:
+            self._translation_edit_history = [""]
         if self._translation_history_pointer < len(self._translation_edit_history) - 1:
             self._translation_edit_history = self._translation_edit_history[:self._translation_history_pointer + 1]
         self._translation_edit_history.append(self.translation)
@@ -162,60 +283,38 @@ class TranslatableString:
         elif not should_have_fuzzy_warning and has_fuzzy_in_minor_warnings:
             self.minor_warnings = [(wt, msg) for wt, msg in self.minor_warnings if
                                    wt != WarningType.FUZZY_TRANSLATION]
-        self.ui_style_cache = {}
-
         # 1. 最高优先级：已忽略
         if self.is_ignored:
             # 被忽略，但仍有警告，则特殊显示
             if self.warnings and not self.is_warning_ignored:
-                self.ui_style_cache['background'] = QColor(220, 220, 220, 200)
-                self.ui_style_cache['foreground'] = QColor(255, 0, 0, 150)
-                font = QFont()
-                font.setItalic(True)
-                self.ui_style_cache['font'] = font
+                status = STYLE_IGNORED_WITH_WARNING
             else:
-                # 普通的忽略样式
-                self.ui_style_cache['background'] = QColor(220, 220, 220, 200)
-                self.ui_style_cache['foreground'] = QColor("#707070")
-                font = QFont()
-                font.setItalic(True)
-                self.ui_style_cache['font'] = font
-
+                status = STYLE_IGNORED
         # 2. 次高优先级：已审阅
         elif self.is_reviewed:
-            self.ui_style_cache['foreground'] = QColor("darkgreen")
-
+            status = STYLE_REVIEWED
         # 3. 严重警告
         elif self.warnings and not self.is_warning_ignored:
-                self.ui_style_cache['background'] = QColor("#FFDDDD")  # 浅红色背景
-                self.ui_style_cache['foreground'] = QColor("red")  # 红色文字
-
+            status = STYLE_WARNING
         # 4. 次级警告
         elif self.minor_warnings and not self.is_warning_ignored:
-            self.ui_style_cache['background'] = QColor("#FFFACD")  # 浅黄色背景
-
+            status = STYLE_MINOR_WARNING
         # 5. 普通翻译状态
         elif self.translation.strip():
-            self.ui_style_cache['foreground'] = QColor("darkblue")  # 已翻译 - 深蓝色
-        else:  # 未翻译
-            self.ui_style_cache['foreground'] = QColor("darkred")  # 未翻译 - 暗红色
+            status = STYLE_TRANSLATED
+        else:
+            status = STYLE_UNTRANSLATED
 
+        # 换行符
         original_has_newline = '\n' in self.original_semantic
         translation_has_newline = '\n' in self.translation
-
-        # 换行符
-        self.ui_style_cache.pop('original_newline_color', None)
-        self.ui_style_cache.pop('translation_newline_color', None)
-
         if original_has_newline and translation_has_newline:
-            # 两者都有，都是绿色
-            green_color = QColor(34, 177, 76, 180)
-            self.ui_style_cache['original_newline_color'] = green_color
-            self.ui_style_cache['translation_newline_color'] = green_color
-        elif original_has_newline or translation_has_newline:
-            # 只有一个有，哪个有，哪个就是红色
-            red_color = QColor(237, 28, 36, 180)
-            if original_has_newline:
-                self.ui_style_cache['original_newline_color'] = red_color
-            if translation_has_newline:
-                self.ui_style_cache['translation_newline_color'] = red_color
\ No newline at end of file
+            newline_state = NEWLINE_BOTH
+        elif original_has_newline:
+            newline_state = NEWLINE_ORIGINAL_ONLY
+        elif translation_has_newline:
+            newline_state = NEWLINE_TRANSLATION_ONLY
+        else:
+            newline_state = NEWLINE_NONE
+
+        self.ui_style = get_string_style(status, newline_state)
@@ -0,0 +1,45 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+
+class TranslatableStringIndex:
+    """
+    Lookup tables over the current list of TranslatableString objects:
+    id -> object, id -> position and original_semantic -> [objects].
+    """
+
+    def __init__(self, translatable_objects=None):
+        self._by_id = {}
+        self._positions = {}
+        self._by_original = {}
+        self._size = 0
+        self.rebuild(translatable_objects or [])
+
+    def rebuild(self, translatable_objects):
+        self._by_id = {}
+        self._positions = {}
+        self._by_original = {}
+        self._size = 0
+        for ts_obj in translatable_objects:
+            self.add(ts_obj)
+
+    def add(self, ts_obj):
+        self._by_id.setdefault(ts_obj.id, ts_obj)
+        self._positions.setdefault(ts_obj.id, self._size)
+        self._by_original.setdefault(ts_obj.original_semantic, []).append(ts_obj)
+        self._size += 1
+
+    def get(self, obj_id):
+        return self._by_id.get(obj_id)
+
+    def position_of(self, obj_id):
+        return self._positions.get(obj_id)
+
+    def get_by_original(self, original_semantic):
+        return self._by_original.get(original_semantic, [])
+
+    def has_original(self, original_semantic):
+        return original_semantic in self._by_original
+
+    def __len__(self):
+        return self._size
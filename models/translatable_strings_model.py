@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from PySide6.QtCore import QAbstractTableModel, Qt, QModelIndex, QSortFilterProxyModel, Signal, QObject
+from models.search_index import SearchIndex
+from models.sort_keys import SortKeyCache, NEW_ENTRY_ID
 from utils.localization import _
 
 NewlineColorRole = Qt.UserRole + 1
@@ -11,15 +13,54 @@ class TranslatableStringsModel(QAbstractTableModel):
         super().__init__(parent)
         self._data = data
         self._id_to_index_map = {obj.id: i for i, obj in enumerate(self._data)}
+        self.search_index = SearchIndex(self._data)
+        self.sort_keys = SortKeyCache(self._data)
+        self._display_cache = {}
+        self._display_cache_version = None
         self.headers = ["#", "S", "Original", "Translation", "Comment", "✔", "Line"]
         self.app_instance = parent
+        # 先于代理模型连接，保证代理重新过滤时索引已是最新
+        self.dataChanged.connect(self._on_data_changed)
 
     def set_translatable_objects(self, new_data):
         self.beginResetModel()
         self._data = new_data
         self._id_to_index_map = {obj.id: i for i, obj in enumerate(self._data)}
+        self.search_index.rebuild(self._data)
+        self.sort_keys.rebuild(self._data)
+        self._display_cache.clear()
         self.endResetModel()
 
+    def _on_data_changed(self, top_left, bottom_right, roles=None):
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self.search_index.update_row(row)
+            self.sort_keys.invalidate_row(row)
+            if 0 <= row < len(self._data):
+                row_id = self._data[row].id
+                self._display_cache.pop((row_id, 2), None)
+                self._display_cache.pop((row_id, 3), None)
+
+    def get_display_text(self, ts_obj, col):
+        text = ts_obj.original_semantic if col == 2 else ts_obj.get_translation_for_ui()
+        plugin_manager = self.app_instance.plugin_manager
+        if not plugin_manager.is_hook_implemented('process_string_for_display'):
+            return text
+        if self._display_cache_version != plugin_manager.hooks_version:
+            self._display_cache.clear()
+            self._display_cache_version = plugin_manager.hooks_version
+        cache_key = (ts_obj.id, col)
+        cached = self._display_cache.get(cache_key)
+        if cached is not None and cached[0] is text:
+            return cached[1]
+        display_text = plugin_manager.run_hook(
+            'process_string_for_display',
+            text,
+            ts_object=ts_obj,
+            column='original' if col == 2 else 'translation'
+        )
+        self._display_cache[cache_key] = (text, display_text)
+        return display_text
+
     def rowCount(self, parent=QModelIndex()):
         return len(self._data)
 
@@ -31,33 +72,20 @@ class TranslatableStringsModel(QAbstractTableModel):
         row, col = index.row(), index.column()
         if row >= len(self._data): return None
         ts_obj = self._data[row]
-        original_display_text = None
-        if role == Qt.DisplayRole:
-            if col == 2:
-                original_display_text = ts_obj.original_semantic
-            elif col == 3:
-                original_display_text = ts_obj.get_translation_for_ui()
-
-            if original_display_text is not None:
-                column_name = 'original' if col == 2 else 'translation'
-                display_text = self.app_instance.plugin_manager.run_hook(
-                    'process_string_for_display',
-                    original_display_text,
-                    ts_object=ts_obj,
-                    column=column_name
-                )
         if role == Qt.BackgroundRole:
-            return ts_obj.ui_style_cache.get('background')
+            return ts_obj.ui_style.background
 
         if role == Qt.ForegroundRole:
-            return ts_obj.ui_style_cache.get('foreground')
+            return ts_obj.ui_style.foreground
 
         if role == Qt.FontRole:
-            return ts_obj.ui_style_cache.get('font')
+            return ts_obj.ui_style.font
 
         if role == NewlineColorRole:
-            if col in [2, 3]:
-                return ts_obj.ui_style_cache.get('newline_color')
+            if col == 2:
+                return ts_obj.ui_style.original_newline_color
+            if col == 3:
+                return ts_obj.ui_style.translation_newline_color
             return None
 
         if role == Qt.DisplayRole:
@@ -74,10 +102,8 @@ class TranslatableStringsModel(QAbstractTableModel):
                     return "T"
                 else:
                     return "U"
-            elif col == 2:
-                return display_text
-            elif col == 3:
-                return display_text
+            elif col == 2 or col == 3:
+                return self.get_display_text(ts_obj, col)
             elif col == 4:
                 return ts_obj.comment
             elif col == 5:
@@ -105,6 +131,10 @@ class TranslatableStringsModel(QAbstractTableModel):
             return Qt.NoItemFlags
         return Qt.ItemIsEnabled | Qt.ItemIsSelectable
 
+    def is_showing(self, data):
+        """True if the model still shows exactly this list, i.e. no rows were added, removed or replaced."""
+        return self._data is data and len(self._id_to_index_map) == len(data)
+
     def index_from_id(self, ts_id):
         if ts_id in self._id_to_index_map:
             row = self._id_to_index_map[ts_id]
@@ -113,6 +143,8 @@ class TranslatableStringsModel(QAbstractTableModel):
 
 
 class TranslatableStringsProxyModel(QSortFilterProxyModel):
+    filter_invalidated = Signal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.show_ignored = True
@@ -123,7 +155,7 @@ class TranslatableStringsProxyModel(QSortFilterProxyModel):
         self.search_results_indices = set()
         self.is_po_mode = False
         self._current_filter_seen_originals = set()
-        self.new_entry_id = "##NEW_ENTRY##"
+        self.new_entry_id = NEW_ENTRY_ID
         self.setDynamicSortFilter(True)
 
     def set_filters(self, show_ignored, show_untranslated, show_translated, show_unreviewed, search_term, is_po_mode):
@@ -135,6 +167,7 @@ class TranslatableStringsProxyModel(QSortFilterProxyModel):
         self.show_unreviewed = show_unreviewed
         self.search_term = search_term.lower()
         self.is_po_mode = is_po_mode
+        self.sourceModel().search_index.set_query(self.search_term)
         self.invalidateFilter()
         self.sort(current_sort_column, current_sort_order)
 
@@ -144,11 +177,8 @@ class TranslatableStringsProxyModel(QSortFilterProxyModel):
             return False
         if self.is_po_mode and ts_obj.id == self.new_entry_id:
             return True
-        if self.search_term:
-            if not (self.search_term in ts_obj.original_semantic.lower() or
-                    self.search_term in ts_obj.get_translation_for_ui().lower() or
-                    self.search_term in ts_obj.comment.lower()):
-                return False
+        if self.search_term and not self.sourceModel().search_index.accepts_row(source_row):
+            return False
         has_translation = bool(ts_obj.translation.strip())
         if not self.show_ignored and ts_obj.is_ignored: return False
         if self.show_untranslated and has_translation and not ts_obj.is_ignored: return False
@@ -157,47 +187,23 @@ class TranslatableStringsProxyModel(QSortFilterProxyModel):
 
         return True
 
-    def lessThan(self, left_index, right_index):
-        source_model = self.sourceModel()
-        left_obj = source_model._data[left_index.row()]
-        right_obj = source_model._data[right_index.row()]
-
-        if not left_obj or not right_obj:
-            return False
-        if self.is_po_mode:
-            if left_obj.id == self.new_entry_id: return False
-            if right_obj.id == self.new_entry_id: return True
-        column = self.sortColumn()
-        if column == 0:
-            return left_index.row() < right_index.row()
-        elif column == 1 or column == 5:
-            def get_status_weight(ts_obj):
-                if ts_obj.is_ignored: return 5
-                if ts_obj.is_reviewed: return 4
-                if ts_obj.warnings and not ts_obj.is_warning_ignored: return 0
-                if not ts_obj.translation.strip(): return 1
-                if ts_obj.minor_warnings and not ts_obj.is_warning_ignored: return 2
-                return 3
-            left_weight = get_status_weight(left_obj)
-            right_weight = get_status_weight(right_obj)
-            if left_weight != right_weight:
-                return left_weight < right_weight
-            else:
-                return left_obj.line_num_in_file < right_obj.line_num_in_file
-        elif column == 2:
-            return left_obj.original_semantic.lower() < right_obj.original_semantic.lower()
-        elif column == 3:
-            return left_obj.get_translation_for_ui().lower() < right_obj.get_translation_for_ui().lower()
-        elif column == 4:
-            return left_obj.comment.lower() < right_obj.comment.lower()
-        elif column == 6:
-            return left_obj.line_num_in_file < right_obj.line_num_in_file
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sourceModel().sort_keys.prepare(column, self.is_po_mode)
+        super().sort(column, order)
 
-        return False
+    def lessThan(self, left_index, right_index):
+        return self.sourceModel().sort_keys.less_than(
+            self.sortColumn(), left_index.row(), right_index.row(), self.is_po_mode
+        )
 
     def invalidateFilter(self):
         self._current_filter_seen_originals.clear()
         super().invalidateFilter()
+        self.filter_invalidated.emit()
+
+    def invalidate(self):
+        super().invalidate()
+        self.filter_invalidated.emit()
 
     def id_in_filtered_data(self, ts_id):
         source_index = self.sourceModel().index_from_id(ts_id)
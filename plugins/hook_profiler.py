@@ -0,0 +1,84 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+import heapq
+import time
+import logging
+logger = logging.getLogger(__package__)
+
+# 在表格绘制路径上被调用的钩子
+PAINT_HOOKS = ('on_table_cell_paint', 'process_string_for_display')
+SLOW_PAINT_THRESHOLD = 0.002  # 单次调用超过 2ms 即视为拖慢绘制
+MAX_SLOWEST_CALLS = 5
+
+
+class HookStats:
+    __slots__ = ('calls', 'total_time', 'max_time', 'slowest_calls', 'slow_paint_calls')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        # (耗时, 时间戳) 小顶堆，只保留最慢的几次调用
+        self.slowest_calls = []
+        self.slow_paint_calls = 0
+
+    @property
+    def average_time(self):
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class HookProfiler:
+    """
+    Records call counts, cumulative time and the slowest invocations for every
+    (plugin, hook) pair dispatched by the PluginManager.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._warned_paint_plugins = set()
+
+    def record(self, plugin_id, hook_name, elapsed):
+        key = (plugin_id, hook_name)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = HookStats()
+        stats.calls += 1
+        stats.total_time += elapsed
+        if elapsed > stats.max_time:
+            stats.max_time = elapsed
+        slowest_calls = stats.slowest_calls
+        if len(slowest_calls) < MAX_SLOWEST_CALLS:
+            heapq.heappush(slowest_calls, (elapsed, time.time()))
+        elif elapsed > slowest_calls[0][0]:
+            heapq.heapreplace(slowest_calls, (elapsed, time.time()))
+
+        if hook_name in PAINT_HOOKS and elapsed > SLOW_PAINT_THRESHOLD:
+            stats.slow_paint_calls += 1
+            if key not in self._warned_paint_plugins:
+                self._warned_paint_plugins.add(key)
+                logger.warning(
+                    f"Plugin '{plugin_id}' took {elapsed * 1000:.1f} ms in paint hook '{hook_name}'. "
+                    f"This slows down table rendering."
+                )
+
+    def get_plugin_stats(self, plugin_id):
+        """Returns [(hook_name, HookStats), ...] for a plugin, most expensive first."""
+        result = [(hook_name, stats) for (pid, hook_name), stats in self._stats.items() if pid == plugin_id]
+        result.sort(key=lambda item: item[1].total_time, reverse=True)
+        return result
+
+    def get_slow_paint_hooks(self, plugin_id):
+        return [
+            (hook_name, stats) for hook_name, stats in self.get_plugin_stats(plugin_id)
+            if hook_name in PAINT_HOOKS and stats.slow_paint_calls
+        ]
+
+    def reset(self, plugin_id=None):
+        if plugin_id is None:
+            self._stats.clear()
+            self._warned_paint_plugins.clear()
+            return
+        for key in [key for key in self._stats if key[0] == plugin_id]:
+            del self._stats[key]
+            self._warned_paint_plugins.discard(key)
@@ -407,9 +407,16 @@ class PluginBase(ABC):
 
     def register_validation_rules(self) -> list:
         """
-        (Collecting Hook) Called by the ValidationService to gather custom validation rules.
-        :return: A list of callable functions. Each function should accept a
-                 TranslatableString object and return a ValidationWarning object or None.
+        (Collecting Hook) Called by the ValidationEngine to gather custom validation rules.
+        :return: A list of rules. Each entry is either a callable that accepts a
+                 TranslatableString object and returns None, a (WarningType, message) tuple
+                 or a list of such tuples, or a services.validation_rules.ValidationRule
+                 instance, which can also declare its config keys, features and cost.
+                 Plain callables are treated as cheap rules and run inline on every edit.
+                 In background validation passes, rules run on the UI thread against the
+                 live string once the worker's results arrive, unless a ValidationRule is
+                 created with background_safe=True, in which case it runs on the worker
+                 and must only read the ValidationSnapshot fields.
         """
         return []
 
@@ -7,6 +7,7 @@ from PySide6.QtGui import QColor, QFont, QIcon, QPixmap, QPainter, QDesktopServi
 from utils.localization import _
 from services.dependency_service import DependencyManager
 from plugins.plugin_base import PluginBase
+from plugins.hook_profiler import SLOW_PAINT_THRESHOLD
 import os
 import shutil
 
@@ -142,6 +143,10 @@ class PluginManagerDialog(QDialog):
         self.description_browser = QTextBrowser()
         self.description_browser.setOpenExternalLinks(True)
 
+        self.performance_label = QLabel()
+        self.performance_label.setWordWrap(True)
+        self.performance_label.setTextFormat(Qt.RichText)
+
         self.actions_layout = QHBoxLayout()
         self.actions_layout.setContentsMargins(0, 10, 0, 0)
 
@@ -168,6 +173,7 @@ class PluginManagerDialog(QDialog):
         details_layout.addWidget(self.plugin_deps_label)
         details_layout.addWidget(self.external_deps_label)
         details_layout.addWidget(self.description_browser)
+        details_layout.addWidget(self.performance_label)
         details_layout.addLayout(self.actions_layout)
         details_layout.addWidget(self.settings_button)
         splitter.addWidget(details_widget)
@@ -364,6 +370,7 @@ class PluginManagerDialog(QDialog):
         self.external_deps_label.hide()
         self.settings_button.hide()
         self.compat_label.hide()
+        self.performance_label.hide()
         self.open_dir_button.hide()
         self.delete_button.hide()
 
@@ -460,11 +467,46 @@ class PluginManagerDialog(QDialog):
             html += ", ".join(links)
             self.external_deps_label.setText(html)
             self.external_deps_label.show()
+        self.update_performance_info(plugin_id)
         method_on_instance_class = plugin.__class__.show_settings_dialog
         method_on_base_class = PluginBase.show_settings_dialog
         has_settings = method_on_instance_class is not method_on_base_class
         self.settings_button.setVisible(has_settings)
 
+    def update_performance_info(self, plugin_id):
+        profiler = self.manager.hook_profiler
+        hook_stats = profiler.get_plugin_stats(plugin_id)
+        if not hook_stats:
+            return
+
+        html = f"<b>{_('Hook Performance')}:</b>"
+        slow_paint_hooks = profiler.get_slow_paint_hooks(plugin_id)
+        if slow_paint_hooks:
+            hook_names = ", ".join(hook_name for hook_name, _stats in slow_paint_hooks)
+            html += (
+                f"<br><b style='color:#E67E22;'>{_('Slows down table painting')}</b> "
+                f"<small>({_('Calls slower than {ms:.0f} ms in: {hooks}').format(ms=SLOW_PAINT_THRESHOLD * 1000, hooks=hook_names)})</small>"
+            )
+        html += (
+            "<table cellspacing='0' cellpadding='2'>"
+            f"<tr><th align='left'>{_('Hook')}</th><th align='right'>{_('Calls')}</th>"
+            f"<th align='right'>{_('Total (ms)')}</th><th align='right'>{_('Avg (ms)')}</th>"
+            f"<th align='right'>{_('Slowest (ms)')}</th></tr>"
+        )
+        for hook_name, stats in hook_stats:
+            slowest = ", ".join(
+                f"{elapsed * 1000:.1f}" for elapsed, _timestamp in sorted(stats.slowest_calls, reverse=True)
+            )
+            html += (
+                f"<tr><td>{hook_name}</td><td align='right'>{stats.calls}</td>"
+                f"<td align='right'>{stats.total_time * 1000:.1f}</td>"
+                f"<td align='right'>{stats.average_time * 1000:.2f}</td>"
+                f"<td align='right'>{slowest}</td></tr>"
+            )
+        html += "</table>"
+        self.performance_label.setText(html)
+        self.performance_label.show()
+
     def show_list_context_menu(self, pos):
         item = self.plugin_list.itemAt(pos)
         if not item:
@@ -11,14 +11,23 @@ from plugins.plugin_dialog import PluginManagerDialog
 from dialogs.marketplace_dialog import PluginMarketplaceDialog
 from utils.constants import APP_VERSION
 from utils.plugin_context import plugin_libs_context
+from plugins.hook_profiler import HookProfiler
 from utils.localization import _
 from services.dependency_service import DependencyManager
 import shutil
 import zipfile
 import tempfile
+import time
 import logging
 logger = logging.getLogger(__package__)
 
+# 拦截型钩子：任一插件返回 True 即停止
+INTERCEPTING_HOOKS = ('on_file_dropped', 'on_files_dropped')
+# 收集型钩子的结果形态
+FLATTENED_LIST_HOOKS = ('on_file_tree_context_menu', 'on_table_context_menu', 'register_validation_rules')
+LIST_RESULT_HOOKS = ('add_statusbar_widgets', 'register_settings_pages', 'register_ai_placeholders')
+MERGED_DICT_HOOKS = ('register_importers', 'register_exporters', 'get_ai_translation_context')
+
 
 class PluginManager:
     def __init__(self, main_window):
@@ -33,6 +42,9 @@ class PluginManager:
 
         self._enabled_plugins_cache = None
         self._cache_valid = False
+        self._hook_dispatch_table = {}
+        self.hooks_version = 0
+        self.hook_profiler = HookProfiler()
 
         self.load_plugins()
 
@@ -58,7 +70,7 @@ class PluginManager:
         self.invalid_plugins = {}
         self.incompatible_plugins = {}
         self.missing_deps_plugins = {}
-        self._cache_valid = False
+        self.invalidate_cache()
         if not os.path.isdir(self.plugin_dir):
             logger.warning(f"Plugin directory not found: {self.plugin_dir}")
             return
@@ -236,6 +248,45 @@ class PluginManager:
 
     def invalidate_cache(self):
         self._cache_valid = False
+        self._hook_dispatch_table = {}
+        self.hooks_version += 1
+
+    def _get_hook_handlers(self, hook_name):
+        handlers = self._hook_dispatch_table.get(hook_name)
+        if handlers is None:
+            # PluginBase 为所有钩子提供了空的默认实现，只有子类覆盖时才需要调用
+            base_method = getattr(PluginBase, hook_name, None)
+            handlers = []
+            for plugin in self.get_enabled_plugins():
+                if base_method is not None and getattr(type(plugin), hook_name, base_method) is base_method:
+                    continue
+                method = getattr(plugin, hook_name, None)
+                if callable(method):
+                    handlers.append((plugin.plugin_id(), method))
+            self._hook_dispatch_table[hook_name] = handlers
+        return handlers
+
+    def is_hook_implemented(self, hook_name):
+        return bool(self._get_hook_handlers(hook_name))
+
+    def _call_hook_method(self, plugin_id, hook_name, method, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self.hook_profiler.record(plugin_id, hook_name, time.perf_counter() - start)
+
+    @staticmethod
+    def _empty_hook_result(hook_name, args):
+        if hook_name in INTERCEPTING_HOOKS:
+            return False
+        if hook_name.startswith('process_'):
+            return args[0]
+        if hook_name in FLATTENED_LIST_HOOKS or hook_name in LIST_RESULT_HOOKS:
+            return []
+        if hook_name in MERGED_DICT_HOOKS:
+            return {}
+        return None
 
     def get_enabled_plugins(self):
         if not self._cache_valid or self._enabled_plugins_cache is None:
@@ -266,22 +317,24 @@ class PluginManager:
         - Intercepting hooks (e.g., on_file_dropped) stop and return True if any plugin handles it.
         - Collecting hooks (e.g., on_file_tree_context_menu) gather results from all plugins.
         - Notification hooks (other on_*) are called without returning a value.
+        Only plugins that override the hook are called; every call is recorded by hook_profiler.
         """
+        handlers = self._get_hook_handlers(hook_name)
+        if not handlers:
+            return self._empty_hook_result(hook_name, args)
+
         with plugin_libs_context():
             # 1. 拦截型钩子 (Intercepting Hooks)
-            INTERCEPTING_HOOKS = ['on_file_dropped', 'on_files_dropped']
             if hook_name in INTERCEPTING_HOOKS:
-                for plugin in self.get_enabled_plugins():
-                    if hasattr(plugin, hook_name):
-                        try:
-                            method = getattr(plugin, hook_name)
-                            if method(*args, **kwargs) is True:
-                                logger.info(f"Hook '{hook_name}' was handled by plugin '{plugin.plugin_id()}'.")
-                                return True
-                        except Exception as e:
-                            logger.error(
-                                f"Error in plugin '{plugin.plugin_id()}' intercepting hook '{hook_name}': {e}",
-                                exc_info=True)
+                for plugin_id, method in handlers:
+                    try:
+                        if self._call_hook_method(plugin_id, hook_name, method, *args, **kwargs) is True:
+                            logger.info(f"Hook '{hook_name}' was handled by plugin '{plugin_id}'.")
+                            return True
+                    except Exception as e:
+                        logger.error(
+                            f"Error in plugin '{plugin_id}' intercepting hook '{hook_name}': {e}",
+                            exc_info=True)
                 return False  # 循环结束，没有任何插件处理
 
             # 2. 处理型钩子 (Processing Hooks)
@@ -289,97 +342,82 @@ class PluginManager:
                 processed_data = args[0]
                 original_type = type(processed_data)
                 other_args = args[1:]
-                for plugin in self.get_enabled_plugins():
-                    if hasattr(plugin, hook_name):
-                        try:
-                            method = getattr(plugin, hook_name)
-                            result = method(processed_data, *other_args, **kwargs)
-                            if isinstance(result, original_type):
-                                processed_data = result
-                            else:
-                                logger.warning(
-                                    f"Plugin '{plugin.plugin_id()}' hook '{hook_name}' returned wrong type "
-                                    f"(expected {original_type.__name__}, got {type(result).__name__}). "
-                                    f"Ignoring result."
-                                )
-                        except Exception as e:
-                            logger.error(f"Error in plugin '{plugin.plugin_id()}' processing hook '{hook_name}': {e}",
-                                              exc_info=True)
+                for plugin_id, method in handlers:
+                    try:
+                        result = self._call_hook_method(plugin_id, hook_name, method,
+                                                        processed_data, *other_args, **kwargs)
+                        if isinstance(result, original_type):
+                            processed_data = result
+                        else:
+                            logger.warning(
+                                f"Plugin '{plugin_id}' hook '{hook_name}' returned wrong type "
+                                f"(expected {original_type.__name__}, got {type(result).__name__}). "
+                                f"Ignoring result."
+                            )
+                    except Exception as e:
+                        logger.error(f"Error in plugin '{plugin_id}' processing hook '{hook_name}': {e}",
+                                          exc_info=True)
                 return processed_data
 
             # TM
             if hook_name == 'query_tm_suggestions':
-                for plugin in self.get_enabled_plugins():
-                    if hasattr(plugin, hook_name):
-                        try:
-                            method = getattr(plugin, hook_name)
-                            result = method(*args, **kwargs)
-                            if result is not None:
-                                logger.debug(f"TM query handled by plugin '{plugin.plugin_id()}'.")
-                                return result
-                        except Exception as e:
-                            logger.error(f"Error in plugin '{plugin.plugin_id()}' TM query hook: {e}", exc_info=True)
+                for plugin_id, method in handlers:
+                    try:
+                        result = self._call_hook_method(plugin_id, hook_name, method, *args, **kwargs)
+                        if result is not None:
+                            logger.debug(f"TM query handled by plugin '{plugin_id}'.")
+                            return result
+                    except Exception as e:
+                        logger.error(f"Error in plugin '{plugin_id}' TM query hook: {e}", exc_info=True)
                 return None
 
-
-
             # 3. 收集型和通知型钩子 (Collecting & Notification Hooks)
             else:
                 all_results = []
-                for plugin in self.get_enabled_plugins():
-                    if hasattr(plugin, hook_name):
-                        try:
-                            method = getattr(plugin, hook_name)
-                            result = method(*args, **kwargs)
-                            if hook_name == 'register_ai_placeholders' and isinstance(result, list):
-                                for item in result:
-                                    item['provider'] = plugin.name()
-                                all_results.extend(result)
-                            elif result is not None:
-                                all_results.append(result)
-                        except Exception as e:
-                            logger.error(
-                                f"Error in plugin '{plugin.plugin_id()}' notification/collecting hook '{hook_name}': {e}",
-                                exc_info=True)
-                if hook_name in ['on_file_tree_context_menu', 'on_table_context_menu']:
+                for plugin_id, method in handlers:
+                    try:
+                        result = self._call_hook_method(plugin_id, hook_name, method, *args, **kwargs)
+                        if hook_name == 'register_ai_placeholders' and isinstance(result, list):
+                            provider_name = self.get_plugin(plugin_id).name()
+                            for item in result:
+                                item['provider'] = provider_name
+                            all_results.extend(result)
+                        elif result is not None:
+                            all_results.append(result)
+                    except Exception as e:
+                        logger.error(
+                            f"Error in plugin '{plugin_id}' notification/collecting hook '{hook_name}': {e}",
+                            exc_info=True)
+                if hook_name in FLATTENED_LIST_HOOKS:
                     flat_list = [item for sublist in all_results for item in sublist]
                     return flat_list
-                if hook_name in ['add_statusbar_widgets', 'register_settings_pages', 'register_ai_placeholders']:
+                if hook_name in LIST_RESULT_HOOKS:
                     return all_results
-                if hook_name in ['register_importers', 'register_exporters']:
+                if hook_name in MERGED_DICT_HOOKS:
                     merged_dict = {}
                     for res_dict in all_results:
                         if isinstance(res_dict, dict):
                             merged_dict.update(res_dict)
                     return merged_dict
-                if hook_name == 'get_ai_translation_context':
-                    merged_context = {}
-                    for res_dict in all_results:
-                        if isinstance(res_dict, dict):
-                            merged_context.update(res_dict)
-                    return merged_context
                 return None
 
     def _run_processing_hook(self, hook_name, *args, **kwargs):
         processed_data = args[0]
         other_args = args[1:]
-        for plugin in self.get_enabled_plugins():
-            if hasattr(plugin, hook_name):
-                try:
-                    method = getattr(plugin, hook_name)
-                    processed_data = method(processed_data, *other_args, **kwargs)
-                except Exception as e:
-                    logger.error(f"Error in plugin '{plugin.plugin_id()}' hook '{hook_name}': {e}", exc_info=True)
+        for plugin_id, method in self._get_hook_handlers(hook_name):
+            try:
+                processed_data = self._call_hook_method(plugin_id, hook_name, method,
+                                                        processed_data, *other_args, **kwargs)
+            except Exception as e:
+                logger.error(f"Error in plugin '{plugin_id}' hook '{hook_name}': {e}", exc_info=True)
         return processed_data
 
     def _run_notification_hook(self, hook_name, *args, **kwargs):
-        for plugin in self.get_enabled_plugins():
-            if hasattr(plugin, hook_name):
-                try:
-                    method = getattr(plugin, hook_name)
-                    method(*args, **kwargs)
-                except Exception as e:
-                    logger.error(f"Error in plugin '{plugin.plugin_id()}' hook '{hook_name}': {e}", exc_info=True)
+        for plugin_id, method in self._get_hook_handlers(hook_name):
+            try:
+                self._call_hook_method(plugin_id, hook_name, method, *args, **kwargs)
+            except Exception as e:
+                logger.error(f"Error in plugin '{plugin_id}' hook '{hook_name}': {e}", exc_info=True)
 
     def on_main_app_language_changed(self):
         logger.info(f"Main app language changed. Reloading all plugins to apply new language...")
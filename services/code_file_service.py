@@ -5,7 +5,10 @@ import re
 import os
 import shutil
 import datetime
+import heapq
+from bisect import bisect_left
 from models.translatable_string import TranslatableString
+from models.source_index import SourceIndex
 from utils.localization import _
 import logging
 logger = logging.getLogger(__name__)
@@ -41,7 +44,7 @@ def unescape_overwatch_string(s):
 
 def extract_translatable_strings(code_content, extraction_patterns):
     strings = []
-    full_code_lines = code_content.splitlines()
+    full_code_lines = SourceIndex(code_content)
 
     regex_all_digits = re.compile(r'^\d+$')
     regex_ow_placeholder = re.compile(r'^\{\d+\}$')
@@ -55,6 +58,88 @@ def extract_translatable_strings(code_content, extraction_patterns):
         "X", "Y", "Z", "A", "B", "C", "N/A"
     }
 
+    compiled_patterns = _compile_extraction_patterns(extraction_patterns)
+    if not compiled_patterns:
+        return strings
+
+    newline_offsets = build_newline_offsets(code_content)
+
+    # 所有模式的匹配按位置合并为一次扫描，结果天然有序
+    for match, string_type_from_pattern in _scan_patterns(compiled_patterns, code_content):
+        raw_content = match.group(2)
+
+        semantic_content = unescape_overwatch_string(raw_content)
+
+        content_start_pos = match.start(2)
+        content_end_pos = match.end(2)
+
+        line_num = bisect_left(newline_offsets, content_start_pos) + 1
+
+        ts = TranslatableString(
+            original_raw=raw_content,
+            original_semantic=semantic_content,
+            line_num=line_num,
+            char_pos_start_in_file=content_start_pos,
+            char_pos_end_in_file=content_end_pos,
+            full_code_lines=full_code_lines,
+            string_type=string_type_from_pattern
+        )
+
+        if string_type_from_pattern and string_type_from_pattern not in ["Custom String", "Custom", ""]:
+            ts.comment = string_type_from_pattern
+
+        s_semantic_stripped = semantic_content.strip()
+        s_len_stripped = len(s_semantic_stripped)
+
+        if not s_semantic_stripped:
+            ts.was_auto_ignored = True
+            ts.is_ignored = True
+        elif regex_all_digits.fullmatch(s_semantic_stripped):
+            ts.was_auto_ignored = True
+            ts.is_ignored = True
+        elif regex_ow_placeholder.fullmatch(s_semantic_stripped):
+            ts.was_auto_ignored = True
+            ts.is_ignored = True
+        elif s_len_stripped == 1 and 'a' <= s_semantic_stripped.lower() <= 'z' and s_semantic_stripped.isascii():
+            ts.was_auto_ignored = True
+            ts.is_ignored = True
+        elif regex_only_symbols_and_whitespace.fullmatch(semantic_content):
+            ts.was_auto_ignored = True
+            ts.is_ignored = True
+        elif s_len_stripped >= 2 and regex_repeating_char.fullmatch(s_semantic_stripped):
+            ts.was_auto_ignored = True
+            ts.is_ignored = True
+        elif s_semantic_stripped.upper() in known_untranslatable_short_words:
+            ts.was_auto_ignored = True
+            ts.is_ignored = True
+        elif s_len_stripped > 2 and regex_progress_bar_like.fullmatch(s_semantic_stripped):
+            ts.was_auto_ignored = True
+            ts.is_ignored = True
+        else:
+            if regex_placeholder_like.search(s_semantic_stripped):
+                content_no_placeholders = regex_placeholder_like.sub('', s_semantic_stripped)
+                content_text_only = re.sub(f"[{re.escape(allowed_symbols_and_whitespace_chars)}]", '',
+                                           content_no_placeholders).strip()
+                if len(content_text_only) < 2:
+                    ts.was_auto_ignored = True
+                    ts.is_ignored = True
+
+        strings.append(ts)
+
+    return strings
+
+
+def build_newline_offsets(text):
+    offsets = []
+    pos = text.find('\n')
+    while pos != -1:
+        offsets.append(pos)
+        pos = text.find('\n', pos + 1)
+    return offsets
+
+
+def _compile_extraction_patterns(extraction_patterns):
+    compiled_patterns = []
     for pattern_config in extraction_patterns:
         if not pattern_config.get("enabled", True):
             continue
@@ -73,70 +158,24 @@ def extract_translatable_strings(code_content, extraction_patterns):
         except re.error as e:
             logger.warning(f"Warning: Invalid regex for pattern '{pattern_name}': {e}. Skipping.")
             continue
+        compiled_patterns.append((compiled_pattern, string_type_from_pattern))
+    return compiled_patterns
 
-        for match in compiled_pattern.finditer(code_content):
-            raw_content = match.group(2)
-
-            semantic_content = unescape_overwatch_string(raw_content)
-
-            content_start_pos = match.start(2)
-            content_end_pos = match.end(2)
-
-            line_num = code_content.count('\n', 0, content_start_pos) + 1
-
-            ts = TranslatableString(
-                original_raw=raw_content,
-                original_semantic=semantic_content,
-                line_num=line_num,
-                char_pos_start_in_file=content_start_pos,
-                char_pos_end_in_file=content_end_pos,
-                full_code_lines=full_code_lines,
-                string_type=string_type_from_pattern
-            )
-
-            if string_type_from_pattern and string_type_from_pattern not in ["Custom String", "Custom", ""]:
-                ts.comment = string_type_from_pattern
-
-            s_semantic_stripped = semantic_content.strip()
-            s_len_stripped = len(s_semantic_stripped)
-
-            if not s_semantic_stripped:
-                ts.was_auto_ignored = True
-                ts.is_ignored = True
-            elif regex_all_digits.fullmatch(s_semantic_stripped):
-                ts.was_auto_ignored = True
-                ts.is_ignored = True
-            elif regex_ow_placeholder.fullmatch(s_semantic_stripped):
-                ts.was_auto_ignored = True
-                ts.is_ignored = True
-            elif s_len_stripped == 1 and 'a' <= s_semantic_stripped.lower() <= 'z' and s_semantic_stripped.isascii():
-                ts.was_auto_ignored = True
-                ts.is_ignored = True
-            elif regex_only_symbols_and_whitespace.fullmatch(semantic_content):
-                ts.was_auto_ignored = True
-                ts.is_ignored = True
-            elif s_len_stripped >= 2 and regex_repeating_char.fullmatch(s_semantic_stripped):
-                ts.was_auto_ignored = True
-                ts.is_ignored = True
-            elif s_semantic_stripped.upper() in known_untranslatable_short_words:
-                ts.was_auto_ignored = True
-                ts.is_ignored = True
-            elif s_len_stripped > 2 and regex_progress_bar_like.fullmatch(s_semantic_stripped):
-                ts.was_auto_ignored = True
-                ts.is_ignored = True
-            else:
-                if regex_placeholder_like.search(s_semantic_stripped):
-                    content_no_placeholders = regex_placeholder_like.sub('', s_semantic_stripped)
-                    content_text_only = re.sub(f"[{re.escape(allowed_symbols_and_whitespace_chars)}]", '',
-                                               content_no_placeholders).strip()
-                    if len(content_text_only) < 2:
-                        ts.was_auto_ignored = True
-                        ts.is_ignored = True
 
-            strings.append(ts)
+def _scan_patterns(compiled_patterns, code_content):
+    # 每个模式仍按各自的语义独立匹配（允许不同模式的匹配相互重叠），
+    # 仅将各模式的匹配流按内容起始位置归并。heapq.merge 是稳定的，
+    # 起始位置相同时保持模式的配置顺序，与逐模式扫描后再排序的结果一致。
+    streams = [_iter_pattern_matches(compiled_pattern, string_type, code_content)
+               for compiled_pattern, string_type in compiled_patterns]
+    if len(streams) == 1:
+        return streams[0]
+    return heapq.merge(*streams, key=lambda item: item[0].start(2))
 
-    strings.sort(key=lambda s: s.char_pos_start_in_file)
-    return strings
+
+def _iter_pattern_matches(compiled_pattern, string_type, code_content):
+    for match in compiled_pattern.finditer(code_content):
+        yield match, string_type
 
 
 def save_translated_code(filepath_to_save, original_raw_code_content, translatable_objects, app_instance):
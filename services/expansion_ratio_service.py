@@ -3,10 +3,19 @@
 
 import os
 import json
-from utils.path_utils import get_resource_path
+import hashlib
+from utils.path_utils import get_resource_path, get_app_data_path
 import logging
 logger = logging.getLogger(__name__)
 
+DATA_FILE_NAME = 'Helsinki-NLP_opus-100.json'
+MATRIX_CACHE_FILE_NAME = 'Helsinki-NLP_opus-100.matrix.json'
+MATRIX_CACHE_FORMAT_VERSION = 1
+
+
+def _normalize_lang(lang):
+    return 'zh' if lang == 'zh_TW' else lang
+
 
 class ExpansionRatioService:
     _instance = None
@@ -24,10 +33,14 @@ class ExpansionRatioService:
 
     def __init__(self):
         self.ratios = {}
+        # 稠密比例矩阵：languages[i] -> i，matrix[i * n + j] 为 i->j 的预期比例（含反向和经英语中转的结果）
+        self.languages = []
+        self._lang_index = {}
+        self._matrix = []
         self._load_data()
 
     def _load_data(self):
-        data_file_path = get_resource_path(os.path.join('expansion_data', 'Helsinki-NLP_opus-100.json'))
+        data_file_path = get_resource_path(os.path.join('expansion_data', DATA_FILE_NAME))
         if not os.path.exists(data_file_path):
             logger.warning(
                 f"Warning: Expansion ratio data file not found at '{data_file_path}'. Service will use default values.")
@@ -39,14 +52,107 @@ class ExpansionRatioService:
             logger.info(f"Expansion ratio service loaded {len(self.ratios)} ratio entries.")
         except Exception as e:
             logger.info(f"Error loading expansion ratio data: {e}")
+            return
+        self._load_or_build_matrix(data_file_path)
+
+    def _get_cache_paths(self, data_file_path):
+        # 优先使用应用数据目录：单文件打包时资源目录是每次启动解压的临时目录，
+        # 虽然可写，但缓存会在退出时丢失；应用数据目录不可写时才退回到数据文件旁边
+        return [
+            os.path.join(get_app_data_path(), 'expansion_data', MATRIX_CACHE_FILE_NAME),
+            os.path.join(os.path.dirname(data_file_path), MATRIX_CACHE_FILE_NAME),
+        ]
+
+    @staticmethod
+    def _get_source_signature(data_file_path):
+        # 按内容而不是修改时间判断：每次解压出的数据文件修改时间可能不同
+        with open(data_file_path, 'rb') as f:
+            content = f.read()
+        return {'size': len(content), 'sha256': hashlib.sha256(content).hexdigest()}
+
+    def _load_or_build_matrix(self, data_file_path):
+        signature = self._get_source_signature(data_file_path)
+        cache_paths = self._get_cache_paths(data_file_path)
+        for cache_path in cache_paths:
+            if self._load_matrix_cache(cache_path, signature):
+                logger.debug(f"Expansion ratio matrix loaded from cache '{cache_path}'.")
+                return
+        self._build_matrix()
+        for cache_path in cache_paths:
+            if self._save_matrix_cache(cache_path, signature):
+                break
+
+    def _load_matrix_cache(self, cache_path, signature):
+        if not os.path.exists(cache_path):
+            return False
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('format_version') != MATRIX_CACHE_FORMAT_VERSION or cache.get('source') != signature:
+                return False
+            languages = cache['languages']
+            matrix = cache['matrix']
+            if len(matrix) != len(languages) * len(languages):
+                return False
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable expansion ratio matrix cache '{cache_path}': {e}")
+            return False
+        self._set_matrix(languages, matrix)
+        return True
+
+    def _save_matrix_cache(self, cache_path, signature):
+        cache = {
+            'format_version': MATRIX_CACHE_FORMAT_VERSION,
+            'source': signature,
+            'languages': self.languages,
+            'matrix': self._matrix,
+        }
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            temp_path = cache_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, separators=(',', ':'))
+            os.replace(temp_path, cache_path)
+            return True
+        except OSError as e:
+            logger.debug(f"Could not write expansion ratio matrix cache '{cache_path}': {e}")
+            return False
+
+    def _build_matrix(self):
+        languages = set()
+        for lang_pair in self.ratios:
+            languages.update(lang_pair.split('-', 1))
+        languages = sorted(languages)
+        matrix = [
+            self._compute_expected_ratio(source_lang, target_lang)
+            for source_lang in languages
+            for target_lang in languages
+        ]
+        self._set_matrix(languages, matrix)
+        logger.info(f"Expansion ratio matrix built for {len(languages)} languages.")
+
+    def _set_matrix(self, languages, matrix):
+        self.languages = languages
+        self._lang_index = {lang: i for i, lang in enumerate(languages)}
+        self._matrix = matrix
 
     def get_expected_ratio(self, source_lang, target_lang, original_text=None, placeholder_density=None, visited=None):
         if not self.ratios:
             return 1.0
+        query_source_lang = _normalize_lang(source_lang)
+        query_target_lang = _normalize_lang(target_lang)
+        source_index = self._lang_index.get(query_source_lang)
+        target_index = self._lang_index.get(query_target_lang)
+        if source_index is None or target_index is None:
+            # 数据中没有的语言只可能与自身比较
+            return 1.0 if query_source_lang == query_target_lang else None
+        return self._matrix[source_index * len(self.languages) + target_index]
+
+    def _compute_expected_ratio(self, source_lang, target_lang, visited=None):
         if visited is None:
             visited = set()
-        query_source_lang = 'zh' if source_lang == 'zh_TW' else source_lang
-        query_target_lang = 'zh' if target_lang == 'zh_TW' else target_lang
+        query_source_lang = _normalize_lang(source_lang)
+        query_target_lang = _normalize_lang(target_lang)
         if query_source_lang == query_target_lang:
             return 1.0
         lang_pair = f"{query_source_lang}-{query_target_lang}"
@@ -60,9 +166,9 @@ class ExpansionRatioService:
             reverse_ratio = self.ratios[reverse_lang_pair]
             return 1.0 / reverse_ratio if reverse_ratio != 0 else 1.0
         if query_source_lang != 'en' and query_target_lang != 'en':
-            ratio_source_to_en = self.get_expected_ratio(query_source_lang, 'en', visited=visited)
-            ratio_en_to_target = self.get_expected_ratio('en', query_target_lang, visited=visited)
+            ratio_source_to_en = self._compute_expected_ratio(query_source_lang, 'en', visited=visited)
+            ratio_en_to_target = self._compute_expected_ratio('en', query_target_lang, visited=visited)
 
             if ratio_source_to_en is not None and ratio_en_to_target is not None:
                 return ratio_source_to_en * ratio_en_to_target
-        return None
\ No newline at end of file
+        return None
@@ -7,22 +7,61 @@ import os
 import json
 import hashlib
 import logging
+import threading
 from datetime import datetime
 from xml.etree import ElementTree as ET
 from typing import List, Dict, Tuple, Optional
 from utils.tbx_parser import TBXParser
+from services.sqlite_connection_pool import SQLiteConnectionPool
+from utils.glossary_matcher import GlossaryMatcher
 from utils.localization import _
 
 logger = logging.getLogger(__name__)
 
 MANIFEST_FILE = "manifest.json"
 DB_FILE = "glossary.db"
+# 单条 IN 查询允许绑定的词数上限（SQLite 旧版本的变量上限为 999），更多的词改用临时表连接
+TERMS_QUERY_CHUNK_SIZE = 900
+MAX_TERM_MAP_SIZE = 200000
+
+
+class GlossaryTermCache(dict):
+    """
+    Term key -> term entry for a batch of texts, plus the keys found in each
+    text. Used as the term_cache of validation passes.
+    """
+
+    def __init__(self, matcher, keys_by_text, entries):
+        super().__init__(entries)
+        self.matcher = matcher
+        self._keys_by_text = keys_by_text
+
+    def terms_in(self, text):
+        keys = self._keys_by_text.get(text)
+        if keys is None:
+            keys = _ordered_keys(self.matcher.find(text)) if self.matcher is not None else []
+        return [key for key in keys if key in self]
+
+
+def _ordered_keys(matches):
+    return list(dict.fromkeys(term_key for __, __, term_key in sorted(matches)))
 
 
 class GlossaryService:
     def __init__(self):
         self.project_db_path: Optional[str] = None
         self.global_db_path: Optional[str] = None
+        self._connection_pool = SQLiteConnectionPool()
+        # 术语数据每次变化时递增，供校验结果缓存判断是否失效
+        self.data_version = 0
+        # 小写词 -> 术语条目（无匹配时为 None），校验、AI 提示词和术语面板共用
+        self._term_map = {}
+        self._term_map_version = self.data_version
+        self._term_map_lock = threading.Lock()
+        # db_path -> {source_term_lower: (source_term, case_sensitive)}，用于构建匹配自动机
+        self._matcher_terms = {}
+        self._matcher = None
+        self._matcher_lock = threading.Lock()
 
     def connect_databases(self, global_glossary_path: str, project_glossary_path: Optional[str] = None):
         self.disconnect_databases()
@@ -39,13 +78,17 @@ class GlossaryService:
                 self._create_schema(conn)
 
     def disconnect_databases(self):
+        self._connection_pool.close_all()
+        with self._matcher_lock:
+            self._matcher_terms = {}
+            self._matcher = None
         self.project_db_path = None
         self.global_db_path = None
+        self.data_version += 1
 
     def _get_db_connection(self, db_path: str) -> sqlite3.Connection:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        # 连接由连接池持有，调用方不要关闭；"with conn:" 只负责提交或回滚
+        return self._connection_pool.get_connection(db_path)
 
 
     def _create_schema(self, conn: sqlite3.Connection):
@@ -70,6 +113,18 @@ class GlossaryService:
             );
         """)
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_source_term_lower ON terms (source_term_lower);")
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_translations_term_target'")
+        if cursor.fetchone() is None:
+            # 旧数据库中可能已有重复译文，建立唯一索引前先去重（保留最早的一条）
+            cursor.execute("""
+                DELETE FROM translations WHERE id NOT IN (
+                    SELECT MIN(id) FROM translations GROUP BY term_id, target_term
+                )
+            """)
+            if cursor.rowcount:
+                logger.info(f"Removed {cursor.rowcount} duplicate glossary translation(s).")
+            cursor.execute(
+                "CREATE UNIQUE INDEX idx_translations_term_target ON translations (term_id, target_term);")
         conn.commit()
 
     def get_term(self, source_text: str, case_sensitive: bool = False) -> Optional[List[Dict]]:
@@ -113,101 +168,98 @@ class GlossaryService:
                 return True, _("This file has already been imported and has not changed.")
 
         try:
-            if progress_callback: progress_callback(_("Parsing TBX file..."))
-            terms_to_import = self._parse_tbx(tbx_filepath)
-            term_count = len(terms_to_import)
             if progress_callback: progress_callback(_("Connecting to database..."))
+            # 边解析边写入：解析器按批产出术语，整个导入在同一个事务中完成
+            term_batches = TBXParser().iter_term_batches(tbx_filepath)
             with self._get_db_connection(db_path) as conn:
-                self._merge_terms_into_db(conn, terms_to_import, filename, progress_callback)
+                term_count = self._merge_terms_into_db(conn, term_batches, filename, progress_callback)
+                self._update_matcher_terms(db_path, added=self._load_matcher_terms(conn, filename))
             file_stats['import_date'] = datetime.now().isoformat() + "Z"
             file_stats['term_count'] = term_count
             manifest.setdefault("imported_sources", {})[filename] = file_stats
             self._write_manifest(manifest_path, manifest)
-            return True, _("Successfully imported {count} terms.").format(count=len(terms_to_import))
+            return True, _("Successfully imported {count} terms.").format(count=term_count)
         except Exception as e:
             logger.error(f"Failed to import TBX file '{tbx_filepath}': {e}", exc_info=True)
             return False, str(e)
-        finally:
-            if 'conn' in locals() and conn:
-                conn.close()
-
-    def _parse_tbx(self, filepath: str) -> List[Dict]:
-        try:
-            parser = TBXParser()
-            terms = parser.parse_tbx(filepath)
-            return terms
-        except Exception as e:
-            logger.error(f"UniversalTBXParser failed for file '{filepath}': {e}", exc_info=True)
-            raise e
 
-    def _merge_terms_into_db(self, conn: sqlite3.Connection, terms: List[Dict], source_key: str, progress_callback=None):
+    def _merge_terms_into_db(self, conn: sqlite3.Connection, terms, source_key: str, progress_callback=None) -> int:
+        """
+        Merges terms into the database in one transaction. `terms` is either a
+        list of term dicts or an iterable of such lists (e.g. the batches of
+        TBXParser.iter_term_batches). Incoming rows are staged in temporary
+        tables and merged with set-based statements; duplicate translations are
+        rejected by the unique (term_id, target_term) index. Returns the number
+        of terms processed.
+        """
+        term_batches = [terms] if isinstance(terms, list) else terms
         cursor = conn.cursor()
-        total = len(terms)
         try:
             if progress_callback: progress_callback(_("Preparing data for database..."))
-
-            cursor.execute("SELECT source_term_lower, id FROM terms")
-            existing_terms_map = {row['source_term_lower']: row['id'] for row in cursor.fetchall()}
-
-            new_terms_to_insert = []
-            new_translations_to_insert = []
-            seen_in_this_batch = set()
-
-            if progress_callback: progress_callback(_("Analyzing new and existing terms..."))
-
-            for i, term_data in enumerate(terms):
-                source = term_data["source"]
-                source_lower = source.lower()
-
-                if source_lower in existing_terms_map:
-                    term_id = existing_terms_map[source_lower]
-                    cursor.execute("SELECT target_term FROM translations WHERE term_id = ?", (term_id,))
-                    existing_targets = {row['target_term'] for row in cursor.fetchall()}
-
-                    for trans in term_data["translations"]:
-                        if trans["target"] not in existing_targets:
-                            new_translations_to_insert.append(
-                                (term_id, trans["target"], trans["comment"])
-                            )
-                elif source_lower not in seen_in_this_batch:
-                    new_terms_to_insert.append(
-                        (source, source_lower, term_data["case_sensitive"], term_data["comment"], source_key)
-                    )
-                    seen_in_this_batch.add(source_lower)
-
             cursor.execute("BEGIN TRANSACTION;")
+            cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS staged_terms (
+                    source_term_lower TEXT PRIMARY KEY,
+                    source_term TEXT NOT NULL,
+                    case_sensitive INTEGER NOT NULL,
+                    comment TEXT
+                )
+            """)
+            cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS staged_translations (
+                    source_term_lower TEXT NOT NULL,
+                    target_term TEXT NOT NULL,
+                    comment TEXT
+                )
+            """)
+            cursor.execute("DELETE FROM staged_terms")
+            cursor.execute("DELETE FROM staged_translations")
 
-            if new_terms_to_insert:
-                if progress_callback: progress_callback(
-                    _("Inserting {count} new source terms...").format(count=len(new_terms_to_insert)))
+            # 1. 暂存：同一源术语以首次出现的写法为准
+            total = 0
+            for batch in term_batches:
                 cursor.executemany(
-                    "INSERT INTO terms (source_term, source_term_lower, case_sensitive, comment, source_manifest_key) VALUES (?, ?, ?, ?, ?)",
-                    new_terms_to_insert
+                    "INSERT OR IGNORE INTO staged_terms (source_term_lower, source_term, case_sensitive, comment) "
+                    "VALUES (?, ?, ?, ?)",
+                    ((t["source"].lower(), t["source"], t["case_sensitive"], t["comment"]) for t in batch)
                 )
-
-            if progress_callback: progress_callback(_("Fetching new term IDs..."))
-            cursor.execute("SELECT source_term_lower, id FROM terms")
-            all_terms_map = {row['source_term_lower']: row['id'] for row in cursor.fetchall()}
-            for term_data in terms:
-                source_lower = term_data["source"].lower()
-                if source_lower in seen_in_this_batch:
-                    term_id = all_terms_map.get(source_lower)
-                    if term_id:
-                        for trans in term_data["translations"]:
-                            new_translations_to_insert.append(
-                                (term_id, trans["target"], trans["comment"])
-                            )
-
-            if new_translations_to_insert:
-                if progress_callback: progress_callback(
-                    _("Inserting {count} new translations...").format(count=len(new_translations_to_insert)))
                 cursor.executemany(
-                    "INSERT INTO translations (term_id, target_term, comment) VALUES (?, ?, ?)",
-                    new_translations_to_insert
+                    "INSERT INTO staged_translations (source_term_lower, target_term, comment) VALUES (?, ?, ?)",
+                    ((t["source"].lower(), trans["target"], trans["comment"])
+                     for t in batch for trans in t["translations"])
                 )
+                total += len(batch)
+                if progress_callback: progress_callback(_("Imported {count} terms...").format(count=total))
 
+            # 2. 插入数据库中尚不存在的源术语
+            if progress_callback: progress_callback(_("Analyzing new and existing terms..."))
+            cursor.execute("""
+                INSERT INTO terms (source_term, source_term_lower, case_sensitive, comment, source_manifest_key)
+                SELECT s.source_term, s.source_term_lower, s.case_sensitive, s.comment, ?
+                FROM staged_terms s
+                WHERE NOT EXISTS (SELECT 1 FROM terms t WHERE t.source_term_lower = s.source_term_lower)
+                ORDER BY s.rowid
+            """, (source_key,))
+            if progress_callback: progress_callback(
+                _("Inserting {count} new source terms...").format(count=cursor.rowcount))
+
+            # 3. 插入缺少的译文，重复的由唯一索引忽略
+            cursor.execute("""
+                INSERT OR IGNORE INTO translations (term_id, target_term, comment)
+                SELECT t.id, st.target_term, st.comment
+                FROM staged_translations st
+                JOIN terms t ON t.source_term_lower = st.source_term_lower
+                ORDER BY st.rowid
+            """)
+            if progress_callback: progress_callback(
+                _("Inserting {count} new translations...").format(count=cursor.rowcount))
+
+            cursor.execute("DELETE FROM staged_terms")
+            cursor.execute("DELETE FROM staged_translations")
             conn.commit()
+            self.data_version += 1
             if progress_callback: progress_callback(_("Database update complete!"))
+            return total
 
         except Exception as e:
             conn.rollback()
@@ -225,8 +277,9 @@ class GlossaryService:
             cursor.execute("BEGIN TRANSACTION;")
             logger.info(f"Starting transaction to remove source: {source_key}")
 
-            cursor.execute("SELECT id FROM terms WHERE source_manifest_key = ?", (source_key,))
-            term_ids_to_delete = [row['id'] for row in cursor.fetchall()]
+            cursor.execute("SELECT id, source_term_lower FROM terms WHERE source_manifest_key = ?", (source_key,))
+            rows_to_delete = cursor.fetchall()
+            term_ids_to_delete = [row['id'] for row in rows_to_delete]
 
             if term_ids_to_delete:
                 chunk_size = 900
@@ -244,6 +297,8 @@ class GlossaryService:
                 logger.warning(f"No terms found in DB for source_key '{source_key}'. Only manifest will be updated.")
 
             conn.commit()
+            self.data_version += 1
+            self._update_matcher_terms(db_path, removed_keys=[row['source_term_lower'] for row in rows_to_delete])
             logger.info("Transaction committed successfully.")
 
             manifest = self._read_manifest(manifest_path)
@@ -262,9 +317,6 @@ class GlossaryService:
 
             logger.error(f"Failed to remove source '{source_key}': {e}", exc_info=True)
             return False, str(e)
-        finally:
-            if conn:
-                conn.close()
 
     def _read_manifest(self, manifest_path: str) -> Dict:
         try:
@@ -294,10 +346,41 @@ class GlossaryService:
         return h.hexdigest()
 
     def get_terms_batch(self, words: List[str]) -> Dict:
-        """Efficiently gets all terms for a list of words."""
+        """
+        Efficiently gets all terms for a list of lowercase words. Lookups go
+        through the shared term map, so only words never seen since the last
+        glossary change hit the databases.
+        """
         if not words:
             return {}
 
+        with self._term_map_lock:
+            if self._term_map_version != self.data_version:
+                self._term_map = {}
+                self._term_map_version = self.data_version
+            version = self._term_map_version
+            term_map = self._term_map
+            missing_words = [w for w in set(words) if w not in term_map]
+
+        found = {}
+        if missing_words:
+            found = self._resolve_terms(missing_words)
+            with self._term_map_lock:
+                # 查询期间术语库发生变化时，结果只返回给本次调用，不写入共享映射
+                if self._term_map_version == version:
+                    if len(self._term_map) + len(missing_words) > MAX_TERM_MAP_SIZE:
+                        self._term_map = {}
+                    for word in missing_words:
+                        self._term_map[word] = found.get(word)
+
+        all_matches = {}
+        for word in words:
+            entry = found.get(word) or term_map.get(word)
+            if entry is not None:
+                all_matches[word] = entry
+        return all_matches
+
+    def _resolve_terms(self, words: List[str]) -> Dict:
         all_matches = {}
 
         if self.project_db_path:
@@ -313,18 +396,97 @@ class GlossaryService:
                     all_matches.update(matches)
         return all_matches
 
+    def _load_matcher_terms(self, conn: sqlite3.Connection, source_key: Optional[str] = None) -> Dict:
+        cursor = conn.cursor()
+        if source_key is None:
+            cursor.execute("SELECT source_term, source_term_lower, case_sensitive FROM terms")
+        else:
+            cursor.execute("SELECT source_term, source_term_lower, case_sensitive FROM terms "
+                           "WHERE source_manifest_key = ?", (source_key,))
+        return {row['source_term_lower']: (row['source_term'], bool(row['case_sensitive'])) for row in cursor}
+
+    def _update_matcher_terms(self, db_path: str, added: Optional[Dict] = None, removed_keys=()):
+        # 只调整受影响数据库的术语集合，自动机在下次使用时由内存中的术语重建
+        with self._matcher_lock:
+            terms = self._matcher_terms.get(db_path)
+            if terms is None:
+                return
+            for key in removed_keys:
+                terms.pop(key, None)
+            if added:
+                terms.update(added)
+            self._matcher = None
+
+    def get_matcher(self) -> GlossaryMatcher:
+        with self._matcher_lock:
+            if self._matcher is None:
+                merged_terms = {}
+                # 项目术语库优先于全局术语库
+                for db_path in (self.global_db_path, self.project_db_path):
+                    if not db_path:
+                        continue
+                    if db_path not in self._matcher_terms:
+                        with self._get_db_connection(db_path) as conn:
+                            self._matcher_terms[db_path] = self._load_matcher_terms(conn)
+                    merged_terms.update(self._matcher_terms[db_path])
+                self._matcher = GlossaryMatcher(
+                    (key, source_term, case_sensitive) for key, (source_term, case_sensitive) in merged_terms.items())
+                logger.debug(f"Built glossary matcher with {len(self._matcher)} terms.")
+            return self._matcher
+
+    def find_term_matches(self, text: str) -> List[Dict]:
+        """
+        Finds every glossary term in text, multi-word terms included.
+        Returns [{"source", "translations", "spans"}, ...] in order of first occurrence.
+        """
+        if not text:
+            return []
+        spans_by_key = {}
+        for start, end, term_key in sorted(self.get_matcher().find(text)):
+            spans_by_key.setdefault(term_key, []).append((start, end))
+        if not spans_by_key:
+            return []
+        entries = self.get_terms_batch(list(spans_by_key))
+        return [{"source": key, "translations": entries[key]["translations"], "spans": spans}
+                for key, spans in spans_by_key.items() if key in entries]
+
+    def get_terms_for_texts(self, texts) -> GlossaryTermCache:
+        """Resolves the glossary terms occurring in any of texts in one batch."""
+        matcher = self.get_matcher()
+        keys_by_text = {}
+        all_keys = set()
+        for text in texts:
+            if text in keys_by_text:
+                continue
+            keys = _ordered_keys(matcher.find(text))
+            keys_by_text[text] = keys
+            all_keys.update(keys)
+        entries = self.get_terms_batch(list(all_keys)) if all_keys else {}
+        return GlossaryTermCache(matcher, keys_by_text, entries)
+
     def _query_terms_batch_in_db(self, conn: sqlite3.Connection, words: List[str]) -> Dict:
         if not words:
             return {}
-        placeholders = ','.join('?' for __ in words)
-        query = f"""
-            SELECT t.source_term_lower, tr.target_term, tr.comment
-            FROM terms t
-            JOIN translations tr ON t.id = tr.term_id
-            WHERE t.source_term_lower IN ({placeholders})
-        """
         cursor = conn.cursor()
-        cursor.execute(query, words)
+        if len(words) <= TERMS_QUERY_CHUNK_SIZE:
+            placeholders = ','.join('?' for __ in words)
+            cursor.execute(f"""
+                SELECT t.source_term_lower, tr.target_term, tr.comment
+                FROM terms t
+                JOIN translations tr ON t.id = tr.term_id
+                WHERE t.source_term_lower IN ({placeholders})
+            """, words)
+        else:
+            # 大量词（整个项目的校验）先批量写入临时表，再与 terms 连接，避免超出绑定变量上限
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS lookup_words (word TEXT PRIMARY KEY) WITHOUT ROWID")
+            cursor.execute("DELETE FROM lookup_words")
+            cursor.executemany("INSERT OR IGNORE INTO lookup_words (word) VALUES (?)", ((w,) for w in words))
+            cursor.execute("""
+                SELECT t.source_term_lower, tr.target_term, tr.comment
+                FROM lookup_words w
+                JOIN terms t ON t.source_term_lower = w.word
+                JOIN translations tr ON t.id = tr.term_id
+            """)
         results = {}
         for row in cursor.fetchall():
             source_lower = row['source_term_lower']
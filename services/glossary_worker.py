@@ -3,7 +3,8 @@
 
 from PySide6.QtCore import QRunnable, Signal, QObject
 import weakref
-import re
+import logging
+logger = logging.getLogger(__name__)
 
 
 class GlossarySignals(QObject):
@@ -24,17 +25,11 @@ class GlossaryAnalysisWorker(QRunnable):
             self.signals.finished.emit(self.ts_id, [])
             return
 
-        words = set(re.findall(r'\b\w+\b', self.text.lower()))
-        if not words:
-            self.signals.finished.emit(self.ts_id, [])
-            return
-
-        matches = []
-        for word in words:
-            term_results = app.glossary_service.get_term(word, case_sensitive=False)
-            if term_results:
-                matches.append({
-                    "source": word,
-                    "translations": term_results
-                })
-        self.signals.finished.emit(self.ts_id, matches)
\ No newline at end of file
+        # 自动机一次扫描找出所有术语（包括多词术语），并附带其在原文中的位置
+        try:
+            matches = app.glossary_service.find_term_matches(self.text)
+        except Exception as e:
+            # 出错时也要发出结果，否则术语面板会一直等待
+            logger.error(f"Glossary analysis failed: {e}", exc_info=True)
+            matches = []
+        self.signals.finished.emit(self.ts_id, matches)
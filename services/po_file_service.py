@@ -5,6 +5,7 @@ import polib
 import os
 import datetime
 from models.translatable_string import TranslatableString
+from models.source_index import SourceIndex
 from services.code_file_service import extract_translatable_strings
 from utils.constants import APP_VERSION
 from utils.localization import _
@@ -34,7 +35,7 @@ def _po_entry_to_translatable_string(entry, full_code_lines=None, original_file_
         line_num=line_num,
         char_pos_start_in_file=0,
         char_pos_end_in_file=len(entry.msgid),
-        full_code_lines=full_code_lines if full_code_lines else [],
+        full_code_lines=full_code_lines,
         string_type="PO Import",
         occurrences=entry.occurrences if hasattr(entry, 'occurrences') else []
     )
@@ -132,7 +133,7 @@ def load_from_po(filepath):
         if entry.obsolete or (entry.msgid == "" and not translatable_objects):
             continue
 
-        full_code_lines = []
+        full_code_lines = None
         if project_root and entry.occurrences:
             try:
                 relative_path = entry.occurrences[0][0]
@@ -143,9 +144,9 @@ def load_from_po(filepath):
                     full_code_lines = file_content_cache[full_source_path]
                 elif os.path.exists(full_source_path):
                     with open(full_source_path, 'r', encoding='utf-8', errors='replace') as f:
-                        lines = f.read().splitlines()
-                        file_content_cache[full_source_path] = lines
-                        full_code_lines = lines
+                        source_index = SourceIndex(f.read())
+                        file_content_cache[full_source_path] = source_index
+                        full_code_lines = source_index
             except Exception as e:
                 logger.warning(f"Warning: Could not load context file for entry '{entry.msgid[:20]}...': {e}")
 
@@ -6,6 +6,7 @@ import shutil
 import uuid
 from pathlib import Path
 from models.translatable_string import TranslatableString
+from models.source_index import SourceIndex
 from services.code_file_service import extract_translatable_strings
 from utils.constants import APP_VERSION
 from utils.localization import _
@@ -114,13 +115,13 @@ def load_project(project_path: str):
         translation_data = json.load(f)
 
     source_code_content = ""
-    full_code_lines = []
+    full_code_lines = None
     if project_config["source_files"]:
         source_file_path = proj_path / project_config["source_files"][0]["project_path"]
         if source_file_path.is_file():
             with open(source_file_path, 'r', encoding='utf-8') as f:
                 source_code_content = f.read()
-                full_code_lines = source_code_content.splitlines()
+                full_code_lines = SourceIndex(source_code_content)
 
     translatable_objects = [TranslatableString.from_dict(data, full_code_lines) for data in translation_data]
 
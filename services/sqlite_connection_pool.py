@@ -0,0 +1,104 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+import sqlite3
+import threading
+import weakref
+import logging
+logger = logging.getLogger(__name__)
+
+CACHED_STATEMENTS = 256
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=67108864",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+class _ThreadConnections:
+    """Per-thread holder; when its thread exits, the finalizer closes the thread's connections."""
+    __slots__ = ('connections', '__weakref__')
+
+    def __init__(self):
+        # db_path -> (connection, 打开时的关闭代数)
+        self.connections = {}
+
+
+class SQLiteConnectionPool:
+    """
+    Keeps one long-lived connection per (thread, database). Connections are
+    opened on first use with WAL journaling and tuned cache/mmap pragmas, and
+    sqlite3's statement cache keeps repeated queries prepared. Callers must
+    not close the connections they get; use close_database or close_all.
+
+    Connections live in thread-local storage and are closed when their thread
+    exits. close_database/close_all close the calling thread's connections
+    right away; connections of other threads, which may be in the middle of a
+    query, are only marked stale and are closed by their own thread on its
+    next get_connection (or when it exits).
+    """
+
+    def __init__(self, row_factory=sqlite3.Row):
+        self.row_factory = row_factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._db_generations = {}
+
+    def _thread_connections(self):
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            holder = self._local.holder = _ThreadConnections()
+            weakref.finalize(holder, self._close, holder.connections)
+        return holder.connections
+
+    def _current_generation(self, db_path):
+        with self._lock:
+            return self._generation, self._db_generations.get(db_path, 0)
+
+    def get_connection(self, db_path: str) -> sqlite3.Connection:
+        connections = self._thread_connections()
+        generation = self._current_generation(db_path)
+        entry = connections.get(db_path)
+        if entry is not None:
+            if entry[1] == generation:
+                return entry[0]
+            # 其他线程已请求关闭，由本线程关闭旧连接后重新打开
+            del connections[db_path]
+            self._close({db_path: entry})
+        # 连接只在所属线程中使用；线程退出时的清理可能发生在其他线程，因此关闭同线程检查
+        conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=CACHED_STATEMENTS)
+        conn.row_factory = self.row_factory
+        for pragma in CONNECTION_PRAGMAS:
+            try:
+                conn.execute(pragma)
+            except sqlite3.DatabaseError as e:
+                logger.warning(f"Could not apply '{pragma}' to '{db_path}': {e}")
+        connections[db_path] = (conn, generation)
+        return conn
+
+    def close_database(self, db_path: str):
+        with self._lock:
+            self._db_generations[db_path] = self._db_generations.get(db_path, 0) + 1
+        connections = self._thread_connections()
+        entry = connections.pop(db_path, None)
+        if entry is not None:
+            self._close({db_path: entry})
+
+    def close_all(self):
+        with self._lock:
+            self._generation += 1
+        connections = self._thread_connections()
+        stale = dict(connections)
+        connections.clear()
+        self._close(stale)
+
+    @staticmethod
+    def _close(connections):
+        for conn, __ in list(connections.values()):
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error while closing SQLite connection: {e}")
@@ -0,0 +1,291 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import threading
+from collections import Counter
+from collections.abc import MutableMapping
+from rapidfuzz import fuzz, process
+from services.sqlite_connection_pool import SQLiteConnectionPool
+from services.tm_fuzzy_index import FUZZY_MATCH_LIMIT, FUZZY_MATCH_THRESHOLD, length_bounds
+import logging
+logger = logging.getLogger(__name__)
+
+QUERY_CHUNK_SIZE = 900
+# 模糊匹配时按共享三元组数量取前 N 个候选再精确打分
+FUZZY_CANDIDATE_LIMIT = 500
+# 从最少见的三元组开始选取，直到倒排记录总数达到该预算
+FUZZY_POSTINGS_BUDGET = 20000
+# 1: source_key 改用 str.lower()，与 TMFuzzyIndex 的大小写不敏感匹配一致
+SCHEMA_VERSION = 1
+
+
+def source_trigrams(source_text):
+    """Distinct trigrams of the casefolded source, padded so short texts still produce some."""
+    padded = f"  {source_text.casefold()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SQLiteTMStore(MutableMapping):
+    """
+    Translation memory kept in a SQLite database instead of in memory.
+
+    Behaves like the source_text -> translation unit dicts used elsewhere, but
+    every lookup reads from disk and every assignment is committed right away,
+    so the returned units are copies: write a modified unit back to persist it.
+    Iteration follows insertion order. Besides exact lookups the store offers
+    get_many for bulk apply and the find_case_insensitive / find_fuzzy
+    interface of TMFuzzyIndex, backed by a lowercased source index and a
+    trigram table.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._pool = SQLiteConnectionPool(row_factory=None)
+        self._count_lock = threading.Lock()
+        self._count = None
+        self._create_schema()
+
+    def _conn(self):
+        return self._pool.get_connection(self.db_path)
+
+    def _create_schema(self):
+        conn = self._conn()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS units (
+                    id INTEGER PRIMARY KEY,
+                    source_text TEXT NOT NULL UNIQUE,
+                    source_key TEXT NOT NULL,
+                    source_length INTEGER NOT NULL,
+                    data TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_units_source_key ON units(source_key)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS unit_trigrams (
+                    gram TEXT NOT NULL,
+                    unit_id INTEGER NOT NULL,
+                    PRIMARY KEY (gram, unit_id)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS trigram_stats (
+                    gram TEXT PRIMARY KEY,
+                    unit_count INTEGER NOT NULL
+                ) WITHOUT ROWID
+            """)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                # 旧版本用 casefold() 生成 source_key
+                rows = conn.execute("SELECT id, source_text FROM units").fetchall()
+                conn.executemany("UPDATE units SET source_key = ? WHERE id = ?",
+                                 ((source_text.lower(), unit_id) for unit_id, source_text in rows))
+            if version < SCHEMA_VERSION:
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self._pool.close_all()
+
+    def _invalidate_count(self):
+        with self._count_lock:
+            self._count = None
+
+    def __getitem__(self, source_text):
+        row = self._conn().execute("SELECT data FROM units WHERE source_text = ?", (source_text,)).fetchone()
+        if row is None:
+            raise KeyError(source_text)
+        return json.loads(row[0])
+
+    def __contains__(self, source_text):
+        return self._conn().execute("SELECT 1 FROM units WHERE source_text = ?", (source_text,)).fetchone() is not None
+
+    def __len__(self):
+        with self._count_lock:
+            if self._count is None:
+                self._count = self._conn().execute("SELECT COUNT(*) FROM units").fetchone()[0]
+            return self._count
+
+    def __bool__(self):
+        return self._conn().execute("SELECT 1 FROM units LIMIT 1").fetchone() is not None
+
+    def __iter__(self):
+        rows = self._conn().execute("SELECT source_text FROM units ORDER BY id").fetchall()
+        return iter([row[0] for row in rows])
+
+    def __setitem__(self, source_text, tu):
+        conn = self._conn()
+        with conn:
+            self._upsert(conn, source_text, tu)
+
+    def __delitem__(self, source_text):
+        conn = self._conn()
+        with conn:
+            row = conn.execute("SELECT id FROM units WHERE source_text = ?", (source_text,)).fetchone()
+            if row is None:
+                raise KeyError(source_text)
+            # 三元组由原文重新计算，按主键删除
+            grams = source_trigrams(source_text)
+            conn.executemany("DELETE FROM unit_trigrams WHERE gram = ? AND unit_id = ?",
+                             ((gram, row[0]) for gram in grams))
+            conn.executemany("UPDATE trigram_stats SET unit_count = unit_count - 1 WHERE gram = ?",
+                             ((gram,) for gram in grams))
+            conn.execute("DELETE FROM units WHERE id = ?", (row[0],))
+        self._invalidate_count()
+
+    def clear(self):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM unit_trigrams")
+            conn.execute("DELETE FROM trigram_stats")
+            conn.execute("DELETE FROM units")
+        self._invalidate_count()
+
+    def update(self, other=(), **kwargs):
+        """Bulk upsert in a single transaction."""
+        items = other.items() if hasattr(other, 'items') else other
+        self.import_units(list(items) + list(kwargs.items()))
+
+    def _upsert(self, conn, source_text, tu):
+        data = json.dumps(tu, ensure_ascii=False)
+        row = conn.execute("SELECT id FROM units WHERE source_text = ?", (source_text,)).fetchone()
+        if row is not None:
+            # 原文不变，三元组也无需更新
+            conn.execute("UPDATE units SET data = ? WHERE id = ?", (data, row[0]))
+            return
+        cursor = conn.execute(
+            "INSERT INTO units (source_text, source_key, source_length, data) VALUES (?, ?, ?, ?)",
+            (source_text, source_text.lower(), len(source_text), data))
+        self._insert_trigrams(conn, [(cursor.lastrowid, source_text)])
+        self._invalidate_count()
+
+    @staticmethod
+    def _insert_trigrams(conn, units):
+        """units: [(unit_id, source_text)] of newly inserted units."""
+        gram_counts = Counter()
+        postings = []
+        for unit_id, source_text in units:
+            grams = source_trigrams(source_text)
+            gram_counts.update(grams)
+            postings.extend((gram, unit_id) for gram in grams)
+        conn.executemany("INSERT OR IGNORE INTO unit_trigrams (gram, unit_id) VALUES (?, ?)", postings)
+        conn.executemany("""
+            INSERT INTO trigram_stats (gram, unit_count) VALUES (?, ?)
+            ON CONFLICT(gram) DO UPDATE SET unit_count = unit_count + excluded.unit_count
+        """, gram_counts.items())
+
+    def import_units(self, items):
+        """Upserts (source_text, tu) pairs in one transaction. Returns the number of pairs written."""
+        rows = [(source_text, source_text.lower(), len(source_text), json.dumps(tu, ensure_ascii=False))
+                for source_text, tu in items]
+        if not rows:
+            return 0
+        conn = self._conn()
+        with conn:
+            existing = set()
+            sources = [row[0] for row in rows]
+            for i in range(0, len(sources), QUERY_CHUNK_SIZE):
+                chunk = sources[i:i + QUERY_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                existing.update(row[0] for row in conn.execute(
+                    f"SELECT source_text FROM units WHERE source_text IN ({placeholders})", chunk))
+            conn.executemany("""
+                INSERT INTO units (source_text, source_key, source_length, data) VALUES (?, ?, ?, ?)
+                ON CONFLICT(source_text) DO UPDATE SET data = excluded.data
+            """, rows)
+            # 只有新增的原文需要建立三元组
+            new_sources = [source for source in dict.fromkeys(sources) if source not in existing]
+            ids = {}
+            for i in range(0, len(new_sources), QUERY_CHUNK_SIZE):
+                chunk = new_sources[i:i + QUERY_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                ids.update(conn.execute(f"SELECT source_text, id FROM units WHERE source_text IN ({placeholders})", chunk))
+            self._insert_trigrams(conn, [(ids[source], source) for source in new_sources])
+        self._invalidate_count()
+        return len(rows)
+
+    def get_many(self, source_texts):
+        """Returns {source_text: tu} for the given sources that exist in the store."""
+        unique_sources = list(dict.fromkeys(source_texts))
+        found = {}
+        conn = self._conn()
+        for i in range(0, len(unique_sources), QUERY_CHUNK_SIZE):
+            chunk = unique_sources[i:i + QUERY_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            for source_text, data in conn.execute(
+                    f"SELECT source_text, data FROM units WHERE source_text IN ({placeholders})", chunk):
+                found[source_text] = json.loads(data)
+        return found
+
+    def find_case_insensitive(self, text):
+        """Returns the first source (in TM order) equal to text ignoring case, but not identical to it."""
+        row = self._conn().execute(
+            "SELECT source_text FROM units WHERE source_key = ? AND source_text != ? ORDER BY id LIMIT 1",
+            (text.lower(), text)).fetchone()
+        return row[0] if row else None
+
+    def find_fuzzy(self, text, limit=FUZZY_MATCH_LIMIT, threshold=FUZZY_MATCH_THRESHOLD):
+        """Returns up to `limit` (ratio, source) pairs with ratio > threshold, best first, excluding text itself."""
+        if not text:
+            return []
+        min_length, max_length = length_bounds(len(text), threshold)
+        if max_length is None:
+            max_length = len(text) * 1000
+        grams = self._selective_trigrams(source_trigrams(text))
+        if not grams:
+            return []
+        placeholders = ','.join('?' * len(grams))
+        # 先用三元组表取共享片段最多的候选，再用与 TMFuzzyIndex 相同的打分函数精确排序
+        rows = self._conn().execute(f"""
+            SELECT u.id, u.source_text
+            FROM (
+                SELECT unit_id, COUNT(*) AS shared
+                FROM unit_trigrams
+                WHERE gram IN ({placeholders})
+                GROUP BY unit_id
+            ) AS candidates
+            JOIN units u ON u.id = candidates.unit_id
+            WHERE u.source_length BETWEEN ? AND ?
+            ORDER BY candidates.shared DESC, u.id
+            LIMIT ?
+        """, (*grams, min_length, max_length, FUZZY_CANDIDATE_LIMIT)).fetchall()
+        if not rows:
+            return []
+        order = {source_text: unit_id for unit_id, source_text in rows}
+        scored = process.extract(text, list(order), scorer=fuzz.ratio, processor=None,
+                                 score_cutoff=threshold * 100, limit=None)
+        matches = []
+        for source, score, __ in scored:
+            ratio = score / 100.0
+            if ratio > threshold and source != text:
+                matches.append((ratio, source))
+        matches.sort(key=lambda item: (-item[0], order[item[1]]))
+        return matches[:limit]
+
+    def _selective_trigrams(self, grams):
+        """The query trigrams to look up: rarest first, within FUZZY_POSTINGS_BUDGET postings (at least one)."""
+        conn = self._conn()
+        counts = []
+        grams = list(grams)
+        for i in range(0, len(grams), QUERY_CHUNK_SIZE):
+            chunk = grams[i:i + QUERY_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            counts.extend(conn.execute(
+                f"SELECT gram, unit_count FROM trigram_stats WHERE gram IN ({placeholders}) AND unit_count > 0",
+                chunk))
+        counts.sort(key=lambda item: (item[1], item[0]))
+        selected = []
+        postings = 0
+        for gram, unit_count in counts[:QUERY_CHUNK_SIZE]:
+            if selected and postings + unit_count > FUZZY_POSTINGS_BUDGET:
+                break
+            selected.append(gram)
+            postings += unit_count
+        return selected
+
+    def is_same_file(self, filepath):
+        try:
+            return os.path.samefile(self.db_path, filepath)
+        except OSError:
+            return False
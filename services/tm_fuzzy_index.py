@@ -0,0 +1,80 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+import bisect
+from rapidfuzz import fuzz, process
+
+FUZZY_MATCH_THRESHOLD = 0.65
+FUZZY_MATCH_LIMIT = 3
+
+
+def length_bounds(length, threshold):
+    """(min, max) source length that can still reach threshold against a text of `length`; max is None if unbounded."""
+    # ratio = 2 * 匹配字符数 / (la + lb) <= 2 * min(la, lb) / (la + lb)，据此得到候选长度范围
+    cutoff = threshold * 100
+    min_length = int(length * cutoff / (200 - cutoff))
+    max_length = int(length * (200 - cutoff) / cutoff) + 1 if cutoff > 0 else None
+    return min_length, max_length
+
+
+class TMFuzzyIndex:
+    """
+    Lookup index over the source texts of a translation memory.
+
+    Keeps a lowercase -> sources map for case-insensitive hits and the sources
+    sorted by length. A fuzzy query only scores the sources whose length can
+    still reach the threshold (fuzz.ratio is bounded by 2 * min(len) / total
+    len), and scores them in one rapidfuzz call with score_cutoff. Results and
+    their order are the same as scoring every source in TM order.
+    """
+
+    def __init__(self, sources):
+        self._order = {}
+        self._lower_map = {}
+        for source in sources:
+            if source in self._order:
+                continue
+            self._order[source] = len(self._order)
+            self._lower_map.setdefault(source.lower(), []).append(source)
+        self._sources_by_length = sorted(self._order, key=len)
+        self._lengths = [len(source) for source in self._sources_by_length]
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, source):
+        return source in self._order
+
+    def find_case_insensitive(self, text):
+        """Returns the first source (in TM order) equal to text ignoring case, but not identical to it."""
+        for source in self._lower_map.get(text.lower(), ()):
+            if source != text:
+                return source
+        return None
+
+    def _length_window(self, length, threshold):
+        min_length, max_length = length_bounds(length, threshold)
+        if max_length is None:
+            max_length = self._lengths[-1]
+        start = bisect.bisect_left(self._lengths, min_length)
+        end = bisect.bisect_right(self._lengths, max_length)
+        return start, end
+
+    def find_fuzzy(self, text, limit=FUZZY_MATCH_LIMIT, threshold=FUZZY_MATCH_THRESHOLD):
+        """Returns up to `limit` (ratio, source) pairs with ratio > threshold, best first, excluding text itself."""
+        if not text or not self._lengths:
+            return []
+        start, end = self._length_window(len(text), threshold)
+        if start >= end:
+            return []
+        candidates = self._sources_by_length[start:end]
+        scored = process.extract(text, candidates, scorer=fuzz.ratio, processor=None,
+                                 score_cutoff=threshold * 100, limit=None)
+        matches = []
+        for source, score, __ in scored:
+            ratio = score / 100.0
+            if ratio > threshold and source != text:
+                matches.append((ratio, source))
+        # 分数相同时保持 TM 中的先后顺序
+        matches.sort(key=lambda item: (-item[0], self._order[item[1]]))
+        return matches[:limit]
@@ -5,8 +5,12 @@ import json
 import logging
 import os
 import shutil
+import threading
+from collections.abc import Mapping, MutableMapping
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from openpyxl import load_workbook, Workbook
+from services.sqlite_tm_store import SQLiteTMStore
 from utils.localization import _
 
 def create_tu(source_text, target_text, source_lang, target_lang, created_by="LexiSync", comment=""):
@@ -24,6 +28,225 @@ def create_tu(source_text, target_text, source_lang, target_lang, created_by="Le
         "comment": comment
     }
 
+class LayeredTM(Mapping):
+    """
+    Read-only merged view over several TM dicts without copying them.
+
+    layers is a list of (source_tag, tm_dict), highest priority first; a key
+    resolves to the first layer that has it. Iteration follows the order of
+    the equivalent merged dict (lowest layer first, then keys that only exist
+    in higher layers). With value_key set, values are tu[value_key] instead of
+    the translation units themselves.
+    """
+
+    def __init__(self, layers, value_key=None):
+        self.layers = [(tag, tm_data) for tag, tm_data in layers if tm_data is not None]
+        self.value_key = value_key
+        self.source_tags = _LayerSourceTags(self)
+
+    def _resolve(self, key):
+        for tag, tm_data in self.layers:
+            tu = tm_data.get(key)
+            if tu is not None:
+                return tag, tu
+        return None, None
+
+    def __getitem__(self, key):
+        tag, tu = self._resolve(key)
+        if tu is None:
+            raise KeyError(key)
+        return tu[self.value_key] if self.value_key else tu
+
+    def __contains__(self, key):
+        return any(key in tm_data for __, tm_data in self.layers)
+
+    def __iter__(self):
+        lower_layers = []
+        for __, tm_data in reversed(self.layers):
+            for key in tm_data:
+                if not any(key in lower for lower in lower_layers):
+                    yield key
+            lower_layers.append(tm_data)
+
+    def __len__(self):
+        return sum(1 for __ in self)
+
+    def __bool__(self):
+        return any(tm_data for __, tm_data in self.layers)
+
+    def get_many(self, keys):
+        """Returns {key: value} for the keys present in any layer, resolving each layer in one batch."""
+        found = {}
+        remaining = list(dict.fromkeys(keys))
+        for tag, tm_data in self.layers:
+            if not remaining:
+                break
+            for key, tu in fetch_units(tm_data, remaining).items():
+                found[key] = tu[self.value_key] if self.value_key else tu
+            remaining = [key for key in remaining if key not in found]
+        return found
+
+    def get_with_source(self, key, default=None):
+        """Returns (value, source_tag) for key, or (default, None)."""
+        tag, tu = self._resolve(key)
+        if tu is None:
+            return default, None
+        return (tu[self.value_key] if self.value_key else tu), tag
+
+    @property
+    def signature(self):
+        """Changes whenever a layer is replaced or its size changes; used to key derived indexes."""
+        # 嵌套的分层 TM 按层计算，避免 len() 遍历全部键
+        return tuple(tm_data.signature if isinstance(tm_data, LayeredTM) else (id(tm_data), len(tm_data))
+                     for __, tm_data in self.layers)
+
+
+def fetch_units(tm_data, keys):
+    """{key: tu} for the keys present in tm_data; lets stores that read from disk batch the lookups."""
+    get_many = getattr(tm_data, 'get_many', None)
+    if get_many is not None:
+        return get_many(keys)
+    return {key: tm_data[key] for key in keys if key in tm_data}
+
+
+class _LayerSourceTags(Mapping):
+    """key -> source tag of the layer that provides it."""
+
+    def __init__(self, layered_tm):
+        self._layered_tm = layered_tm
+
+    def __getitem__(self, key):
+        tag, tu = self._layered_tm._resolve(key)
+        if tu is None:
+            raise KeyError(key)
+        return tag
+
+    def __iter__(self):
+        return iter(self._layered_tm)
+
+    def __len__(self):
+        return len(self._layered_tm)
+
+
+class StoreLayeredTM(LayeredTM, MutableMapping):
+    """
+    A SQLiteTMStore layered over the in-memory content of the other TM files
+    in the same directory. Lookups go to the store first and read it on
+    demand; writes go to the store and are committed right away. The files
+    layer is a JournaledTM that only records removals, so saving appends
+    those to the JSONL file and never copies store units into it.
+    """
+
+    def __init__(self, store, other_tm):
+        super().__init__([("store", store), ("files", other_tm)])
+        self.store = store
+        self.files = other_tm
+
+    def __setitem__(self, key, tu):
+        self.store[key] = tu
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        for __, tm_data in self.layers:
+            if key in tm_data:
+                del tm_data[key]
+
+    def update(self, other=(), **kwargs):
+        self.store.update(other, **kwargs)
+
+    def clear(self):
+        for __, tm_data in self.layers:
+            tm_data.clear()
+
+
+# 死记录占比超过该阈值且记录数足够多时，在后台压缩日志文件
+COMPACTION_DEAD_RATIO = 0.5
+COMPACTION_MIN_RECORDS = 1000
+TM_LOAD_WORKERS = min(4, os.cpu_count() or 1)
+# SQLite 的附属文件和迁移后保留的旧文件不作为 TM 加载
+IGNORED_TM_FILE_SUFFIXES = ("-wal", "-shm", "-journal", ".migrated")
+
+
+class JournaledTM(dict):
+    """
+    TM dict that remembers which source texts changed since it was last
+    written, so TMService.save_tm can append only those units to the JSONL
+    file it was loaded from or last saved to. Changes made to a unit in place
+    must be reported with mark_dirty (TMService.update_tm_entry does this).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dirty_keys = set()
+        self.needs_rewrite = False
+        # 与磁盘文件的同步状态：文件路径、写入后的 (size, mtime_ns)、文件中的记录数
+        self.synced_path = None
+        self.synced_stat = None
+        self.journal_records = 0
+
+    def mark_dirty(self, key):
+        self.dirty_keys.add(key)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.dirty_keys.add(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.dirty_keys.add(key)
+
+    def update(self, *args, **kwargs):
+        other = dict(*args, **kwargs)
+        super().update(other)
+        self.dirty_keys.update(other)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.dirty_keys.add(key)
+        return super().setdefault(key, default)
+
+    def pop(self, key, *args):
+        if key in self:
+            self.dirty_keys.add(key)
+        return super().pop(key, *args)
+
+    def popitem(self):
+        key, value = super().popitem()
+        self.dirty_keys.add(key)
+        return key, value
+
+    def clear(self):
+        super().clear()
+        self.dirty_keys.clear()
+        self.needs_rewrite = True
+
+    def mark_synced(self, filepath, records):
+        self.dirty_keys.clear()
+        self.needs_rewrite = False
+        self.synced_path = filepath
+        self.synced_stat = _file_signature(filepath)
+        self.journal_records = records
+
+    def copy(self):
+        """Shallow copy that keeps the sync state but not the pending changes."""
+        tm_copy = JournaledTM()
+        dict.update(tm_copy, self)
+        tm_copy.synced_path = self.synced_path
+        tm_copy.synced_stat = self.synced_stat
+        tm_copy.journal_records = self.journal_records
+        tm_copy.needs_rewrite = self.needs_rewrite
+        return tm_copy
+
+
+def _file_signature(filepath):
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
 class BaseTMProvider:
     def read(self, filepath: str) -> dict:
         raise NotImplementedError
@@ -32,16 +255,35 @@ class BaseTMProvider:
         raise NotImplementedError
 
 class JsonlTMProvider(BaseTMProvider):
+    """
+    Each line is a translation unit. Files are append-only journals: the last
+    record for a source text wins and {"source_text": ..., "deleted": true}
+    removes it.
+    """
+
     def read(self, filepath: str) -> dict:
-        tm_data = {}
+        tm_data = JournaledTM()
+        records = 0
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
                         tu = json.loads(line)
-                        tm_data[tu["source_text"]] = tu
-        except (FileNotFoundError, json.JSONDecodeError):
-            pass
+                        source_text = tu["source_text"]
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        # 追加写入中断时可能留下不完整的最后一行
+                        logging.warning(f"TMService: Skipping malformed record at {filepath}:{line_number}.")
+                        continue
+                    records += 1
+                    if tu.get("deleted"):
+                        dict.pop(tm_data, source_text, None)
+                    else:
+                        dict.__setitem__(tm_data, source_text, tu)
+        except FileNotFoundError:
+            return tm_data
+        tm_data.mark_synced(filepath, records)
         return tm_data
 
     def write(self, filepath: str, tm_data: dict):
@@ -51,6 +293,19 @@ class JsonlTMProvider(BaseTMProvider):
                 f.write(json.dumps(tu, ensure_ascii=False) + '\n')
         shutil.move(temp_filepath, filepath)
 
+    def append(self, filepath: str, tm_data: dict, keys) -> int:
+        """Appends the current state of `keys` (a tombstone for removed ones). Returns the record count."""
+        lines = []
+        for key in keys:
+            tu = tm_data.get(key)
+            record = tu if tu is not None else {"source_text": key, "deleted": True}
+            lines.append(json.dumps(record, ensure_ascii=False) + '\n')
+        with open(filepath, 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(lines)
+
 class XlsxTMProvider(BaseTMProvider):
     def read(self, filepath: str) -> dict:
         tm_data = {}
@@ -69,54 +324,311 @@ class XlsxTMProvider(BaseTMProvider):
     def write(self, filepath: str, tm_data: dict):
         raise NotImplementedError(_("Saving to legacy .xlsx TM format is not supported. Please use .jsonl."))
 
+class SQLiteTMProvider(BaseTMProvider):
+    """
+    Opens .tmdb files as SQLiteTMStore instances, which keep the units on disk
+    and fetch them on demand. One store is kept open per file.
+    """
+
+    def __init__(self):
+        self._stores = {}
+        self._lock = threading.Lock()
+
+    def read(self, filepath: str) -> SQLiteTMStore:
+        key = os.path.abspath(filepath)
+        with self._lock:
+            store = self._stores.get(key)
+            if store is None:
+                store = SQLiteTMStore(filepath)
+                self._stores[key] = store
+            return store
+
+    def write(self, filepath: str, tm_data: dict):
+        store = self.read(filepath)
+        if store is tm_data:
+            return
+        store.clear()
+        store.import_units(tm_data.items())
+
+    def close_all(self):
+        with self._lock:
+            stores = list(self._stores.values())
+            self._stores.clear()
+        for store in stores:
+            store.close()
+
 class TMService:
     def __init__(self):
         self.providers = {
             '.jsonl': JsonlTMProvider(),
             '.xlsx': XlsxTMProvider(),
+            '.tmdb': SQLiteTMProvider(),
         }
+        # 同一文件的追加与压缩互斥
+        self._file_lock = threading.Lock()
+        self._compaction_threads = {}
+        # 每次整体重写文件时递增；压缩据此判断快照之后文件是否已被替换
+        self._write_generations = {}
+        # 已解析的 TM 文件：绝对路径 -> ((size, mtime_ns), 数据)。
+        # 翻译单元在 update_tm_entry 中整体替换而不是原地修改，因此缓存可与加载结果共享单元
+        self._load_cache = {}
+        self._cache_lock = threading.Lock()
 
     def get_provider(self, filepath: str) -> BaseTMProvider | None:
         _, ext = os.path.splitext(filepath)
         return self.providers.get(ext.lower())
 
     def load_tm_from_directory(self, directory_path: str) -> dict:
-        merged_tm = {}
+        merged_tm = JournaledTM()
         if not os.path.isdir(directory_path):
             return merged_tm
 
-        for filename in os.listdir(directory_path):
-            filepath = os.path.join(directory_path, filename)
-            if os.path.isfile(filepath):
-                tm_data = self.load_tm(filepath)
-                if tm_data:
-                    merged_tm.update(tm_data)
-                else:
-                    logging.warning(f"TMService: File '{filename}' was loaded, but it's empty or unsupported.")
+        filepaths = [os.path.join(directory_path, filename) for filename in os.listdir(directory_path)
+                     if not filename.endswith(IGNORED_TM_FILE_SUFFIXES)]
+        filepaths = [filepath for filepath in filepaths if os.path.isfile(filepath)]
+        # 未缓存的文件并行解析，合并时仍按目录顺序
+        if len(filepaths) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(filepaths), TM_LOAD_WORKERS)) as executor:
+                results = list(executor.map(self._load_tm_cached, filepaths))
+        else:
+            results = [self._load_tm_cached(filepath) for filepath in filepaths]
+
+        loaded = []
+        store = None
+        for filepath, tm_data in zip(filepaths, results):
+            # SQLite TM 保留在磁盘上按需读取，不合并进字典
+            if isinstance(tm_data, SQLiteTMStore) and store is None:
+                store = tm_data
+            elif tm_data:
+                dict.update(merged_tm, tm_data)
+                loaded.append(tm_data)
+            else:
+                logging.warning(f"TMService: File '{os.path.basename(filepath)}' was loaded, but it's empty or unsupported.")
+        if store is not None and not loaded:
+            return store
+        # 只有内容完全来自单个 JSONL 文件时，之后的保存才能直接追加到该文件
+        if len(loaded) == 1 and isinstance(loaded[0], JournaledTM) and loaded[0].synced_path:
+            merged_tm.mark_synced(loaded[0].synced_path, loaded[0].journal_records)
+        elif store is None:
+            merged_tm.needs_rewrite = True
+        if store is not None:
+            # 与数据库并存的文件层只在自身有变更时才写回
+            return StoreLayeredTM(store, merged_tm)
         return merged_tm
 
     def load_tm(self, filepath: str) -> dict:
+        tm_data = self._load_tm_cached(filepath)
+        if isinstance(tm_data, SQLiteTMStore):
+            return tm_data
+        return tm_data.copy()
+
+    def _load_tm_cached(self, filepath: str):
+        """Parsed content of filepath, reused while its size and mtime are unchanged. Callers must not modify it."""
         provider = self.get_provider(filepath)
-        if provider:
+        if not provider:
+            return {}
+        if isinstance(provider, SQLiteTMProvider):
             return provider.read(filepath)
-        return {}
+        cache_key = os.path.abspath(filepath)
+        signature = _file_signature(filepath)
+        with self._cache_lock:
+            cached = self._load_cache.get(cache_key)
+        if cached is not None and signature is not None and cached[0] == signature:
+            return cached[1]
+        tm_data = provider.read(filepath)
+        # 读取期间文件被修改时不缓存
+        if signature is not None and signature == _file_signature(filepath):
+            with self._cache_lock:
+                self._load_cache[cache_key] = (signature, tm_data)
+        return tm_data
+
+    def _remember_saved(self, filepath: str, tm_data: JournaledTM, appended_keys=None, previous_signature=None):
+        """
+        Keeps the cached content of filepath in step with a save. After a full
+        rewrite the cache takes a copy of tm_data; after an append only the
+        appended keys are patched into the cached entry, and the entry is
+        dropped if it did not match the file before the append.
+        """
+        signature = tm_data.synced_stat
+        cache_key = os.path.abspath(filepath)
+        with self._cache_lock:
+            cached = self._load_cache.get(cache_key)
+            if signature is None or (cached is not None and cached[0] == signature):
+                return
+            if appended_keys is not None:
+                if cached is None or cached[0] != previous_signature:
+                    self._load_cache.pop(cache_key, None)
+                    return
+                # 加载与保存都在 UI 线程中进行，原地更新不会与合并时的遍历交错
+                cached_tm = cached[1]
+                for key in appended_keys:
+                    tu = tm_data.get(key)
+                    if tu is None:
+                        dict.pop(cached_tm, key, None)
+                    else:
+                        dict.__setitem__(cached_tm, key, tu)
+                cached_tm.synced_stat = signature
+                cached_tm.journal_records = tm_data.journal_records
+                self._load_cache[cache_key] = (signature, cached_tm)
+                return
+        tm_copy = tm_data.copy()
+        with self._cache_lock:
+            self._load_cache[cache_key] = (signature, tm_copy)
+
+    def retain_load_cache(self, directories):
+        """Drops cached files that are not inside one of `directories` (the TM directories in use)."""
+        roots = [os.path.join(os.path.abspath(directory), '') for directory in directories if directory]
+        with self._cache_lock:
+            for cache_key in list(self._load_cache):
+                if not any(cache_key.startswith(root) for root in roots):
+                    del self._load_cache[cache_key]
+
+    def clear_load_cache(self):
+        with self._cache_lock:
+            self._load_cache.clear()
 
     def save_tm(self, filepath: str, tm_data: dict):
         jsonl_provider = self.providers['.jsonl']
         base, _ = os.path.splitext(filepath)
         jsonl_filepath = base + ".jsonl"
-        jsonl_provider.write(jsonl_filepath, tm_data)
+        store = tm_data.store if isinstance(tm_data, StoreLayeredTM) else tm_data
+        if isinstance(store, SQLiteTMStore):
+            # 数据库中的修改已即时提交；只有保存到其他目录时才导出 JSONL
+            if os.path.dirname(os.path.abspath(store.db_path)) == os.path.dirname(os.path.abspath(base)):
+                files = tm_data.files if isinstance(tm_data, StoreLayeredTM) else None
+                if files is None or not (files.dirty_keys or files.needs_rewrite):
+                    return store.db_path
+                # 其余 TM 文件只保存自身的变更
+                tm_data = files
+        if not isinstance(tm_data, JournaledTM):
+            with self._file_lock:
+                self._rewrite_locked(jsonl_filepath, tm_data)
+            return jsonl_filepath
+
+        with self._file_lock:
+            can_append = (not tm_data.needs_rewrite and tm_data.synced_path == jsonl_filepath
+                          and tm_data.synced_stat is not None
+                          and tm_data.synced_stat == _file_signature(jsonl_filepath))
+            if can_append:
+                # 只追加变化的翻译单元，保存开销与修改量成正比
+                if tm_data.dirty_keys:
+                    keys = list(tm_data.dirty_keys)
+                    previous_signature = tm_data.synced_stat
+                    appended = jsonl_provider.append(jsonl_filepath, tm_data, keys)
+                    tm_data.mark_synced(jsonl_filepath, tm_data.journal_records + appended)
+                    self._remember_saved(jsonl_filepath, tm_data, keys, previous_signature)
+            elif tm_data.synced_path in (None, jsonl_filepath) or tm_data.needs_rewrite:
+                self._rewrite_locked(jsonl_filepath, tm_data)
+                tm_data.mark_synced(jsonl_filepath, len(tm_data))
+                self._remember_saved(jsonl_filepath, tm_data)
+            else:
+                # 导出到其他文件，不改变与原文件的同步状态
+                self._rewrite_locked(jsonl_filepath, tm_data)
+                return jsonl_filepath
+        self._maybe_compact(jsonl_filepath, tm_data)
         return jsonl_filepath
 
+    def _rewrite_locked(self, filepath: str, tm_data):
+        """Full rewrite of filepath; the caller holds _file_lock."""
+        self._write_generations[filepath] = self._write_generations.get(filepath, 0) + 1
+        self.providers['.jsonl'].write(filepath, tm_data)
+
+    def _maybe_compact(self, filepath: str, tm_data: JournaledTM):
+        records = tm_data.journal_records
+        if records < COMPACTION_MIN_RECORDS or (records - len(tm_data)) / records <= COMPACTION_DEAD_RATIO:
+            return
+        running = self._compaction_threads.get(filepath)
+        if running is not None and running.is_alive():
+            return
+        with self._file_lock:
+            snapshot = [dict(tu) for tu in tm_data.values()]
+            snapshot_size = os.path.getsize(filepath)
+            generation = self._write_generations.get(filepath, 0)
+        thread = threading.Thread(target=self._compact,
+                                  args=(filepath, tm_data, snapshot, snapshot_size, generation),
+                                  name="TMCompaction")
+        self._compaction_threads[filepath] = thread
+        thread.start()
+
+    def _compact(self, filepath: str, tm_data: JournaledTM, snapshot: list, snapshot_size: int, generation: int):
+        temp_filepath = filepath + ".compact.tmp"
+        try:
+            with open(temp_filepath, 'w', encoding='utf-8') as f:
+                for tu in snapshot:
+                    f.write(json.dumps(tu, ensure_ascii=False) + '\n')
+            with self._file_lock:
+                signature_before = _file_signature(filepath)
+                # 快照之后文件被整体重写（或变短）时，快照已过时，放弃本次压缩
+                if (self._write_generations.get(filepath, 0) != generation
+                        or signature_before is None or signature_before[0] < snapshot_size):
+                    os.remove(temp_filepath)
+                    logging.info(f"TMService: Discarded compaction of '{filepath}', the file was rewritten meanwhile.")
+                    return
+                # 压缩期间追加的记录原样接到新文件末尾
+                appended_records = 0
+                with open(filepath, 'rb') as src, open(temp_filepath, 'ab') as dst:
+                    src.seek(snapshot_size)
+                    tail = src.read()
+                    dst.write(tail)
+                    appended_records = tail.count(b'\n')
+                os.replace(temp_filepath, filepath)
+                # 内容不变，只需更新加载缓存中的文件签名
+                cache_key = os.path.abspath(filepath)
+                with self._cache_lock:
+                    cached = self._load_cache.get(cache_key)
+                    if cached is not None and cached[0] == signature_before:
+                        signature_after = _file_signature(filepath)
+                        cached[1].synced_stat = signature_after
+                        cached[1].journal_records = len(snapshot) + appended_records
+                        self._load_cache[cache_key] = (signature_after, cached[1])
+                if tm_data.synced_path == filepath:
+                    tm_data.synced_stat = _file_signature(filepath)
+                    tm_data.journal_records = len(snapshot) + appended_records
+            logging.info(f"TMService: Compacted '{filepath}' to {len(snapshot) + appended_records} records.")
+        except Exception as e:
+            logging.error(f"TMService: Failed to compact '{filepath}': {e}", exc_info=True)
+            try:
+                os.remove(temp_filepath)
+            except OSError:
+                pass
+
+    def wait_for_compaction(self, timeout=None):
+        for thread in list(self._compaction_threads.values()):
+            thread.join(timeout)
+
+    def shutdown(self):
+        self.wait_for_compaction()
+        self.providers['.tmdb'].close_all()
+
+    def migrate_to_sqlite(self, source_path: str, db_path: str = None, keep_source: bool = False) -> SQLiteTMStore:
+        """
+        Imports a .jsonl/.xlsx TM into a .tmdb store next to it (same base name by default).
+        Unless keep_source is set, the source is renamed to *.migrated afterwards so that
+        load_tm_from_directory picks up the store alone.
+        """
+        if db_path is None:
+            db_path = os.path.splitext(source_path)[0] + ".tmdb"
+        tm_data = self.load_tm(source_path)
+        store = self.providers['.tmdb'].read(db_path)
+        count = store.import_units(tm_data.items())
+        if not keep_source:
+            os.replace(source_path, source_path + ".migrated")
+        logging.info(f"TMService: Migrated {count} units from '{source_path}' to '{db_path}'.")
+        return store
+
     def update_tm_entry(self, tm_data: dict, source_text: str, target_text: str, source_lang: str, target_lang: str):
         if not source_text.strip():
             return
 
-        if source_text in tm_data:
-            tu = tm_data[source_text]
+        tu = tm_data.get(source_text)
+        if tu is not None:
+            # 复制后修改，已加载缓存中共享的单元保持不变
+            tu = dict(tu)
             tu["target_text"] = target_text
             tu["last_modified_date"] = datetime.now(timezone.utc).isoformat()
             tu["usage_count"] = tu.get("usage_count", 0) + 1
+            # 写回：JournaledTM 据此记录变更，SQLiteTMStore 也据此持久化
+            tm_data[source_text] = tu
         else:
             tu = create_tu(source_text, target_text, source_lang, target_lang)
             tm_data[source_text] = tu
\ No newline at end of file
@@ -0,0 +1,246 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+from services.validation_service import validate_string, default_pipeline
+from services.validation_rules import rule_from_plugin
+import logging
+logger = logging.getLogger(__name__)
+
+# 影响校验结果的配置项；language 决定警告文本的语言
+VALIDATION_CONFIG_KEYS = (
+    'check_fuzzy', 'check_placeholders', 'check_formatting', 'check_length', 'check_glossary', 'language'
+)
+MAX_CACHED_RESULTS = 200000
+
+
+class ValidationEngine:
+    """
+    Incremental front-end for validate_string.
+
+    Results of the built-in (background-safe) rules are cached under
+    (original, translation, flags, language pair, validation config, glossary
+    version, rule set) and shared by strings with the same text. Plugin rules
+    may read any field of a string, so they are never cached: they run per
+    string after the cached result is applied. Each string remembers the key
+    of the result last applied to it (TranslatableString.validation_key),
+    extended by the fields plugin rules see when such rules are active, so a
+    full pass only recomputes strings whose key changed or that were
+    explicitly marked dirty. Changing the validation config, the glossary or
+    the plugin rules changes every key, which forces a full pass.
+    """
+
+    def __init__(self, pipeline=default_pipeline):
+        self.pipeline = pipeline
+        self._results = {}
+        self._dirty_ids = set()
+        self._generation = 0
+        self._plugin_rules_version = None
+
+    def clear(self):
+        # 提升代数使所有字符串上记录的键失效，下一次全量校验将重新计算
+        self._results.clear()
+        self._dirty_ids.clear()
+        self._generation += 1
+
+    def mark_dirty(self, ts_ids):
+        self._dirty_ids.update(ts_ids)
+
+    def sync_plugin_rules(self, app_instance):
+        plugin_manager = getattr(app_instance, 'plugin_manager', None)
+        if plugin_manager is None or plugin_manager.hooks_version == self._plugin_rules_version:
+            return
+        self._plugin_rules_version = plugin_manager.hooks_version
+        rules = []
+        for entry in plugin_manager.run_hook('register_validation_rules') or []:
+            rule = rule_from_plugin(entry)
+            if rule is None:
+                logger.warning(f"Ignoring invalid validation rule registered by a plugin: {entry!r}")
+                continue
+            rules.append(rule)
+        self.pipeline.set_extra_rules(rules)
+
+    @staticmethod
+    def config_signature(config):
+        return tuple(config.get(key, True) for key in VALIDATION_CONFIG_KEYS)
+
+    @staticmethod
+    def _language_pair(app_instance):
+        if app_instance is None:
+            return None, None
+        return getattr(app_instance, 'source_language', None), getattr(app_instance, 'target_language', None)
+
+    @staticmethod
+    def _glossary_version(app_instance):
+        glossary_service = getattr(app_instance, 'glossary_service', None)
+        return glossary_service.data_version if glossary_service is not None else None
+
+    @staticmethod
+    def _result_key(ts_obj, context):
+        return (ts_obj.original_semantic, ts_obj.translation, ts_obj.is_ignored, ts_obj.is_fuzzy) + context
+
+    @staticmethod
+    def _object_key(ts_obj, key):
+        # 上下文最后一项表示是否有插件规则；插件规则可读取的其他字段变化时也需重新校验
+        if not key[-1]:
+            return key
+        return key + (ts_obj.comment, ts_obj.string_type, ts_obj.is_reviewed)
+
+    def _is_current(self, ts_obj, key):
+        return ts_obj.validation_key == self._object_key(ts_obj, key) and ts_obj.id not in self._dirty_ids
+
+    def _finish(self, ts_obj, key, config, app_instance):
+        # 插件规则不进入共享缓存，逐个字符串在 UI 线程中运行
+        if key[-1]:
+            self.pipeline.run_ui_thread_rules(ts_obj, config, app_instance)
+        ts_obj.validation_key = self._object_key(ts_obj, key)
+        self._dirty_ids.discard(ts_obj.id)
+
+    def _store(self, key, ts_obj):
+        if len(self._results) >= MAX_CACHED_RESULTS:
+            self._results.clear()
+        self._results[key] = (tuple(ts_obj.warnings), tuple(ts_obj.minor_warnings))
+
+    def _apply_cached(self, ts_obj, key, config, app_instance):
+        cached = self._results.get(key)
+        if cached is None:
+            return False
+        ts_obj.warnings = list(cached[0])
+        ts_obj.minor_warnings = list(cached[1])
+        self._finish(ts_obj, key, config, app_instance)
+        return True
+
+    def _compute(self, ts_obj, key, config, app_instance, term_cache):
+        validate_string(ts_obj, config, app_instance, term_cache, background=True)
+        self._store(key, ts_obj)
+        self._finish(ts_obj, key, config, app_instance)
+
+    def _context(self, config, app_instance, with_glossary):
+        glossary_version = self._glossary_version(app_instance) if with_glossary else None
+        return (self.config_signature(config), self._language_pair(app_instance), with_glossary, glossary_version,
+                self._generation, self.pipeline.rules_version, self.pipeline.has_ui_thread_rules(config))
+
+    @staticmethod
+    def uses_glossary(config, app_instance):
+        return bool(config.get('check_glossary', True)) and app_instance is not None
+
+    def validate(self, ts_obj, config, app_instance=None, term_cache=None):
+        """Validates a single string. Returns True if its warnings were recomputed or replaced."""
+        self.sync_plugin_rules(app_instance)
+        with_glossary = bool(config.get('check_glossary', True)) and term_cache is not None
+        key = self._result_key(ts_obj, self._context(config, app_instance, with_glossary))
+        if self._is_current(ts_obj, key):
+            return False
+        if not self._apply_cached(ts_obj, key, config, app_instance):
+            self._compute(ts_obj, key, config, app_instance, term_cache)
+        return True
+
+    def validate_inline(self, ts_obj, config, app_instance=None):
+        """
+        Validation for the edit path: only cheap rules run here. Returns the
+        (ts_obj, key) pair that still needs a full (background) validation, or
+        None if the string is already complete.
+        """
+        self.sync_plugin_rules(app_instance)
+        if not self.pipeline.has_expensive_rules(config):
+            self.validate(ts_obj, config, app_instance)
+            return None
+        key = self._result_key(ts_obj, self._context(config, app_instance, self.uses_glossary(config, app_instance)))
+        if self._is_current(ts_obj, key) or self._apply_cached(ts_obj, key, config, app_instance):
+            return None
+        # 部分结果不进入缓存，也不记录键，完整结果由后台校验补上
+        validate_string(ts_obj, config, app_instance, include_expensive=False)
+        ts_obj.validation_key = None
+        return ts_obj, key
+
+    def prepare_pass(self, translatable_objects, config, app_instance=None):
+        """
+        Applies cached results to every outdated string and returns
+        (changed, pending, with_glossary). changed lists all strings whose
+        warnings are replaced by this pass; pending holds the (ts_obj, key)
+        pairs that still have to be computed.
+        """
+        self.sync_plugin_rules(app_instance)
+        with_glossary = self.uses_glossary(config, app_instance)
+        context = self._context(config, app_instance, with_glossary)
+
+        changed = []
+        pending = []
+        for ts_obj in translatable_objects:
+            key = self._result_key(ts_obj, context)
+            if self._is_current(ts_obj, key):
+                continue
+            changed.append(ts_obj)
+            if not self._apply_cached(ts_obj, key, config, app_instance):
+                pending.append((ts_obj, key))
+        logger.debug(f"Validation pass: {len(changed)} changed, {len(pending)} to compute, "
+                     f"{len(translatable_objects) - len(changed)} unchanged.")
+        return changed, pending, with_glossary
+
+    def compute_pending(self, pending, config, app_instance=None, with_glossary=False):
+        term_cache = {}
+        if with_glossary:
+            term_cache = fetch_term_cache(app_instance.glossary_service, (ts_obj for ts_obj, _key in pending))
+        for ts_obj, key in pending:
+            self._compute(ts_obj, key, config, app_instance, term_cache)
+
+    def validate_all(self, translatable_objects, config, app_instance=None):
+        """
+        Brings every string up to date and returns the list of strings whose
+        warnings were recomputed or replaced. Glossary terms are only fetched
+        for strings that actually need validation.
+        """
+        changed, pending, with_glossary = self.prepare_pass(translatable_objects, config, app_instance)
+        if pending:
+            self.compute_pending(pending, config, app_instance, with_glossary)
+        return changed
+
+    def apply_result(self, ts_obj, key, warnings, minor_warnings, config=None, app_instance=None):
+        """
+        Stores a result computed by ValidationWorker from a snapshot. The result
+        is only applied if the string has not changed since its snapshot was taken;
+        the rules the worker skipped (not background-safe) then run here, on the
+        UI thread, against the live string, and are not cached.
+        """
+        if self._result_key(ts_obj, key[4:]) != key:
+            return False
+        ts_obj.warnings = list(warnings)
+        ts_obj.minor_warnings = list(minor_warnings)
+        self._store(key, ts_obj)
+        if config is None:
+            ts_obj.validation_key = key
+            self._dirty_ids.discard(ts_obj.id)
+        else:
+            self._finish(ts_obj, key, config, app_instance)
+        return True
+
+
+class ValidationSnapshot:
+    """Detached copy of the fields validation rules read, safe to validate off the UI thread."""
+    __slots__ = ('id', 'original_semantic', 'translation', 'is_ignored', 'is_fuzzy', 'is_reviewed', 'comment',
+                 'string_type', 'warnings', 'minor_warnings')
+
+    def __init__(self, ts_obj):
+        self.id = ts_obj.id
+        self.original_semantic = ts_obj.original_semantic
+        self.translation = ts_obj.translation
+        self.is_ignored = ts_obj.is_ignored
+        self.is_fuzzy = ts_obj.is_fuzzy
+        self.is_reviewed = ts_obj.is_reviewed
+        self.comment = ts_obj.comment
+        self.string_type = ts_obj.string_type
+        self.warnings = []
+        self.minor_warnings = []
+
+
+class LanguagePair:
+    """Stands in for app_instance in validate_string when validating off the UI thread."""
+    __slots__ = ('source_language', 'target_language')
+
+    def __init__(self, source_language, target_language):
+        self.source_language = source_language
+        self.target_language = target_language
+
+
+def fetch_term_cache(glossary_service, ts_objects):
+    return glossary_service.get_terms_for_texts(
+        ts_obj.original_semantic for ts_obj in ts_objects if not ts_obj.is_ignored)
@@ -0,0 +1,391 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+from utils.localization import _
+from utils.enums import WarningType
+from utils.text_features import get_text_features, PUNCTUATION_MAP
+from services.expansion_ratio_service import ExpansionRatioService
+import logging
+logger = logging.getLogger(__name__)
+
+RULE_COST_CHEAP = 'cheap'
+RULE_COST_EXPENSIVE = 'expensive'
+
+
+class ValidationContext:
+    """Per-string state handed to every rule. Text features are computed on first access."""
+    __slots__ = ('ts_obj', 'original', 'translation', 'config', 'app_instance', 'term_cache',
+                 'warnings', 'minor_warnings', '_orig_features', '_trans_features')
+
+    def __init__(self, ts_obj, config, app_instance, term_cache):
+        self.ts_obj = ts_obj
+        self.original = ts_obj.original_semantic
+        self.translation = ts_obj.translation
+        self.config = config
+        self.app_instance = app_instance
+        self.term_cache = term_cache
+        self.warnings = []
+        self.minor_warnings = []
+        self._orig_features = None
+        self._trans_features = None
+
+    @property
+    def orig_features(self):
+        if self._orig_features is None:
+            self._orig_features = get_text_features(self.original)
+        return self._orig_features
+
+    @property
+    def trans_features(self):
+        if self._trans_features is None:
+            self._trans_features = get_text_features(self.translation)
+        return self._trans_features
+
+
+class ValidationRule:
+    """
+    A single check. `check(context)` appends to context.warnings / context.minor_warnings.
+    The rule only runs when every key in `config_keys` is enabled (default True) and,
+    if `requires_term_cache` is set, when a glossary term cache is available.
+    `features` lists the TextFeatures fields the rule reads; `cost` decides whether
+    it runs inline on edit (cheap) or only in background passes (expensive).
+    Background passes run on a worker thread against a ValidationSnapshot, so only
+    rules declared `background_safe` run there: they may read nothing but the
+    snapshot fields, context.app_instance.source_language/target_language and
+    context.term_cache. All other rules run on the UI thread against the live string
+    when the background results are applied.
+    """
+    __slots__ = ('rule_id', 'check', 'config_keys', 'cost', 'features', 'requires_term_cache', 'background_safe')
+
+    def __init__(self, rule_id, check, config_keys=(), cost=RULE_COST_CHEAP, features=(), requires_term_cache=False,
+                 background_safe=False):
+        self.rule_id = rule_id
+        self.check = check
+        self.config_keys = tuple(config_keys)
+        self.cost = cost
+        self.features = tuple(features)
+        self.requires_term_cache = requires_term_cache
+        self.background_safe = background_safe
+
+    def is_enabled(self, config):
+        return all(config.get(key, True) for key in self.config_keys)
+
+
+class RuleStats:
+    __slots__ = ('calls', 'hits', 'total_time', 'errors')
+
+    def __init__(self):
+        self.calls = 0
+        self.hits = 0
+        self.total_time = 0.0
+        self.errors = 0
+
+
+# --- 内置规则 ---
+
+def check_fuzzy(context):
+    if context.ts_obj.is_fuzzy:
+        context.minor_warnings.append(
+            (WarningType.FUZZY_TRANSLATION, _("Translation is marked as fuzzy and needs review.")))
+
+
+def check_placeholders(context):
+    original_placeholders = context.orig_features.placeholder_set
+    translated_placeholders = context.trans_features.placeholder_set
+    if original_placeholders == translated_placeholders:
+        return
+    missing_placeholders = original_placeholders - translated_placeholders
+    extra_placeholders = translated_placeholders - original_placeholders
+
+    if missing_placeholders:
+        context.warnings.append((WarningType.PLACEHOLDER_MISSING,
+                                 _("Missing placeholders: {placeholders}").format(
+                                     placeholders=", ".join(missing_placeholders))))
+    if extra_placeholders:
+        context.warnings.append((WarningType.PLACEHOLDER_EXTRA,
+                                 _("Extra placeholders: {placeholders}").format(
+                                     placeholders=", ".join(extra_placeholders))))
+
+
+def check_line_count(context):
+    if context.orig_features.line_count != context.trans_features.line_count:
+        context.warnings.append((WarningType.LINE_COUNT_MISMATCH, _("Line count differs from original.")))
+
+
+def check_edge_whitespace(context):
+    orig_features, trans_features = context.orig_features, context.trans_features
+    if orig_features.starts_with_space and not trans_features.starts_with_space:
+        context.warnings.append(
+            (WarningType.LEADING_WHITESPACE_MISMATCH, _("Original starts with space, translation does not.")))
+    elif not orig_features.starts_with_space and trans_features.starts_with_space:
+        context.warnings.append(
+            (WarningType.LEADING_WHITESPACE_MISMATCH, _("Translation starts with space, original does not.")))
+
+    if orig_features.ends_with_space and not trans_features.ends_with_space:
+        context.warnings.append(
+            (WarningType.TRAILING_WHITESPACE_MISMATCH, _("Original ends with space, translation does not.")))
+    elif not orig_features.ends_with_space and trans_features.ends_with_space:
+        context.warnings.append(
+            (WarningType.TRAILING_WHITESPACE_MISMATCH, _("Translation ends with space, original does not.")))
+
+
+def check_edge_punctuation(context):
+    orig_features, trans_features = context.orig_features, context.trans_features
+    if not (orig_features.first_char and trans_features.first_char):
+        return
+    orig_start_char, trans_start_char = orig_features.first_char, trans_features.first_char
+    orig_is_punc_start = orig_features.starts_with_punctuation
+    trans_is_punc_start = trans_features.starts_with_punctuation
+    if orig_is_punc_start != trans_is_punc_start:
+        context.warnings.append(
+            (WarningType.PUNCTUATION_MISMATCH_START, _("Starting punctuation presence differs.")))
+    elif orig_is_punc_start and (
+            PUNCTUATION_MAP.get(orig_start_char) != trans_start_char and orig_start_char != trans_start_char):
+        context.warnings.append((WarningType.PUNCTUATION_MISMATCH_START,
+                                 _("Starting punctuation differs: '{c1}' vs '{c2}'.").format(c1=orig_start_char,
+                                                                                             c2=trans_start_char)))
+
+    orig_end_char, trans_end_char = orig_features.last_char, trans_features.last_char
+    orig_is_punc_end = orig_features.ends_with_punctuation
+    trans_is_punc_end = trans_features.ends_with_punctuation
+    if orig_is_punc_end != trans_is_punc_end:
+        context.warnings.append(
+            (WarningType.PUNCTUATION_MISMATCH_END, _("Ending punctuation presence differs.")))
+    elif orig_is_punc_end and (
+            PUNCTUATION_MAP.get(orig_end_char) != trans_end_char and orig_end_char != trans_end_char):
+        context.warnings.append((WarningType.PUNCTUATION_MISMATCH_END,
+                                 _("Ending punctuation differs: '{c1}' vs '{c2}'.").format(c1=orig_end_char,
+                                                                                           c2=trans_end_char)))
+
+
+def check_capitalization(context):
+    first_char_original = context.orig_features.first_cased_char
+    first_char_translation = context.trans_features.first_cased_char
+    if first_char_original and first_char_translation and (
+            first_char_original.isupper() != first_char_translation.isupper()):
+        context.warnings.append((WarningType.CAPITALIZATION_MISMATCH, _("Initial capitalization mismatch.")))
+
+
+def check_length(context):
+    original, translation = context.original, context.translation
+    if len(original) <= 4 or original == translation:
+        return
+    len_orig = context.orig_features.linguistic_length
+    if len_orig <= 0:
+        return
+    len_trans = context.trans_features.linguistic_length
+    actual_ratio = len_trans / len_orig
+    service = ExpansionRatioService.get_instance()
+    expected_ratio = service.get_expected_ratio(
+        context.app_instance.source_language,
+        context.app_instance.target_language,
+        original,
+        "none"
+    )
+    major_upper_threshold_factor = 2.5
+    major_lower_threshold_factor = 0.4
+    minor_upper_threshold_factor = 2.0
+    minor_lower_threshold_factor = 0.5
+    if expected_ratio is None or expected_ratio <= 0:
+        return
+    if actual_ratio > expected_ratio * major_upper_threshold_factor or \
+            actual_ratio < expected_ratio * major_lower_threshold_factor:
+        warning_msg = _(
+            "Length warning: Unusual expansion ratio ({actual:.1f}x), expected around {expected:.1f}x.").format(
+            actual=actual_ratio, expected=expected_ratio)
+        context.warnings.append((WarningType.LENGTH_DEVIATION_MAJOR, warning_msg))
+    elif actual_ratio > expected_ratio * minor_upper_threshold_factor or \
+            actual_ratio < expected_ratio * minor_lower_threshold_factor:
+        warning_msg = _(
+            "Length warning: Unusual expansion ratio ({actual:.1f}x), expected around {expected:.1f}x.").format(
+            actual=actual_ratio, expected=expected_ratio)
+        context.minor_warnings.append((WarningType.LENGTH_DEVIATION_MINOR, warning_msg))
+
+
+def check_glossary(context):
+    term_cache = context.term_cache
+    translation_lower = context.trans_features.lower
+    # GlossaryTermCache 能识别多词术语；普通字典只按单词查找
+    terms_in = getattr(term_cache, 'terms_in', None)
+    for word in (terms_in(context.original) if terms_in else context.orig_features.words):
+        if word in term_cache:
+            term_info = term_cache[word]
+            required_targets = [t['target'].lower() for t in term_info['translations']]
+            if not any(target in translation_lower for target in required_targets):
+                context.minor_warnings.append((
+                    WarningType.GLOSSARY_MISMATCH,
+                    _("Glossary Mismatch: Term '{term}' should be translated as one of '{targets}'.").format(
+                        term=word, targets=" / ".join(required_targets)
+                    )
+                ))
+
+
+# 顺序即警告的输出顺序；长度和术语检查历来只在格式检查开启时运行
+BUILTIN_RULES = (
+    ValidationRule('fuzzy', check_fuzzy, ('check_fuzzy',), background_safe=True),
+    ValidationRule('placeholders', check_placeholders, ('check_placeholders',), features=('placeholder_set',),
+                   background_safe=True),
+    ValidationRule('line_count', check_line_count, ('check_formatting',), features=('line_count',),
+                   background_safe=True),
+    ValidationRule('edge_whitespace', check_edge_whitespace, ('check_formatting',),
+                   features=('starts_with_space', 'ends_with_space'), background_safe=True),
+    ValidationRule('edge_punctuation', check_edge_punctuation, ('check_formatting',),
+                   features=('first_char', 'last_char'), background_safe=True),
+    ValidationRule('capitalization', check_capitalization, ('check_formatting',), features=('first_cased_char',),
+                   background_safe=True),
+    ValidationRule('length', check_length, ('check_formatting', 'check_length'), features=('linguistic_length',),
+                   background_safe=True),
+    ValidationRule('glossary', check_glossary, ('check_formatting', 'check_glossary'), cost=RULE_COST_EXPENSIVE,
+                   features=('words', 'lower'), requires_term_cache=True, background_safe=True),
+)
+
+
+def rule_from_plugin(entry):
+    """
+    Adapts an entry returned by PluginBase.register_validation_rules. Entries may be
+    ValidationRule instances or callables taking the string and returning None, a
+    (WarningType, message) tuple or a list of such tuples. Callables may read any
+    attribute of the live TranslatableString, so they always run on the UI thread.
+    """
+    if isinstance(entry, ValidationRule):
+        return entry
+    if not callable(entry):
+        return None
+    rule_id = f"plugin:{getattr(entry, '__module__', '')}.{getattr(entry, '__qualname__', repr(entry))}"
+
+    def check(context):
+        result = entry(context.ts_obj)
+        if not result:
+            return
+        if isinstance(result, tuple):
+            result = [result]
+        context.warnings.extend(result)
+
+    return ValidationRule(rule_id, check, background_safe=False)
+
+
+class ValidationPipeline:
+    """
+    Runs the enabled rules for a string and keeps per-rule timing and hit counts.
+    The list of active rules is resolved once per config signature, so rules that
+    are disabled in config are never visited.
+    """
+
+    def __init__(self, rules=BUILTIN_RULES):
+        self._builtin_rules = tuple(rules)
+        self._extra_rules = ()
+        self.rules_version = 0
+        self._active_rules_cache = {}
+        self.stats = {}
+
+    @property
+    def rules(self):
+        return self._builtin_rules + self._extra_rules
+
+    def set_extra_rules(self, rules):
+        self._extra_rules = tuple(rules)
+        self.rules_version += 1
+        self._active_rules_cache = {}
+
+    def _active_rules(self, config, include_expensive, has_term_cache, thread_filter=None):
+        """thread_filter: None for all rules, True for background-safe rules only, False for the others."""
+        config_signature = tuple(config.get(key, True) for rule in self.rules for key in rule.config_keys)
+        cache_key = (config_signature, include_expensive, has_term_cache, thread_filter)
+        active_rules = self._active_rules_cache.get(cache_key)
+        if active_rules is None:
+            active_rules = tuple(
+                rule for rule in self.rules
+                if rule.is_enabled(config)
+                and (include_expensive or rule.cost != RULE_COST_EXPENSIVE)
+                and (has_term_cache or not rule.requires_term_cache)
+                and (thread_filter is None or rule.background_safe == thread_filter)
+            )
+            self._active_rules_cache[cache_key] = active_rules
+        return active_rules
+
+    def has_expensive_rules(self, config):
+        return any(rule.cost == RULE_COST_EXPENSIVE and rule.is_enabled(config) for rule in self.rules)
+
+    def has_ui_thread_rules(self, config):
+        return any(not rule.background_safe and rule.is_enabled(config) for rule in self.rules)
+
+    def run(self, ts_obj, config, app_instance=None, term_cache=None, include_expensive=True,
+            background=False, stats=None):
+        """
+        Replaces ts_obj's warnings with the result of the enabled rules. With
+        background set only background-safe rules run; `stats` lets a worker
+        collect its own RuleStats instead of updating the shared ones.
+        """
+        ts_obj.warnings = []
+        ts_obj.minor_warnings = []
+        if not ts_obj.translation or ts_obj.is_ignored:
+            return
+        context = ValidationContext(ts_obj, config, app_instance, term_cache)
+        rules = self._active_rules(config, include_expensive, term_cache is not None, True if background else None)
+        self._run_rules(context, rules, self.stats if stats is None else stats)
+        ts_obj.warnings = context.warnings
+        ts_obj.minor_warnings = context.minor_warnings
+
+    def run_ui_thread_rules(self, ts_obj, config, app_instance=None):
+        """Appends the warnings of the rules a background pass skipped to ts_obj's current warnings."""
+        if not ts_obj.translation or ts_obj.is_ignored:
+            return
+        rules = self._active_rules(config, True, False, False)
+        if not rules:
+            return
+        context = ValidationContext(ts_obj, config, app_instance, None)
+        context.warnings = list(ts_obj.warnings)
+        context.minor_warnings = list(ts_obj.minor_warnings)
+        self._run_rules(context, rules, self.stats)
+        ts_obj.warnings = context.warnings
+        ts_obj.minor_warnings = context.minor_warnings
+
+    @staticmethod
+    def _run_rules(context, rules, stats):
+        perf_counter = time.perf_counter
+        for rule in rules:
+            rule_stats = stats.get(rule.rule_id)
+            if rule_stats is None:
+                rule_stats = stats[rule.rule_id] = RuleStats()
+            found_before = len(context.warnings) + len(context.minor_warnings)
+            start = perf_counter()
+            try:
+                rule.check(context)
+            except Exception as e:
+                rule_stats.errors += 1
+                logger.error(f"Validation rule '{rule.rule_id}' failed: {e}", exc_info=True)
+            rule_stats.total_time += perf_counter() - start
+            rule_stats.calls += 1
+            if len(context.warnings) + len(context.minor_warnings) != found_before:
+                rule_stats.hits += 1
+
+    def merge_stats(self, stats):
+        """Adds RuleStats collected by a worker run; call on the UI thread."""
+        for rule_id, run_stats in stats.items():
+            rule_stats = self.stats.get(rule_id)
+            if rule_stats is None:
+                rule_stats = self.stats[rule_id] = RuleStats()
+            rule_stats.calls += run_stats.calls
+            rule_stats.hits += run_stats.hits
+            rule_stats.total_time += run_stats.total_time
+            rule_stats.errors += run_stats.errors
+
+    def reset_stats(self):
+        self.stats = {}
+
+    def get_report(self):
+        """Returns [(rule_id, cost, RuleStats), ...] sorted by total time, most expensive first."""
+        costs = {rule.rule_id: rule.cost for rule in self.rules}
+        report = [(rule_id, costs.get(rule_id, RULE_COST_CHEAP), rule_stats)
+                  for rule_id, rule_stats in self.stats.items()]
+        report.sort(key=lambda item: item[2].total_time, reverse=True)
+        return report
+
+    def format_report(self):
+        lines = [f"{'Rule':<32} {'Cost':<10} {'Calls':>8} {'Hits':>8} {'Total ms':>10} {'Avg us':>8}"]
+        for rule_id, cost, rule_stats in self.get_report():
+            avg_us = rule_stats.total_time / rule_stats.calls * 1e6 if rule_stats.calls else 0.0
+            lines.append(f"{rule_id:<32} {cost:<10} {rule_stats.calls:>8} {rule_stats.hits:>8} "
+                         f"{rule_stats.total_time * 1000:>10.1f} {avg_us:>8.1f}")
+        return "\n".join(lines)
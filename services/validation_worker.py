@@ -0,0 +1,83 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+from PySide6.QtCore import QRunnable, Signal, QObject
+import threading
+from services.validation_service import validate_string
+from services.validation_engine import ValidationSnapshot, LanguagePair, fetch_term_cache
+import logging
+logger = logging.getLogger(__name__)
+
+VALIDATION_CHUNK_SIZE = 500
+
+
+class ValidationCancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def is_cancelled(self):
+        return self._event.is_set()
+
+
+class ValidationSignals(QObject):
+    # run_id, [(ts_id, key, warnings, minor_warnings), ...]
+    batch_ready = Signal(int, object)
+    # run_id, done, total
+    progress = Signal(int, int, int)
+    # run_id, {rule_id: RuleStats}，在 finished 之前发出
+    stats_ready = Signal(int, object)
+    # run_id, cancelled
+    finished = Signal(int, bool)
+
+
+class ValidationWorker(QRunnable):
+    """
+    Validates detached snapshots in chunks off the UI thread and streams the
+    results back per chunk. Nothing here touches the live TranslatableString
+    objects; the UI thread applies the results through ValidationEngine, which
+    also runs the rules that are not background-safe. Rule statistics are
+    collected per run and handed to the UI thread at the end.
+    """
+
+    def __init__(self, run_id, pending, config, app_instance, with_glossary, cancel_token,
+                 chunk_size=VALIDATION_CHUNK_SIZE):
+        super().__init__()
+        self.run_id = run_id
+        # 快照在 UI 线程中生成，工作线程只读取快照
+        self.items = [(ts_obj.id, key, ValidationSnapshot(ts_obj)) for ts_obj, key in pending]
+        self.config = dict(config)
+        self.languages = LanguagePair(app_instance.source_language, app_instance.target_language)
+        self.glossary_service = app_instance.glossary_service if with_glossary else None
+        self.cancel_token = cancel_token
+        self.chunk_size = chunk_size
+        self.stats = {}
+        self.signals = ValidationSignals()
+
+    def run(self):
+        total = len(self.items)
+        done = 0
+        try:
+            for start in range(0, total, self.chunk_size):
+                if self.cancel_token.is_cancelled:
+                    break
+                chunk = self.items[start:start + self.chunk_size]
+                term_cache = {}
+                if self.glossary_service is not None:
+                    term_cache = fetch_term_cache(self.glossary_service, (snapshot for _id, _key, snapshot in chunk))
+
+                results = []
+                for ts_id, key, snapshot in chunk:
+                    validate_string(snapshot, self.config, self.languages, term_cache,
+                                    background=True, stats=self.stats)
+                    results.append((ts_id, key, snapshot.warnings, snapshot.minor_warnings))
+                done += len(chunk)
+                self.signals.batch_ready.emit(self.run_id, results)
+                self.signals.progress.emit(self.run_id, done, total)
+        except Exception as e:
+            logger.error(f"Background validation failed: {e}", exc_info=True)
+        self.signals.stats_ready.emit(self.run_id, self.stats)
+        self.signals.finished.emit(self.run_id, self.cancel_token.is_cancelled)
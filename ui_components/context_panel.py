@@ -38,11 +38,11 @@ class ContextPanel(QWidget):
         cursor.setCharFormat(self.default_format)
         self.context_text_display.clear()
 
-        if not  ts_obj or not ts_obj.context_lines:
+        context_lines = ts_obj.context_lines if ts_obj else None
+        if not context_lines:
             self.context_text_display.setPlainText("")
             return
 
-        context_lines = ts_obj.context_lines
         current_line_in_context_idx = ts_obj.current_line_in_context_idx
         keyword_to_highlight = ts_obj.original_raw
         full_text = "\n".join(context_lines)
@@ -1,8 +1,8 @@
 # Copyright (c) 2025, TheSkyC
 # SPDX-License-Identifier: Apache-2.0
 
-from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
-from PySide6.QtGui import QPainter, QColor, QPen, QFont
+from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QStyle
+from PySide6.QtGui import QPainter, QColor, QPen, QFont, QFontMetrics
 from PySide6.QtCore import Qt, QModelIndex
 from models.translatable_strings_model import NewlineColorRole
 
@@ -18,16 +18,58 @@ class CustomCellDelegate(QStyledItemDelegate):
         search_pen.setStyle(Qt.PenStyle.DotLine)
         self.search_highlight_pen = search_pen
 
+        self.find_focus_color = QColor(144, 238, 144, 150)
+        self.find_match_color = QColor(147, 112, 219, 110)
+
         self.newline_symbol = "↵"
+        # (ts_id, column) -> (模型返回的文本, 替换换行后的文本)
+        self._display_text_cache = {}
+        # font.key() -> (符号字体, 符号宽度, descent)
+        self._symbol_font_cache = {}
 
-    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
-        display_option = QStyleOptionViewItem(option)
-        original_text = index.data(Qt.DisplayRole)
+        if app_instance is not None and hasattr(app_instance, 'sheet_model'):
+            app_instance.sheet_model.modelReset.connect(self.clear_caches)
+
+    def clear_caches(self):
+        self._display_text_cache.clear()
+        self._symbol_font_cache.clear()
+
+    def _get_text_to_draw(self, index, column, ts_obj):
+        if (column != 2 and column != 3) or ts_obj is None:
+            original_text = index.data(Qt.DisplayRole)
+            text_to_draw = str(original_text) if original_text is not None else ""
+            if column == 2 or column == 3:
+                text_to_draw = text_to_draw.replace('\n', '↵')
+            return text_to_draw
+        # 直接取模型缓存的显示文本（避免 QVariant 转换），文本对象不变即说明该行未被修改
+        original_text = self.app.sheet_model.get_display_text(ts_obj, column)
+        cache_key = (ts_obj.id, column)
+        cached = self._display_text_cache.get(cache_key)
+        if cached is not None and cached[0] is original_text:
+            return cached[1]
         text_to_draw = str(original_text) if original_text is not None else ""
-        if index.column() in [2, 3] and '\n' in text_to_draw:
+        if '\n' in text_to_draw:
             text_to_draw = text_to_draw.replace('\n', '↵')
-        display_option.text = text_to_draw
-        if index.column() == 1:
+        self._display_text_cache[cache_key] = (original_text, text_to_draw)
+        return text_to_draw
+
+    def _get_symbol_font(self, font):
+        font_key = font.key()
+        cached = self._symbol_font_cache.get(font_key)
+        if cached is None:
+            symbol_font = QFont(font)
+            symbol_font.setPointSize(int(font.pointSize() * 0.9))
+            font_metrics = QFontMetrics(symbol_font)
+            cached = (symbol_font, font_metrics.horizontalAdvance(self.newline_symbol), font_metrics.descent())
+            self._symbol_font_cache[font_key] = cached
+        return cached
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        column = index.column()
+        ts_obj = index.data(Qt.UserRole)
+        display_option = QStyleOptionViewItem(option)
+        display_option.text = self._get_text_to_draw(index, column, ts_obj)
+        if column == 1:
             display_option.displayAlignment = Qt.AlignCenter
         background_color = index.data(Qt.BackgroundRole)
         if background_color and isinstance(background_color, QColor):
@@ -35,20 +77,18 @@ class CustomCellDelegate(QStyledItemDelegate):
             painter.fillRect(display_option.rect, background_color)
             painter.restore()
         super().paint(painter, display_option, index)
+        is_find_match = False
+        if self.app.find_highlight_indices or self.app.current_find_highlight_index is not None:
+            current_proxy_index_tuple = (index.row(), column)
+            is_find_match = current_proxy_index_tuple in self.app.find_highlight_indices
+            is_current_find_focus = current_proxy_index_tuple == self.app.current_find_highlight_index
+            if is_current_find_focus:
+                painter.fillRect(display_option.rect, self.find_focus_color)
+            elif is_find_match:
+                painter.fillRect(display_option.rect, self.find_match_color)
         painter.save()
-        current_proxy_index_tuple = (index.row(), index.column())
-        is_find_match = current_proxy_index_tuple in self.app.find_highlight_indices
-        is_current_find_focus = current_proxy_index_tuple == self.app.current_find_highlight_index
-
-        if is_current_find_focus:
-            painter.fillRect(display_option.rect, QColor(144, 238, 144, 150))
-        elif is_find_match:
-            painter.fillRect(display_option.rect, QColor(147, 112, 219, 110))
-        painter.restore()
-        painter.save()
-        ts_obj = index.data(Qt.UserRole)
         if ts_obj:
-            is_selected = display_option.state & self.parent().style().StateFlag.State_Selected
+            is_selected = display_option.state & QStyle.StateFlag.State_Selected
             is_focused = (self.app and ts_obj.id == self.app.current_focused_ts_id)
 
             pen_to_use = None
@@ -65,32 +105,30 @@ class CustomCellDelegate(QStyledItemDelegate):
                 painter.drawLine(rect.topLeft(), rect.topRight())
                 painter.drawLine(rect.bottomLeft().x(), rect.bottomLeft().y() - 1, rect.bottomRight().x(),
                                  rect.bottomRight().y() - 1)
-                if index.column() == 0:
+                if column == 0:
                     painter.drawLine(rect.topLeft().x(), rect.topLeft().y(), rect.bottomLeft().x(),
                                      rect.bottomLeft().y() - 1)
-                if index.column() == index.model().columnCount() - 1:
+                if column == index.model().columnCount() - 1:
                     painter.drawLine(rect.topRight().x(), rect.topRight().y(), rect.bottomRight().x(),
                                      rect.bottomRight().y() - 1)
-        if index.column() in [2, 3]:
+        if column == 2 or column == 3:
             symbol_color = None
-            if index.column() == 2:  # 原文列
-                symbol_color = ts_obj.ui_style_cache.get('original_newline_color')
-            elif index.column() == 3:  # 译文列
-                symbol_color = ts_obj.ui_style_cache.get('translation_newline_color')
+            if column == 2:  # 原文列
+                symbol_color = ts_obj.ui_style.original_newline_color
+            elif column == 3:  # 译文列
+                symbol_color = ts_obj.ui_style.translation_newline_color
             if symbol_color and isinstance(symbol_color, QColor):
-                symbol_font = QFont(display_option.font)
-                symbol_font.setPointSize(int(display_option.font.pointSize() * 0.9))
+                symbol_font, symbol_width, descent = self._get_symbol_font(display_option.font)
                 painter.setFont(symbol_font)
                 painter.setPen(symbol_color)
-                font_metrics = painter.fontMetrics()
-                symbol_width = font_metrics.horizontalAdvance(self.newline_symbol)
                 x = display_option.rect.right() - symbol_width - 3
-                y = display_option.rect.bottom() - font_metrics.descent() - 2
+                y = display_option.rect.bottom() - descent - 2
                 painter.drawText(x, y, self.newline_symbol)
 
         painter.restore()
 
-        if self.app and hasattr(self.app, 'plugin_manager') and ts_obj:
+        if ts_obj and self.app and hasattr(self.app, 'plugin_manager') \
+                and self.app.plugin_manager.is_hook_implemented('on_table_cell_paint'):
             painter.save()
             self.app.plugin_manager.run_hook(
                 'on_table_cell_paint',
@@ -4,8 +4,8 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QListWidgetItem, QSizePolicy
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QColor
-from rapidfuzz import fuzz
 from utils.localization import _
+from services.tm_fuzzy_index import TMFuzzyIndex
 
 class TMPanel(QWidget):
     apply_tm_suggestion_signal = Signal(str)
@@ -53,11 +53,15 @@ class TMPanel(QWidget):
             translation_text_ui = full_text.strip()
         self.apply_tm_suggestion_signal.emit(translation_text_ui)
 
-    def update_tm_suggestions_for_text(self, original_semantic_text, translation_memory, source_map=None):
+    def update_tm_suggestions_for_text(self, original_semantic_text, translation_memory, source_map=None,
+                                       fuzzy_index=None):
         self.tm_suggestions_listbox.clear()
         if not original_semantic_text: return
 
         source_map = source_map or {}
+        # 调用方可传入缓存的索引；否则临时为这次查询建立
+        if fuzzy_index is None:
+            fuzzy_index = TMFuzzyIndex(translation_memory)
 
         plugin_suggestions = None
         if self.app and hasattr(self.app, 'plugin_manager'):
@@ -91,12 +95,10 @@ class TMPanel(QWidget):
             item.setForeground(QColor("darkgreen"))
             self.tm_suggestions_listbox.addItem(item)
 
-        original_lower = original_semantic_text.lower()
         case_insensitive_match = None
-        for tm_orig, tm_trans in translation_memory.items():
-            if tm_orig.lower() == original_lower and tm_orig != original_semantic_text:
-                case_insensitive_match = tm_trans
-                break
+        case_insensitive_source = fuzzy_index.find_case_insensitive(original_semantic_text)
+        if case_insensitive_source is not None:
+            case_insensitive_match = translation_memory.get(case_insensitive_source)
 
         if case_insensitive_match:
             suggestion_for_ui = case_insensitive_match.replace("\\n", "\n")
@@ -105,16 +107,12 @@ class TMPanel(QWidget):
             self.tm_suggestions_listbox.addItem(item)
 
         fuzzy_matches = []
-        for tm_orig, tm_trans_with_slash_n in translation_memory.items():
-            if tm_orig == original_semantic_text:
-                continue
-            ratio = fuzz.ratio(original_semantic_text, tm_orig) / 100.0
-            if ratio > 0.65:
+        for ratio, tm_orig in fuzzy_index.find_fuzzy(original_semantic_text):
+            tm_trans_with_slash_n = translation_memory.get(tm_orig)
+            if tm_trans_with_slash_n is not None:
                 fuzzy_matches.append((ratio, tm_orig, tm_trans_with_slash_n))
 
-        fuzzy_matches.sort(key=lambda x: x[0], reverse=True)
-
-        for ratio, orig_match_text, trans_match_text in fuzzy_matches[:3]:
+        for ratio, orig_match_text, trans_match_text in fuzzy_matches:
             source_tag = source_map.get(orig_match_text, "")
             suggestion_for_ui = trans_match_text.replace("\\n", "\n")
             display_orig_match = orig_match_text[:40].replace("\n", "↵") + ("..." if len(orig_match_text) > 40 else "")
@@ -0,0 +1,125 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+from collections import deque
+
+# 转移表以 (状态 << 21) | ord(字符) 为键，21 位足以容纳所有 Unicode 码位
+_CHAR_BITS = 21
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+class GlossaryMatcher:
+    """
+    Aho–Corasick automaton over glossary source terms.
+
+    find(text) reports every whole-word occurrence of every term in a single
+    pass over the text, including multi-word terms. Terms are matched on
+    their lowercase form; case-sensitive terms additionally require the exact
+    source spelling. Instances are immutable once built and safe to share
+    between threads.
+    """
+
+    def __init__(self, terms):
+        """terms: iterable of (term_key, source_term, case_sensitive), term_key being source_term.lower()."""
+        self._goto = {}
+        self._fail = [0]
+        self._outputs = [()]
+        self._patterns = []
+        self._build(terms)
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def _build(self, terms):
+        goto = self._goto
+        outputs = [[]]
+        for term_key, source_term, case_sensitive in terms:
+            if not term_key:
+                continue
+            state = 0
+            for char in term_key:
+                key = (state << _CHAR_BITS) | ord(char)
+                next_state = goto.get(key)
+                if next_state is None:
+                    next_state = len(outputs)
+                    goto[key] = next_state
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(len(self._patterns))
+            self._patterns.append((term_key, source_term, bool(case_sensitive), len(term_key)))
+
+        # 按层次遍历计算失败链接，并把失败链上的输出合并到当前状态
+        children = [[] for __ in outputs]
+        for key, child in goto.items():
+            children[key >> _CHAR_BITS].append((key & ((1 << _CHAR_BITS) - 1), child))
+        fail = [0] * len(outputs)
+        queue = deque(child for __, child in children[0])
+        while queue:
+            state = queue.popleft()
+            for code, child in children[state]:
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and ((fallback << _CHAR_BITS) | code) not in goto:
+                    fallback = fail[fallback]
+                target = goto.get((fallback << _CHAR_BITS) | code)
+                if target is not None and target != child:
+                    fail[child] = target
+                    outputs[child].extend(outputs[target])
+        self._fail = fail
+        self._outputs = [tuple(output) for output in outputs]
+
+    @staticmethod
+    def _lowered(text):
+        """Lowercased characters of text with the index of the original character each came from."""
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return lowered, None
+        chars = []
+        origins = []
+        for index, char in enumerate(text):
+            for lower_char in char.lower():
+                chars.append(lower_char)
+                origins.append(index)
+        return ''.join(chars), origins
+
+    def find(self, text):
+        """Returns [(start, end, term_key), ...] for every term occurrence in text, in order of end position."""
+        if not text or not self._patterns:
+            return []
+        goto, fail, outputs, patterns = self._goto, self._fail, self._outputs, self._patterns
+        lowered, origins = self._lowered(text)
+        text_length = len(text)
+        matches = []
+        state = 0
+        for position, char in enumerate(lowered):
+            code = ord(char)
+            while True:
+                next_state = goto.get((state << _CHAR_BITS) | code)
+                if next_state is not None or not state:
+                    break
+                state = fail[state]
+            state = next_state or 0
+            if not outputs[state]:
+                continue
+            for pattern_index in outputs[state]:
+                term_key, source_term, case_sensitive, length = patterns[pattern_index]
+                if origins is None:
+                    start, end = position - length + 1, position + 1
+                else:
+                    start, end = origins[position - length + 1], origins[position] + 1
+                # 只接受完整单词的匹配
+                if _is_word_char(term_key[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(term_key[-1]) and end < text_length and _is_word_char(text[end]):
+                    continue
+                if case_sensitive and text[start:end] != source_term:
+                    continue
+                matches.append((start, end, term_key))
+        return matches
+
+    def find_keys(self, text):
+        """Returns the set of term keys occurring in text."""
+        return {term_key for __, __, term_key in self.find(text)}
@@ -1,10 +1,22 @@
 import xml.etree.ElementTree as ET
+import copy
 import logging
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Iterator
 import re
 
 logger = logging.getLogger(__name__)
 
+# 流式解析时每批交给数据库的术语数量，以及用于识别文件格式的前缀大小
+STREAM_BATCH_SIZE = 2000
+DIALECT_PROBE_BYTES = 64 * 1024
+STRUCTURE_SAMPLE_SIZE = 5
+
+_entry_tag_regexes = (
+    re.compile(rb'<(?:[\w.-]+:)?(termEntry)[\s>/]'),
+    re.compile(rb'<(?:[\w.-]+:)?(conceptGrp)[\s>/]'),
+    re.compile(rb'<(?:[\w.-]+:)?([\w.-]*term-?entry[\w.-]*)[\s>/]', re.IGNORECASE),
+)
+
 
 class TBXParser:
     def __init__(self):
@@ -17,37 +29,89 @@ class TBXParser:
 
     def parse_tbx(self, filepath: str) -> List[Dict]:
         try:
-            tree = ET.parse(filepath)
-            root = tree.getroot()
-            self._extract_namespaces(root)
-            term_entries = self._find_term_entries(root)
-
-            if not term_entries:
-                logger.warning("No <termEntry> elements found")
-                return []
-            self.structure_stats['total_entries'] = len(term_entries)
-            structure_info = self._analyze_structure(term_entries[:5])
-            logger.info(f"TBX structure analysis: {structure_info}")
             terms = []
-            for i, term_entry in enumerate(term_entries):
-                extracted_terms = self._extract_terms_universal(term_entry, i)
+            for batch in self.iter_term_batches(filepath):
+                terms.extend(batch)
+            return terms
+
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"An unexpected error occurred during TBX parsing: {e}", exc_info=True)
+            return []
+
+    def iter_term_batches(self, filepath: str, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[List[Dict]]:
+        """
+        Streams the file with iterparse and yields extracted terms in batches.
+        Each entry element is processed as soon as it is complete and then
+        dropped, so memory use does not grow with the file size.
+        """
+        entry_tag = self._detect_entry_tag(filepath)
+        logger.info(f"TBX entry element: {entry_tag or 'auto'}")
+        open_elements = []
+        samples = []
+        batch = []
+        try:
+            for event, elem in ET.iterparse(filepath, events=('start', 'end')):
+                if event == 'start':
+                    if not open_elements:
+                        self._extract_namespaces(elem)
+                    open_elements.append(elem)
+                    continue
+                open_elements.pop()
+                if not self._is_entry_tag(self._clean_tag_name(elem.tag), entry_tag):
+                    continue
+
+                entry_index = self.structure_stats['total_entries']
+                self.structure_stats['total_entries'] += 1
+                if len(samples) < STRUCTURE_SAMPLE_SIZE:
+                    samples.append(copy.deepcopy(elem))
+                    if len(samples) == STRUCTURE_SAMPLE_SIZE:
+                        logger.info(f"TBX structure analysis: {self._analyze_structure(samples)}")
+                extracted_terms = self._extract_terms_universal(elem, entry_index)
                 if extracted_terms:
-                    terms.extend(extracted_terms)
+                    batch.extend(extracted_terms)
                     self.structure_stats['successful_extractions'] += 1
-            success_rate = (self.structure_stats['successful_extractions'] /
-                            self.structure_stats['total_entries'] * 100)
-            logger.info(f"Extraction success rate: {success_rate:.1f}%")
-            logger.info(f"Strategy usage: {self.structure_stats['strategy_usage']}")
-            logger.info(f"Successfully extracted {len(terms)} unique terms from TBX")
-
-            return terms
 
+                # 处理完立即释放该条目及其在父元素中的引用
+                elem.clear()
+                if open_elements:
+                    open_elements[-1].remove(elem)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
         except ET.ParseError as e:
             logger.error(f"Invalid XML in TBX file: {e}", exc_info=True)
             raise ValueError(f"Invalid XML in TBX file: {e}")
-        except Exception as e:
-            logger.error(f"An unexpected error occurred during TBX parsing: {e}", exc_info=True)
-            return []
+
+        if batch:
+            yield batch
+        if not self.structure_stats['total_entries']:
+            logger.warning("No <termEntry> elements found")
+            return
+        if 0 < len(samples) < STRUCTURE_SAMPLE_SIZE:
+            logger.info(f"TBX structure analysis: {self._analyze_structure(samples)}")
+        success_rate = (self.structure_stats['successful_extractions'] /
+                        self.structure_stats['total_entries'] * 100)
+        logger.info(f"Extraction success rate: {success_rate:.1f}%")
+        logger.info(f"Strategy usage: {self.structure_stats['strategy_usage']}")
+
+    def _detect_entry_tag(self, filepath: str) -> Optional[str]:
+        """从文件开头识别条目元素名（termEntry、MultiTerm 的 conceptGrp 等）"""
+        with open(filepath, 'rb') as f:
+            prefix = f.read(DIALECT_PROBE_BYTES)
+        for regex in _entry_tag_regexes:
+            match = regex.search(prefix)
+            if match:
+                return match.group(1).decode('ascii', errors='ignore')
+        return None
+
+    @staticmethod
+    def _is_entry_tag(local_name: str, entry_tag: Optional[str]) -> bool:
+        if entry_tag:
+            return local_name == entry_tag
+        lowered = local_name.lower()
+        return 'termentry' in lowered or 'term-entry' in lowered
 
     def _extract_namespaces(self, root):
         """提取XML命名空间信息"""
@@ -59,32 +123,6 @@ class TBXParser:
             namespace = root_tag.split('}')[0][1:]
             self.namespace_map['default'] = namespace
 
-    def _find_term_entries(self, root):
-        term_entries = []
-        # 1. 直接查找
-        term_entries = root.findall('.//termEntry')
-        if term_entries:
-            return term_entries
-
-        # 2. 使用命名空间查找
-        for ns_prefix, ns_uri in self.namespace_map.items():
-            try:
-                if ns_prefix == 'default':
-                    term_entries = root.findall('.//{' + ns_uri + '}termEntry')
-                else:
-                    term_entries = root.findall(f'.//{{{ns_uri}}}termEntry')
-                if term_entries:
-                    return term_entries
-            except:
-                continue
-
-        # 3. 查找包含"term"和"entry"的元素
-        for elem in root.iter():
-            if 'termentry' in elem.tag.lower() or 'term-entry' in elem.tag.lower():
-                term_entries.append(elem)
-
-        return term_entries
-
     def _analyze_structure(self, sample_entries: List) -> Dict:
         """分析TBX文件结构"""
         analysis = {
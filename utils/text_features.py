@@ -0,0 +1,79 @@
+# Copyright (c) 2025, TheSkyC
+# SPDX-License-Identifier: Apache-2.0
+
+from functools import lru_cache
+import regex as re
+from utils.text_utils import placeholder_regex
+
+# 单次替换同时去掉占位符和非语言字符，结果与 get_linguistic_length 的两次替换一致
+_placeholder_or_non_linguistic_regex = re.compile(r'\{[^{}]+\}|[\p{P}\p{N}\p{S}\p{Z}]')
+_word_regex = re.compile(r'\b\w+\b')
+
+PUNCTUATION_MAP = {'.': '。', ',': '，', '?': '？', '!': '！', ':': '：', ';': '；', '(': '（', ')': '）'}
+PUNCTUATION_CHARS = frozenset(PUNCTUATION_MAP) | frozenset(PUNCTUATION_MAP.values())
+
+TEXT_FEATURES_CACHE_SIZE = 65536
+
+
+def has_case(char):
+    return char.lower() != char.upper()
+
+
+class TextFeatures:
+    """
+    Everything the validation checks and the details panel need to know about a
+    text, computed in one pass. Instances are shared through get_text_features
+    and must be treated as read-only.
+    """
+    __slots__ = (
+        'text', 'placeholders', 'placeholder_set', 'line_count', 'starts_with_space', 'ends_with_space',
+        'first_char', 'last_char', 'first_cased_char', '_linguistic_length', '_lower', '_words'
+    )
+
+    def __init__(self, text):
+        self.text = text
+        placeholders = placeholder_regex.findall(text) if '{' in text else ()
+        self.placeholders = tuple(placeholders)
+        self.placeholder_set = frozenset(placeholders)
+        self.line_count = text.count('\n') + 1
+        self.starts_with_space = text.startswith(' ')
+        self.ends_with_space = text.endswith(' ')
+
+        stripped = text.strip()
+        self.first_char = stripped[0] if stripped else None
+        self.last_char = stripped[-1] if stripped else None
+        self.first_cased_char = self.first_char if self.first_char and has_case(self.first_char) else None
+        self._linguistic_length = None
+        self._lower = None
+        self._words = None
+
+    @property
+    def linguistic_length(self):
+        if self._linguistic_length is None:
+            self._linguistic_length = len(_placeholder_or_non_linguistic_regex.sub('', self.text))
+        return self._linguistic_length
+
+    @property
+    def lower(self):
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def words(self):
+        if self._words is None:
+            self._words = frozenset(_word_regex.findall(self.lower))
+        return self._words
+
+    @property
+    def starts_with_punctuation(self):
+        return self.first_char in PUNCTUATION_CHARS
+
+    @property
+    def ends_with_punctuation(self):
+        return self.last_char in PUNCTUATION_CHARS
+
+
+@lru_cache(maxsize=TEXT_FEATURES_CACHE_SIZE)
+def get_text_features(text: str) -> TextFeatures:
+    return TextFeatures(text or "")